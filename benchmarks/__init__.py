@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for Ollama Forge.
+
+The benchmarks run against an in-process stub server so that results measure
+client overhead rather than model inference time.
+"""
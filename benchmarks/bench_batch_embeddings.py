@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark batched embeddings against per-prompt requests.
+
+Usage:
+    python -m benchmarks.bench_batch_embeddings --prompts 2000 --batch-size 64
+"""
+
+import argparse
+import time
+from typing import List
+
+from ollama_forge.client import OllamaClient
+from benchmarks.stub_server import StubOllamaServer
+
+
+def _per_prompt(client: OllamaClient, model: str, prompts: List[str]) -> None:
+    for prompt in prompts:
+        client._with_retry(
+            "POST", "/api/embed", data={"model": model, "input": prompt}
+        ).json()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--prompts", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--model", default="nomic-embed-text")
+    args = parser.parse_args()
+
+    prompts = [f"benchmark chunk number {i}" for i in range(args.prompts)]
+
+    with StubOllamaServer() as server:
+        client = OllamaClient(base_url=server.url)
+
+        for label, run in (
+            ("per-prompt", lambda: _per_prompt(client, args.model, prompts)),
+            ("batched", lambda: client.batch_embeddings(
+                args.model, prompts, batch_size=args.batch_size
+            )),
+        ):
+            server.reset_counts()
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            requests_sent = server.request_counts["/api/embed"]
+            print(
+                f"{label:>10}: {len(prompts) / elapsed:10.1f} prompts/s  "
+                f"{requests_sent / elapsed:8.1f} requests/s  "
+                f"({requests_sent} requests in {elapsed:.2f}s)"
+            )
+
+
+if __name__ == "__main__":
+    main()
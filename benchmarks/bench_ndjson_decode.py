@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark NDJSON stream decoding against per-line iter_lines + json.loads.
+
+A generate stream in Ollama's wire format is recorded once, then replayed
+as network-sized byte chunks through each decoder.
+
+Usage:
+    python -m benchmarks.bench_ndjson_decode --tokens 200000 --read-size 1024
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+from typing import Callable, Iterator, List
+
+import requests
+
+from ollama_forge.streaming import JSON_BACKEND, NDJSONDecoder, chunk_text
+
+
+def record_stream(tokens: int) -> bytes:
+    """Build a generate stream with one chunk per token plus a final stats chunk."""
+    created_at = datetime.now(timezone.utc).isoformat()
+    lines = [
+        json.dumps({"model": "llama3.2:3b", "created_at": created_at,
+                    "response": f" tok{i % 97}", "done": False})
+        for i in range(tokens)
+    ]
+    lines.append(json.dumps({"model": "llama3.2:3b", "created_at": created_at,
+                             "response": "", "done": True, "eval_count": tokens}))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def split_reads(data: bytes, read_size: int) -> List[bytes]:
+    return [data[i:i + read_size] for i in range(0, len(data), read_size)]
+
+
+def baseline(stream: bytes, read_size: int) -> Iterator[str]:
+    """What the streaming methods used to do: requests' iter_lines plus json.loads."""
+    response = requests.Response()
+    response._content = stream
+    response._content_consumed = True
+    for line in response.iter_lines(chunk_size=read_size):
+        if line:
+            yield chunk_text(json.loads(line))
+
+
+def decoder(stream: bytes, read_size: int) -> Iterator[str]:
+    ndjson = NDJSONDecoder()
+    for data in split_reads(stream, read_size):
+        for chunk in ndjson.feed(data):
+            yield chunk_text(chunk)
+    for chunk in ndjson.flush():
+        yield chunk_text(chunk)
+
+
+def _rate(func: Callable[[bytes, int], Iterator[str]], stream: bytes, read_size: int,
+          repeat: int) -> float:
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = sum(1 for _ in func(stream, read_size))
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=200_000)
+    parser.add_argument("--read-size", type=int, nargs="+", default=[512, 65536])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    stream = record_stream(args.tokens)
+    print(f"stream: {args.tokens} tokens, {len(stream) / 1e6:.1f} MB, backend: {JSON_BACKEND}")
+    print(f"{'read size':>10} {'iter_lines tok/s':>17} {'decoder tok/s':>14} {'speedup':>8}")
+    for read_size in args.read_size:
+        base = _rate(baseline, stream, read_size, args.repeat)
+        fast = _rate(decoder, stream, read_size, args.repeat)
+        print(f"{read_size:>10} {base:>17,.0f} {fast:>14,.0f} {fast / base:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark interactive latency under bulk load, with and without a PriorityScheduler.
+
+Bulk threads send embedding requests back to back while one thread sends
+interactive chat requests at a steady rate. The stub server processes only
+``--parallel`` requests at once, like Ollama with OLLAMA_NUM_PARALLEL, so
+without a scheduler interactive requests queue behind the bulk work.
+
+Usage:
+    python -m benchmarks.bench_priority --bulk-threads 16 --samples 100
+"""
+
+import argparse
+import itertools
+import threading
+import time
+from typing import List, Optional
+
+from ollama_forge.client import OllamaClient
+from ollama_forge.scheduler import PriorityScheduler
+from benchmarks.stub_server import StubOllamaServer
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _run(server: StubOllamaServer, scheduler: Optional[PriorityScheduler],
+         bulk_threads: int, samples: int, interval: float) -> List[float]:
+    """Return the sorted latencies of the interactive requests."""
+    client = OllamaClient(base_url=server.url, scheduler=scheduler,
+                          max_connections=bulk_threads + 4)
+    stop = threading.Event()
+    counter = itertools.count()
+
+    def bulk() -> None:
+        while not stop.is_set():
+            client.create_embedding("nomic-embed-text", f"bulk document {next(counter)}",
+                                    priority="batch")
+
+    workers = [threading.Thread(target=bulk, daemon=True) for _ in range(bulk_threads)]
+    for worker in workers:
+        worker.start()
+    time.sleep(interval * 4)  # Let the bulk load build a queue
+
+    latencies = []
+    messages = [{"role": "user", "content": "hello"}]
+    for _ in range(samples):
+        start = time.perf_counter()
+        client.chat("test-model", messages, priority="interactive")
+        latencies.append(time.perf_counter() - start)
+        time.sleep(interval)
+
+    stop.set()
+    for worker in workers:
+        worker.join()
+    client.session.close()
+    return sorted(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bulk-threads", type=int, default=16)
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument("--parallel", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="Seconds the stub spends on each request")
+    parser.add_argument("--interval", type=float, default=0.05,
+                        help="Seconds between interactive requests")
+    args = parser.parse_args()
+
+    with StubOllamaServer(latency=args.latency, parallel=args.parallel) as server:
+        for label, scheduler in (
+            ("no scheduler", None),
+            ("scheduler", PriorityScheduler(max_in_flight=args.parallel)),
+        ):
+            latencies = _run(server, scheduler, args.bulk_threads, args.samples, args.interval)
+            print(
+                f"{label:>12}: interactive p50 {_percentile(latencies, 0.50) * 1000:7.1f} ms  "
+                f"p95 {_percentile(latencies, 0.95) * 1000:7.1f} ms  "
+                f"max {latencies[-1] * 1000:7.1f} ms"
+            )
+            if scheduler is not None:
+                stats = scheduler.stats()
+                print(
+                    f"{'':>12}  dispatched: interactive {stats['interactive']['dispatched']}, "
+                    f"batch {stats['batch']['dispatched']}"
+                )
+
+
+if __name__ == "__main__":
+    main()
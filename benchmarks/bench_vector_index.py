@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark VectorIndex against create_embedding_matrix + top_k_similarities.
+
+Usage:
+    python -m benchmarks.bench_vector_index --sizes 10000 100000 1000000 --dim 128
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from helpers.embedding import VectorIndex, top_k_similarities
+
+
+def _timed(func, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--queries", type=int, default=32)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    queries = rng.normal(size=(args.queries, args.dim)).astype(np.float32)
+    print(f"{'vectors':>10} {'build(s)':>9} {'argsort ms/q':>13} "
+          f"{'index ms/q':>11} {'batch ms/q':>11}")
+
+    for size in args.sizes:
+        vectors = rng.normal(size=(size, args.dim)).astype(np.float32)
+
+        # Baseline: float64 matrix as produced by create_embedding_matrix
+        matrix = vectors.astype(np.float64)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        query_list = queries[0].tolist()
+        baseline = _timed(lambda: top_k_similarities(query_list, matrix, args.k), repeat=5)
+        del matrix
+
+        index = VectorIndex(args.dim)
+        ids = list(range(size))
+        build = _timed(lambda: index.add(ids, vectors))
+        single = _timed(lambda: index.search(query_list, args.k), repeat=5)
+        batched = _timed(lambda: index.search_batch(queries, args.k)) / args.queries
+
+        print(f"{size:>10} {build:>9.2f} {baseline * 1e3:>13.2f} "
+              f"{single * 1e3:>11.2f} {batched * 1e3:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
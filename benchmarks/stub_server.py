@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Deterministic in-process stub of the Ollama HTTP API.
+
+The stub answers with reproducible data derived from the request payload,
+which makes it suitable for benchmarks and tests that need real HTTP traffic
+without a running Ollama server. Latency, token rate, tokens per stream
+chunk, model load time and server parallelism are configurable, and
+failures can be injected at a seeded random rate or for the next N requests.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+DEFAULT_EMBEDDING_DIM = 8
+DEFAULT_RESPONSE_TOKENS = 16
+DEFAULT_MODELS = ("test-model", "nomic-embed-text")
+# Endpoints that run a model; failures are injected only into these
+INFERENCE_ENDPOINTS = ("/api/generate", "/api/chat", "/api/embed")
+
+
+def fake_embedding(text: str, dim: int = DEFAULT_EMBEDDING_DIM) -> List[float]:
+    """Return a deterministic pseudo-embedding for a text."""
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return [(digest[i % len(digest)] - 128) / 128.0 for i in range(dim)]
+
+
+def _model_entry(name: str) -> Dict[str, Any]:
+    """Return a /api/tags style entry for a model name."""
+    return {
+        "name": name,
+        "model": name,
+        "size": 1024,
+        "digest": hashlib.sha256(name.encode("utf-8")).hexdigest(),
+        "modified_at": "2025-01-01T00:00:00Z",
+    }
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Request handler dispatching to the owning StubOllamaServer."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "_StubHTTPServer"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.stub._record_connection()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Silence per-request logging."""
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+
+    def _send_json(self, payload: Dict[str, Any], status: int = 200) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_ndjson(self, chunks: Iterable[Dict[str, Any]], delay: float = 0.0) -> None:
+        """Send chunks as a chunked NDJSON stream, sleeping ``delay`` between them."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for index, chunk in enumerate(chunks):
+            if index and delay:
+                time.sleep(delay)
+            line = json.dumps(chunk).encode("utf-8") + b"\n"
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+        self.server.stub.last_stream_finished_at = time.perf_counter()
+
+    def _dispatch(self) -> None:
+        stub = self.server.stub
+        stub._record(self.path)
+        handler = stub.routes.get(self.path)
+        if handler is None:
+            self._send_json({"error": f"unknown endpoint {self.path}"}, status=404)
+            return
+        data = self._read_json()
+        stub.recent_requests.append((self.path, data))
+        failure = stub._injected_failure(self.path)
+        if failure is not None:
+            self._send_json({"error": "injected failure"}, status=failure)
+            return
+        if stub._slots is None:
+            self._handle(handler, data)
+            return
+        # Like OLLAMA_NUM_PARALLEL: requests beyond the limit queue in arrival order
+        with stub._slots:
+            self._handle(handler, data)
+
+    def _handle(self, handler: Any, data: Dict[str, Any]) -> None:
+        if self.server.stub.latency:
+            time.sleep(self.server.stub.latency)
+        handler(self, data)
+
+    do_GET = _dispatch
+    do_POST = _dispatch
+    do_DELETE = _dispatch
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    stub: "StubOllamaServer"
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        """Ignore clients that hang up mid-stream."""
+
+
+class StubOllamaServer:
+    """
+    Minimal Ollama API stub running on a background thread.
+
+    Example:
+        ```
+        with StubOllamaServer() as server:
+            client = OllamaClient(base_url=server.url)
+            client.batch_embeddings("nomic-embed-text", ["a", "b"])
+        ```
+
+    Streams send ``response_tokens`` tokens in chunks of ``chunk_tokens``,
+    paced by ``token_rate`` tokens per second (or ``token_delay`` seconds
+    between chunks). With ``failure_rate`` each generate, chat and embed
+    request fails with ``failure_status`` with that probability, drawn from
+    a generator seeded with ``seed`` so runs are reproducible.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 embedding_dim: int = DEFAULT_EMBEDDING_DIM,
+                 response_tokens: int = DEFAULT_RESPONSE_TOKENS,
+                 token_delay: float = 0.0,
+                 latency: float = 0.0,
+                 parallel: Optional[int] = None,
+                 strict_models: bool = False,
+                 load_delay: float = 0.0,
+                 token_rate: Optional[float] = None,
+                 chunk_tokens: int = 1,
+                 failure_rate: float = 0.0,
+                 failure_status: int = 503,
+                 seed: int = 0,
+                 models: Iterable[str] = DEFAULT_MODELS,
+                 embedding_models: Iterable[str] = ()):
+        self.models: Dict[str, Dict[str, Any]] = {name: _model_entry(name) for name in models}
+        self.embedding_models = set(embedding_models)
+        self.embedding_dim = embedding_dim
+        self.response_tokens = response_tokens
+        self.token_delay = token_delay
+        self.latency = latency
+        self.parallel = parallel
+        self.strict_models = strict_models
+        self.load_delay = load_delay
+        self.token_rate = token_rate
+        self.chunk_tokens = max(1, chunk_tokens)
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self._random = random.Random(seed)
+        self._forced_failures: deque = deque()
+        self._slots = threading.Semaphore(parallel) if parallel else None
+        self.loaded_models: List[str] = []
+        self.last_stream_finished_at: Optional[float] = None
+        self.request_counts: Counter = Counter()
+        self.connection_count = 0
+        self.recent_requests: deque = deque(maxlen=100)
+        self._lock = threading.Lock()
+        self._httpd = _StubHTTPServer((host, port), _StubHandler)
+        self._httpd.stub = self
+        self._thread: Optional[threading.Thread] = None
+        self.routes = {
+            "/api/version": self._handle_version,
+            "/api/embed": self._handle_embed,
+            "/api/generate": self._handle_generate,
+            "/api/chat": self._handle_chat,
+            "/api/tags": self._handle_tags,
+            "/api/ps": self._handle_ps,
+            "/api/pull": self._handle_pull,
+            "/api/push": self._handle_push,
+            "/api/delete": self._handle_delete,
+            "/api/copy": self._handle_copy,
+            "/api/create": self._handle_create,
+        }
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running stub."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _record(self, path: str) -> None:
+        with self._lock:
+            self.request_counts[path] += 1
+
+    def _record_connection(self) -> None:
+        with self._lock:
+            self.connection_count += 1
+
+    def fail_next(self, count: int = 1, status: Optional[int] = None) -> None:
+        """Make the next ``count`` generate, chat or embed requests fail with ``status``."""
+        with self._lock:
+            self._forced_failures.extend([status or self.failure_status] * count)
+
+    def _injected_failure(self, path: str) -> Optional[int]:
+        """Return the status to fail a request with, or None to serve it."""
+        if path not in INFERENCE_ENDPOINTS:
+            return None
+        with self._lock:
+            if self._forced_failures:
+                return self._forced_failures.popleft()
+            if self.failure_rate and self._random.random() < self.failure_rate:
+                return self.failure_status
+        return None
+
+    def reset_counts(self) -> None:
+        """Reset the per-endpoint request and connection counters."""
+        with self._lock:
+            self.request_counts.clear()
+            self.connection_count = 0
+
+    def _handle_version(self, handler: _StubHandler, data: Dict[str, Any]) -> None:
+        handler._send_json({"version": "0.0.0-stub"})
+
+    def _handle_embed(self, handler: _StubHandler, data: Dict[str, Any]) -> None:
+        # Like Ollama, only "input" is read: a request with just "prompt" embeds nothing
+        raw: Union[str, List[str], None] = data.get("input")
+        if raw is not None and not isinstance(raw, (str, list)):
+            handler._send_json({"error": "invalid input type"}, status=400)
+            return
+        inputs = [raw] if isinstance(raw, str) and raw else list(raw or [])
+        if not self._has_model(handler, data.get("model", "")):
+            return
+        load_duration = self._load(data.get("model", ""))
+        handler._send_json({
+            "model": data.get("model", ""),
+            "load_duration": load_duration,
+            "embeddings": [fake_embedding(text, self.embedding_dim) for text in inputs],
+            "prompt_eval_count": sum(len(text.split()) for text in inputs),
+        })
+
+    def _handle_tags(self, handler: _StubHandler, data: Dict[str, Any]) -> None:
+        handler._send_json({"models": list(self.models.values())})
+
+    def _handle_ps(self, handler: _StubHandler, data: Dict[str, Any]) -> None:
+        handler._send_json({"models": [
+            self.models[name] for name in self.loaded_models if name in self.models
+        ]})
+
+    def _has_model(self, handler: _StubHandler, model: str) -> bool:
+        """With strict_models, answer 404 like Ollama for a model that isn't installed."""
+        if not self.strict_models or model in self.models or f"{model}:latest" in self.models:
+            return True
+        handler._send_json({"error": f"model '{model}' not found, try pulling it first"}, status=404)
+        return False
+
+    def _supports_generate(self, handler: _StubHandler, model: str) -> bool:
+        """Answer 400 like Ollama when an embedding-only model is asked to generate or chat."""
+        if model not in self.embedding_models:
+            return True
+        handler._send_json({"error": f'"{model}" does not support generate'}, status=400)
+        return False
+
+    def _mark_loaded(self, model: str) -> bool:
+        """Mark a model loaded; return whether it was cold."""
+        with self._lock:
+            if model in self.loaded_models:
+                return False
+            self.loaded_models.append(model)
+            return True
+
+    def _load(self, model: str) -> int:
+        """Load a model, sleeping ``load_delay`` if it was cold; return load_duration in ns."""
+        if self._mark_loaded(model) and self.load_delay:
+            time.sleep(self.load_delay)
+            return int(self.load_delay * 1e9)
+        return 1_000_000
+
+    def _send_progress(self, handler: _StubHandler, data: Dict[str, Any],
+                       statuses: List[Dict[str, Any]]) -> None:
+        if data.get("stream", True):
+            handler._send_ndjson(statuses + [{"status": "success"}])
+        else:
+            handler._send_json({"status": "success"})
+
+    def _handle_pull(self, handler: _StubHandler, data: Dict[str, Any]) -> None:
+        name = data.get("model") or data.get("name", "")
+        self.models[name] = _model_entry(name)
+        self._send_progress(handler, data, [
+            {"status": "pulling manifest"},
+            {"status": "downloading", "total": 1024, "completed": 512},
+            {"status": "downloading", "total": 1024, "completed": 1024},
+        ])
+
+    def _handle_push(self, handler: _StubHandler, data: Dict[str, Any]) -> None:
+        self._send_progress(handler, data, [{"status": "pushing manifest"}])
+
+    def _handle_create(self, handler: _StubHandler, data: Dict[str, Any]) -> None:
+        name = data.get("model") or data.get("name", "")
+        self.models[name] = _model_entry(name)
+        self._send_progress(handler, data, [{"status": "creating model layer"}])
+
+    def _handle_delete(self, handler: _StubHandler, data: Dict[str, Any]) -> None:
+        name = data.get("model") or data.get("name", "")
+        if self.models.pop(name, None) is None:
+            handler._send_json({"error": f"model '{name}' not found"}, status=404)
+            return
+        handler._send_json({})
+
+    def _handle_copy(self, handler: _StubHandler, data: Dict[str, Any]) -> None:
+        source = data.get("source", "")
+        if source not in self.models:
+            handler._send_json({"error": f"model '{source}' not found"}, status=404)
+            return
+        self.models[data.get("destination", "")] = _model_entry(data.get("destination", ""))
+        handler._send_json({})
+
+    def _tokens(self) -> List[str]:
+        return [f"tok{i} " for i in range(self.response_tokens)]
+
+    def _chunks(self) -> List[str]:
+        """Group the tokens into the texts of successive stream chunks."""
+        tokens = self._tokens()
+        size = self.chunk_tokens
+        return ["".join(tokens[i:i + size]) for i in range(0, len(tokens), size)]
+
+    @property
+    def chunk_delay(self) -> float:
+        """Seconds between stream chunks."""
+        if self.token_rate:
+            return self.chunk_tokens / self.token_rate
+        return self.token_delay
+
+    def _final_stats(self, data: Dict[str, Any], load_duration: int = 1_000_000) -> Dict[str, Any]:
+        eval_count = self.response_tokens
+        eval_duration = int(eval_count / self.token_rate * 1e9) if self.token_rate else 1_000_000 * eval_count
+        prompt = data.get("prompt") or " ".join(
+            str(message.get("content", "")) for message in data.get("messages", [])
+        )
+        return {
+            "model": data.get("model", ""),
+            "done": True,
+            "total_duration": load_duration + 1_000_000 + eval_duration,
+            "load_duration": load_duration,
+            "prompt_eval_count": len(prompt.split()) + 1,
+            "prompt_eval_duration": 1_000_000,
+            "eval_count": eval_count,
+            "eval_duration": eval_duration,
+        }
+
+    def _handle_generate(self, handler: _StubHandler, data: Dict[str, Any]) -> None:
+        model = data.get("model", "")
+        if not self._has_model(handler, model):
+            return
+        if not data.get("prompt") and data.get("keep_alive") in (0, "0", "0s"):
+            # An empty prompt with keep_alive=0 unloads the model
+            with self._lock:
+                if model in self.loaded_models:
+                    self.loaded_models.remove(model)
+            handler._send_json({"model": model, "response": "", "done": True, "done_reason": "unload"})
+            return
+        if not self._supports_generate(handler, model):
+            return
+        load_duration = self._load(model)
+        if not data.get("prompt"):
+            # An empty prompt only loads the model
+            handler._send_json({
+                "model": model, "response": "", "done": True, "done_reason": "load",
+                "load_duration": load_duration,
+            })
+            return
+        if not data.get("stream", True):
+            handler._send_json(dict(
+                self._final_stats(data, load_duration), response="".join(self._tokens())
+            ))
+            return
+        chunks: List[Dict[str, Any]] = [
+            {"model": model, "response": text, "done": False} for text in self._chunks()
+        ]
+        chunks.append(dict(self._final_stats(data, load_duration), response=""))
+        handler._send_ndjson(chunks, self.chunk_delay)
+
+    def _handle_chat(self, handler: _StubHandler, data: Dict[str, Any]) -> None:
+        model = data.get("model", "")
+        if not self._has_model(handler, model) or not self._supports_generate(handler, model):
+            return
+        load_duration = self._load(model)
+        if not data.get("stream", True):
+            message = {"role": "assistant", "content": "".join(self._tokens())}
+            handler._send_json(dict(self._final_stats(data, load_duration), message=message))
+            return
+        chunks: List[Dict[str, Any]] = [
+            {"model": model, "message": {"role": "assistant", "content": text}, "done": False}
+            for text in self._chunks()
+        ]
+        chunks.append(dict(
+            self._final_stats(data, load_duration), message={"role": "assistant", "content": ""}
+        ))
+        handler._send_ndjson(chunks, self.chunk_delay)
+
+    def start(self) -> "StubOllamaServer":
+        """Start serving on a daemon thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the socket."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "StubOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Client performance benchmark suite.
+
+Every benchmark runs against an in-process StubOllamaServer, so results
+measure the client rather than a model, and don't need a running Ollama.
+Results are written as JSON together with the commit they were measured on,
+and a run can be compared with an earlier results file to catch regressions.
+
+Benchmarks:
+    client_overhead     Microseconds the client adds per request over raw HTTP
+    stream_decode       Tokens per second through streaming generate
+    batch_embeddings    Prompts per second through batch_embeddings
+    concurrency         Requests per second at increasing concurrency, sync and async
+
+Usage:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --quick --repeat 5 --compare results.json --threshold 0.15
+    python -m benchmarks.suite --only stream_decode concurrency
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+import requests
+
+from ollama_forge.async_client import AsyncOllamaClient
+from ollama_forge.client import OllamaClient
+from ollama_forge.streaming import JSON_BACKEND
+from benchmarks.stub_server import StubOllamaServer
+
+MODEL = "test-model"
+EMBEDDING_MODEL = "nomic-embed-text"
+
+# Workload sizes for full and --quick runs
+SIZES = {
+    "full": {"requests": 2000, "stream_tokens": 50000, "embeddings": 20000,
+             "concurrency_requests": 32, "concurrency_levels": (1, 2, 4, 8, 16)},
+    "quick": {"requests": 200, "stream_tokens": 5000, "embeddings": 2000,
+              "concurrency_requests": 8, "concurrency_levels": (1, 4)},
+}
+
+Results = Dict[str, float]
+
+
+def _per_request_us(elapsed: float, count: int) -> float:
+    return elapsed / count * 1e6
+
+
+def bench_client_overhead(size: Dict[str, Any]) -> Results:
+    """Compare sequential non-streaming generate calls with raw HTTP posts of the same payload."""
+    count = size["requests"]
+    payload = {"model": MODEL, "prompt": "hello", "stream": False}
+    results: Results = {}
+    with StubOllamaServer(response_tokens=4) as server:
+        url = f"{server.url}/api/generate"
+        with requests.Session() as session:
+            start = time.perf_counter()
+            for _ in range(count):
+                session.post(url, json=payload).json()
+            results["raw_us_per_request"] = _per_request_us(time.perf_counter() - start, count)
+
+        client = OllamaClient(base_url=server.url)
+        start = time.perf_counter()
+        for _ in range(count):
+            client.generate(MODEL, "hello")
+        results["client_us_per_request"] = _per_request_us(time.perf_counter() - start, count)
+        client.session.close()
+
+        async def run_async() -> None:
+            async with httpx.AsyncClient() as raw:
+                start = time.perf_counter()
+                for _ in range(count):
+                    (await raw.post(url, json=payload)).json()
+                results["async_raw_us_per_request"] = _per_request_us(time.perf_counter() - start, count)
+            async with AsyncOllamaClient(base_url=server.url) as async_client:
+                start = time.perf_counter()
+                for _ in range(count):
+                    await async_client.generate(MODEL, "hello")
+                results["async_client_us_per_request"] = _per_request_us(time.perf_counter() - start, count)
+
+        asyncio.run(run_async())
+    results["overhead_us_per_request"] = results["client_us_per_request"] - results["raw_us_per_request"]
+    results["async_overhead_us_per_request"] = (
+        results["async_client_us_per_request"] - results["async_raw_us_per_request"]
+    )
+    return results
+
+
+def bench_stream_decode(size: Dict[str, Any]) -> Results:
+    """Stream one long generate response, sync and async, one token per chunk."""
+    tokens = size["stream_tokens"]
+    results: Results = {}
+    with StubOllamaServer(response_tokens=tokens) as server:
+        client = OllamaClient(base_url=server.url)
+        start = time.perf_counter()
+        chunks = sum(1 for _ in client.generate(MODEL, "hello", stream=True))
+        elapsed = time.perf_counter() - start
+        results["tokens_per_sec"] = tokens / elapsed
+        results["chunks_per_sec"] = chunks / elapsed
+
+        async def run_async() -> float:
+            async with AsyncOllamaClient(base_url=server.url) as async_client:
+                start = time.perf_counter()
+                async for _ in await async_client.generate(MODEL, "hello", stream=True):
+                    pass
+                return time.perf_counter() - start
+
+        results["async_tokens_per_sec"] = tokens / asyncio.run(run_async())
+    return results
+
+
+def bench_batch_embeddings(size: Dict[str, Any]) -> Results:
+    """Embed many short prompts with packed /api/embed requests."""
+    prompts = [f"benchmark chunk number {i}" for i in range(size["embeddings"])]
+    with StubOllamaServer() as server:
+        client = OllamaClient(base_url=server.url)
+        start = time.perf_counter()
+        client.batch_embeddings(EMBEDDING_MODEL, prompts)
+        elapsed = time.perf_counter() - start
+        requests_sent = server.request_counts["/api/embed"]
+    return {"prompts_per_sec": len(prompts) / elapsed, "requests_per_sec": requests_sent / elapsed}
+
+
+def bench_concurrency(size: Dict[str, Any]) -> Results:
+    """Requests per second at increasing concurrency against a server with fixed latency."""
+    results: Results = {}
+    levels = size["concurrency_levels"]
+    with StubOllamaServer(latency=0.02, response_tokens=4) as server:
+        client = OllamaClient(base_url=server.url, max_connections=max(levels))
+        for level in levels:
+            prompts = [f"prompt {i}" for i in range(level * size["concurrency_requests"])]
+            start = time.perf_counter()
+            client.batch_generate(MODEL, prompts, max_workers=level)
+            results[f"sync_c{level}_requests_per_sec"] = len(prompts) / (time.perf_counter() - start)
+
+        async def run_async(level: int, prompts: List[str]) -> float:
+            async with AsyncOllamaClient(base_url=server.url, max_connections=level) as async_client:
+                start = time.perf_counter()
+                await async_client.batch_generate(MODEL, prompts, concurrency=level)
+                return time.perf_counter() - start
+
+        for level in levels:
+            prompts = [f"prompt {i}" for i in range(level * size["concurrency_requests"])]
+            results[f"async_c{level}_requests_per_sec"] = len(prompts) / asyncio.run(run_async(level, prompts))
+    low, high = levels[0], levels[-1]
+    for mode in ("sync", "async"):
+        results[f"{mode}_scaling_c{high}"] = (
+            results[f"{mode}_c{high}_requests_per_sec"] / results[f"{mode}_c{low}_requests_per_sec"]
+        )
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[[Dict[str, Any]], Results]] = {
+    "client_overhead": bench_client_overhead,
+    "stream_decode": bench_stream_decode,
+    "batch_embeddings": bench_batch_embeddings,
+    "concurrency": bench_concurrency,
+}
+
+
+def higher_is_better(metric: str) -> bool:
+    """Throughputs and scaling factors should go up; durations should go down."""
+    return metric.endswith("_per_sec") or "_scaling_" in metric
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _best(runs: List[Results]) -> Results:
+    """Keep the best value of each metric across repeated runs."""
+    return {
+        metric: (max if higher_is_better(metric) else min)(run[metric] for run in runs)
+        for metric in runs[0]
+    }
+
+
+def run_suite(names: Optional[List[str]] = None, quick: bool = False, repeat: int = 3) -> Dict[str, Any]:
+    """
+    Run benchmarks and collect their results.
+
+    Args:
+        names: Benchmarks to run (defaults to all)
+        quick: Use the small workloads
+        repeat: Runs per benchmark; the best value of each metric is kept
+
+    Returns:
+        ``{"meta": {...}, "results": {benchmark: {metric: value}}}``
+    """
+    size = SIZES["quick" if quick else "full"]
+    results: Dict[str, Results] = {}
+    for name in names or list(BENCHMARKS):
+        results[name] = _best([BENCHMARKS[name](size) for _ in range(max(1, repeat))])
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_backend": JSON_BACKEND,
+            "workload": "quick" if quick else "full",
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float) -> List[Dict[str, Any]]:
+    """
+    Compare two result sets metric by metric.
+
+    Args:
+        current: Output of ``run_suite``
+        baseline: Earlier output of ``run_suite``
+        threshold: Relative change counted as a regression (0.1 = 10% worse)
+
+    Returns:
+        One entry per metric present in both, with baseline, current,
+        change (relative, positive is better) and regression flag
+    """
+    rows = []
+    for name, metrics in current["results"].items():
+        for metric, value in metrics.items():
+            before = baseline.get("results", {}).get(name, {}).get(metric)
+            if before is None or before == 0:
+                continue
+            change = (value - before) / abs(before)
+            if not higher_is_better(metric):
+                change = -change
+            rows.append({"benchmark": name, "metric": metric, "baseline": before, "current": value,
+                         "change": change, "regression": change < -threshold})
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Compare with an earlier results file")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative change that counts as a regression (default 0.1)")
+    parser.add_argument("--quick", action="store_true", help="Run the small workloads")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Benchmarks to run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark, keeping the best")
+    args = parser.parse_args(argv)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    suite = run_suite(args.only, args.quick, args.repeat)
+    for name, metrics in suite["results"].items():
+        print(name)
+        for metric, value in metrics.items():
+            print(f"  {metric:<36} {value:14.2f}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(suite, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if not args.compare:
+        return 0
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    rows = compare(suite, baseline, args.threshold)
+    print(f"\nCompared with {baseline.get('meta', {}).get('commit') or args.compare}:")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"  {row['benchmark']}.{row['metric']:<36} {row['baseline']:12.2f} -> "
+              f"{row['current']:12.2f} ({row['change']:+.1%}){flag}")
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
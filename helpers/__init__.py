@@ -7,113 +7,99 @@ Following Eidosian principles, it offers elegantly structured helpers for common
 Modules:
     common: General utility functions
     embedding: Functions for working with embeddings
+    embedding_store: Memory-mapped on-disk embedding storage
     install_ollama: Helpers for installing and managing Ollama
     model_constants: Constants and resolvers for models
 """
 
-import os
-import sys
+import importlib
 import logging
 
 # Configure minimal logging - will be overridden if proper logging is configured
 logging.basicConfig(level=logging.INFO)
 
-# Robust import system with elegant fallbacks
-try:
-    # Standard relative imports for package context
-    from .common import (
-        print_header, print_success, print_error, print_warning, print_info, print_json,
-        make_api_request, async_make_api_request, check_ollama_installed, 
-        check_ollama_running, install_ollama, ensure_ollama_running,
-        DEFAULT_OLLAMA_API_URL,
-    )
-    from .model_constants import (
-        DEFAULT_CHAT_MODEL, BACKUP_CHAT_MODEL,
-        DEFAULT_EMBEDDING_MODEL, BACKUP_EMBEDDING_MODEL,
-        resolve_model_alias, get_fallback_model, get_model_recommendation
-    )
-    from .embedding import (
-        calculate_similarity, normalize_vector,
-        batch_calculate_similarities, process_embeddings_response,
-    )
-except ImportError:
-    # Alternative absolute imports for direct execution or out-of-package access
-    parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-    if parent_dir not in sys.path:
-        sys.path.insert(0, parent_dir)
-        
+# Submodules are imported on first attribute access (PEP 562): common pulls in
+# aiohttp and embedding pulls in numpy, which most callers never need
+_EXPORTS = {
+    "print_header": "common", "print_success": "common", "print_error": "common",
+    "print_warning": "common", "print_info": "common", "print_json": "common",
+    "make_api_request": "common", "async_make_api_request": "common",
+    "check_ollama_installed": "common", "check_ollama_running": "common",
+    "install_ollama": "common", "ensure_ollama_running": "common",
+    "DEFAULT_OLLAMA_API_URL": "common",
+    "DEFAULT_CHAT_MODEL": "model_constants", "BACKUP_CHAT_MODEL": "model_constants",
+    "DEFAULT_EMBEDDING_MODEL": "model_constants", "BACKUP_EMBEDDING_MODEL": "model_constants",
+    "resolve_model_alias": "model_constants", "get_fallback_model": "model_constants",
+    "get_model_recommendation": "model_constants",
+    "calculate_similarity": "embedding", "normalize_vector": "embedding",
+    "batch_calculate_similarities": "embedding", "process_embeddings_response": "embedding",
+    "VectorIndex": "embedding",
+}
+_SUBMODULES = ("common", "model_constants", "embedding")
+
+
+class _MinimalVectorIndex:
+    def __init__(self, *args, **kwargs): raise ImportError("VectorIndex unavailable")
+
+
+# Elegant minimal fallbacks for critical functionality, used when a submodule's
+# dependencies are missing
+_FALLBACKS = {
+    "DEFAULT_OLLAMA_API_URL": "http://localhost:11434/",
+    "DEFAULT_CHAT_MODEL": "deepseek-r1:1.5b",
+    "BACKUP_CHAT_MODEL": "qwen2.5:0.5b",
+    "DEFAULT_EMBEDDING_MODEL": "deepseek-r1:1.5b",
+    "BACKUP_EMBEDDING_MODEL": "mxbai-embed-large",
+    "print_header": lambda title: print(f"\n=== {title} ===\n"),
+    "print_success": lambda msg: print(f"✓ {msg}"),
+    "print_error": lambda msg: print(f"✗ {msg}"),
+    "print_warning": lambda msg: print(f"⚠ {msg}"),
+    "print_info": lambda msg: print(f"ℹ {msg}"),
+    "print_json": lambda data: print(data),
+    "check_ollama_installed": lambda *args, **kwargs: (False, "Import failed"),
+    "check_ollama_running": lambda *args, **kwargs: (False, "Import failed"),
+    "install_ollama": lambda *args, **kwargs: (False, "Import failed"),
+    "ensure_ollama_running": lambda *args, **kwargs: (False, "Import failed"),
+    "resolve_model_alias": lambda model_name: model_name,
+    "get_fallback_model": lambda model_name, *args: "qwen2.5:0.5b",
+    "get_model_recommendation": lambda model_name: "qwen2.5:0.5b",
+    "calculate_similarity": lambda vec1, vec2: 0.0,
+    "normalize_vector": lambda vector: vector,
+    "batch_calculate_similarities": lambda query_vector, comparison_vectors: [],
+    "process_embeddings_response": lambda response: None,
+    "VectorIndex": _MinimalVectorIndex,
+}
+
+
+def _unavailable(name):
+    def raise_import_error(*args, **kwargs):
+        raise ImportError(f"{name} unavailable")
+    return raise_import_error
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        module_name = name
+    elif name in _EXPORTS:
+        module_name = _EXPORTS[name]
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
     try:
-        from ollama_forge.helpers.common import (
-            print_header, print_success, print_error, print_warning, print_info, print_json,
-            make_api_request, async_make_api_request, check_ollama_installed, 
-            check_ollama_running, install_ollama, ensure_ollama_running,
-            DEFAULT_OLLAMA_API_URL,
-        )
-        from ollama_forge.helpers.model_constants import (
-            DEFAULT_CHAT_MODEL, BACKUP_CHAT_MODEL,
-            DEFAULT_EMBEDDING_MODEL, BACKUP_EMBEDDING_MODEL,
-            resolve_model_alias, get_fallback_model, get_model_recommendation
-        )
-        from ollama_forge.helpers.embedding import (
-            calculate_similarity, normalize_vector,
-            batch_calculate_similarities, process_embeddings_response,
-        )
+        module = importlib.import_module(f".{module_name}", __name__)
     except ImportError as e:
-        # Elegant minimal fallbacks for critical functionality
+        if name in _SUBMODULES:
+            raise
         logging.debug(f"Failed to import helpers: {e}")
-        DEFAULT_OLLAMA_API_URL = "http://localhost:11434/"
-        DEFAULT_CHAT_MODEL = "deepseek-r1:1.5b"
-        BACKUP_CHAT_MODEL = "qwen2.5:0.5b"
-        DEFAULT_EMBEDDING_MODEL = "deepseek-r1:1.5b"
-        BACKUP_EMBEDDING_MODEL = "mxbai-embed-large"
-        
-        # Minimal implementations of critical functions
-        def print_header(title): print(f"\n=== {title} ===\n")
-        def print_success(msg): print(f"✓ {msg}")
-        def print_error(msg): print(f"✗ {msg}")
-        def print_warning(msg): print(f"⚠ {msg}")
-        def print_info(msg): print(f"ℹ {msg}")
-        def print_json(data): print(data)
-        
-        # Function stubs that raise proper errors when called
-        def make_api_request(*args, **kwargs): raise ImportError("API requests unavailable")
-        def async_make_api_request(*args, **kwargs): raise ImportError("Async API requests unavailable")
-        def check_ollama_installed(*args, **kwargs): return (False, "Import failed")
-        def check_ollama_running(*args, **kwargs): return (False, "Import failed")
-        def install_ollama(*args, **kwargs): return (False, "Import failed")
-        def ensure_ollama_running(*args, **kwargs): return (False, "Import failed")
-        def resolve_model_alias(model_name): return model_name
-        def get_fallback_model(model_name): return BACKUP_CHAT_MODEL
-        def get_model_recommendation(model_name): return BACKUP_CHAT_MODEL
-        def calculate_similarity(vec1, vec2): return 0.0
-        def normalize_vector(vector): return vector
-        def batch_calculate_similarities(query_vector, comparison_vectors): return []
-        def process_embeddings_response(response): return None
-
-# Export submodules for direct access
-try:
-    import common
-except ImportError:
-    try:
-        import ollama_forge.helpers.common as common
-    except ImportError:
-        pass
+        value = _FALLBACKS.get(name) or _unavailable(name)
+    else:
+        value = module if name == module_name else getattr(module, name)
+    globals()[name] = value
+    return value
 
-try:
-    import model_constants
-except ImportError:
-    try:
-        import ollama_forge.helpers.model_constants as model_constants
-    except ImportError:
-        pass
 
-try:
-    import embedding
-except ImportError:
-    try:
-        import ollama_forge.helpers.embedding as embedding
-    except ImportError:
-        pass
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 
 # Define explicit exports with perfect precision
 __all__ = [
@@ -136,7 +122,7 @@ __all__ = [
     
     # Embedding utilities
     "calculate_similarity", "normalize_vector", 
-    "batch_calculate_similarities", "process_embeddings_response",
+    "batch_calculate_similarities", "process_embeddings_response", "VectorIndex",
     
     # Submodules
     "common", "model_constants", "embedding",
@@ -20,6 +20,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Rows scored per block when searching memory-mapped matrices
+DEFAULT_SIMILARITY_BLOCK_SIZE = 65536
+
 
 def calculate_similarity(vec1: List[float], vec2: List[float]) -> float:
     """
@@ -107,33 +110,76 @@ def normalize_vector(vector: List[float]) -> List[float]:
         return [x / norm for x in vector]
 
 
+def _batch_similarities_loop(
+    query_vector: List[float],
+    comparison_vectors: List[List[float]]
+) -> List[Tuple[int, float]]:
+    """Pure Python fallback for ``batch_calculate_similarities``."""
+    similarities = []
+    for i, vec in enumerate(comparison_vectors):
+        try:
+            sim = calculate_similarity(query_vector, vec)
+            similarities.append((i, sim))
+        except ValueError as e:
+            logger.warning(f"Skipping vector {i}: {e}")
+            similarities.append((i, 0.0))
+    
+    return similarities
+
+
 def batch_calculate_similarities(
     query_vector: List[float], 
-    comparison_vectors: List[List[float]]
+    comparison_vectors: Union[List[List[float]], Any]
 ) -> List[Tuple[int, float]]:
     """
     Calculate similarities between a query vector and multiple comparison vectors.
     
+    With NumPy available the comparison vectors are stacked once and all
+    cosines come from a single matrix-vector product. Empty vectors, zero
+    vectors and vectors whose dimension differs from the query score 0.0.
+    
     Args:
         query_vector: Query vector
-        comparison_vectors: List of vectors to compare against
+        comparison_vectors: List of vectors (or a 2-D array) to compare against
         
     Returns:
-        List of (index, similarity) tuples, sorted by similarity
+        List of (index, similarity) tuples, in the order of comparison_vectors
     """
-    if not comparison_vectors:
+    if len(comparison_vectors) == 0:
         return []
     
-    similarities = []
-    for i, vec in enumerate(comparison_vectors):
-        try:
-            sim = calculate_similarity(query_vector, vec)
-            similarities.append((i, sim))
-        except ValueError as e:
-            logger.warning(f"Skipping vector {i}: {e}")
-            similarities.append((i, 0.0))
+    if not NUMPY_AVAILABLE:
+        return _batch_similarities_loop(query_vector, comparison_vectors)
     
-    return similarities
+    query = np.asarray(query_vector, dtype=np.float64)
+    dim = query.shape[0] if query.ndim == 1 else 0
+    similarities = [0.0] * len(comparison_vectors)
+    
+    if isinstance(comparison_vectors, np.ndarray) and comparison_vectors.ndim == 2:
+        valid = list(range(len(comparison_vectors))) if comparison_vectors.shape[1] == dim and dim else []
+        matrix = comparison_vectors if valid else None
+    else:
+        valid = [i for i, vec in enumerate(comparison_vectors) if dim and len(vec) == dim]
+        matrix = np.array([comparison_vectors[i] for i in valid], dtype=np.float64) if valid else None
+    
+    if len(valid) != len(comparison_vectors):
+        skipped = set(range(len(comparison_vectors))) - set(valid)
+        logger.warning(
+            f"Skipping {len(skipped)} vector(s) with dimensions that don't match the "
+            f"query ({dim}): indices {sorted(skipped)[:10]}"
+        )
+    
+    if matrix is not None:
+        query_norm = np.linalg.norm(query)
+        denominators = np.linalg.norm(matrix, axis=1) * query_norm
+        dots = matrix @ query
+        nonzero = denominators > 0
+        scores = np.zeros(len(valid), dtype=np.float64)
+        scores[nonzero] = dots[nonzero] / denominators[nonzero]
+        for i, score in zip(valid, scores.tolist()):
+            similarities[i] = score
+    
+    return list(enumerate(similarities))
 
 
 def process_embeddings_response(response: Dict[str, Any]) -> Optional[List[float]]:
@@ -197,23 +243,66 @@ def create_embedding_matrix(
         return normalized
 
 
+def _blocked_top_k(query: Any, matrix: Any, k: int, block_size: int) -> List[Tuple[int, float]]:
+    """
+    Top-k dot products over ``matrix`` scored ``block_size`` rows at a time.
+    
+    Only one block plus the running top k are held in memory, so this works
+    on memory-mapped matrices larger than RAM.
+    """
+    best_indices = np.empty(0, dtype=np.int64)
+    best_scores = np.empty(0, dtype=np.float32)
+    
+    for start in range(0, matrix.shape[0], block_size):
+        block = np.asarray(matrix[start:start + block_size], dtype=np.float32)
+        scores = block @ query
+        if len(scores) > k:
+            keep = np.argpartition(-scores, k - 1)[:k]
+        else:
+            keep = np.arange(len(scores))
+        best_indices = np.concatenate([best_indices, keep + start])
+        best_scores = np.concatenate([best_scores, scores[keep]])
+        if len(best_scores) > k:
+            keep = np.argpartition(-best_scores, k - 1)[:k]
+            best_indices, best_scores = best_indices[keep], best_scores[keep]
+    
+    order = np.argsort(-best_scores)
+    return [(int(best_indices[i]), float(best_scores[i])) for i in order]
+
+
 def top_k_similarities(
     query_embedding: List[float],
     embedding_matrix: Union[List[List[float]], Any],
-    k: int = 5
+    k: int = 5,
+    block_size: Optional[int] = None
 ) -> List[Tuple[int, float]]:
     """
     Find top k most similar vectors to a query embedding.
     
+    Memory-mapped matrices (for example ``EmbeddingStore.vectors``) are
+    scored in blocks of ``block_size`` rows so peak memory stays bounded
+    regardless of corpus size.
+    
     Args:
         query_embedding: Query vector to compare against
-        embedding_matrix: Matrix of vectors to search
+        embedding_matrix: Matrix of normalized vectors to search
         k: Number of top matches to return
+        block_size: Rows scored per block; defaults to whole-matrix scoring
+            for in-memory arrays and DEFAULT_SIMILARITY_BLOCK_SIZE for memmaps
         
     Returns:
         List of (index, similarity) tuples for top k matches
     """
     if NUMPY_AVAILABLE and isinstance(embedding_matrix, np.ndarray):
+        if isinstance(embedding_matrix, np.memmap) and block_size is None:
+            block_size = DEFAULT_SIMILARITY_BLOCK_SIZE
+        if block_size is not None:
+            query = np.asarray(query_embedding, dtype=np.float32)
+            norm = np.linalg.norm(query)
+            if norm == 0 or k <= 0 or embedding_matrix.shape[0] == 0:
+                return []
+            return _blocked_top_k(query / norm, embedding_matrix, k, block_size)
+        
         # Efficient numpy implementation
         query_norm = np.array(query_embedding)
         query_norm = query_norm / np.linalg.norm(query_norm)
@@ -229,3 +318,170 @@ def top_k_similarities(
         all_similarities = batch_calculate_similarities(query_embedding, embedding_matrix)
         sorted_similarities = sorted(all_similarities, key=lambda x: x[1], reverse=True)
         return sorted_similarities[:k]
+
+
+class VectorIndex:
+    """
+    In-memory cosine-similarity index over normalized float32 vectors.
+    
+    Vectors live in a preallocated matrix that grows geometrically, so
+    ``add``, ``update`` and ``remove`` never rebuild the index. Queries use
+    one matrix multiply and ``argpartition`` to select the top k.
+    
+    Example:
+        ```
+        index = VectorIndex(dim=768)
+        index.add(["doc-1", "doc-2"], [vec1, vec2])
+        index.search(query_vec, k=1)   # [("doc-1", 0.93)]
+        ```
+    
+    Attributes:
+        dim: Dimension of the stored vectors
+    """
+    
+    def __init__(self, dim: int, initial_capacity: int = 1024):
+        """
+        Initialize an empty index.
+        
+        Args:
+            dim: Dimension of the stored vectors
+            initial_capacity: Number of rows to preallocate
+            
+        Raises:
+            ImportError: If numpy is not installed
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("VectorIndex requires numpy")
+        self.dim = dim
+        self._matrix = np.zeros((max(initial_capacity, 1), dim), dtype=np.float32)
+        self._ids: List[Any] = []
+        self._rows: Dict[Any, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def __contains__(self, item_id: Any) -> bool:
+        return item_id in self._rows
+    
+    def _normalized(self, vectors: Any) -> Any:
+        """Return ``vectors`` as a normalized float32 matrix, zero rows left as zeros."""
+        matrix = np.array(vectors, dtype=np.float32, ndmin=2)
+        if matrix.shape[1] != self.dim:
+            raise ValueError(f"Vector dimensions don't match: {matrix.shape[1]} vs {self.dim}")
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+    
+    def _reserve(self, rows: int) -> None:
+        capacity = self._matrix.shape[0]
+        if rows <= capacity:
+            return
+        while capacity < rows:
+            capacity *= 2
+        grown = np.zeros((capacity, self.dim), dtype=np.float32)
+        grown[:len(self._ids)] = self._matrix[:len(self._ids)]
+        self._matrix = grown
+    
+    def add(self, ids: List[Any], vectors: Any) -> None:
+        """
+        Add vectors to the index.
+        
+        Args:
+            ids: Identifiers, one per vector; must not already be present
+            vectors: Sequence of vectors or a 2-D array
+            
+        Raises:
+            ValueError: If an id already exists, lengths differ, or dimensions mismatch
+        """
+        matrix = self._normalized(vectors)
+        if len(ids) != matrix.shape[0]:
+            raise ValueError(f"Got {len(ids)} ids for {matrix.shape[0]} vectors")
+        if len(set(ids)) != len(ids) or any(item_id in self._rows for item_id in ids):
+            raise ValueError("Duplicate id in VectorIndex.add; use update() instead")
+        
+        start = len(self._ids)
+        self._reserve(start + len(ids))
+        self._matrix[start:start + len(ids)] = matrix
+        for offset, item_id in enumerate(ids):
+            self._rows[item_id] = start + offset
+        self._ids.extend(ids)
+    
+    def update(self, ids: List[Any], vectors: Any) -> None:
+        """
+        Replace the vectors of existing ids in place.
+        
+        Args:
+            ids: Identifiers already in the index
+            vectors: Sequence of vectors or a 2-D array
+            
+        Raises:
+            KeyError: If an id is not in the index
+        """
+        matrix = self._normalized(vectors)
+        rows = [self._rows[item_id] for item_id in ids]
+        self._matrix[rows] = matrix
+    
+    def remove(self, ids: List[Any]) -> None:
+        """
+        Remove vectors by id, filling each hole with the last row.
+        
+        Args:
+            ids: Identifiers to remove
+            
+        Raises:
+            KeyError: If an id is not in the index
+        """
+        for item_id in ids:
+            row = self._rows.pop(item_id)
+            last = len(self._ids) - 1
+            if row != last:
+                moved_id = self._ids[last]
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = moved_id
+                self._rows[moved_id] = row
+            self._ids.pop()
+    
+    def search(self, query: List[float], k: int = 5) -> List[Tuple[Any, float]]:
+        """
+        Find the k most similar vectors to a query.
+        
+        Args:
+            query: Query vector
+            k: Number of matches to return
+            
+        Returns:
+            List of (id, similarity) tuples, most similar first
+        """
+        return self.search_batch([query], k)[0]
+    
+    def search_batch(self, queries: Any, k: int = 5) -> List[List[Tuple[Any, float]]]:
+        """
+        Find the k most similar vectors for each of several queries at once.
+        
+        Args:
+            queries: Sequence of query vectors or a 2-D array
+            k: Number of matches to return per query
+            
+        Returns:
+            One list of (id, similarity) tuples per query, most similar first
+        """
+        matrix = self._normalized(queries)
+        size = len(self._ids)
+        if size == 0 or k <= 0:
+            return [[] for _ in range(matrix.shape[0])]
+        
+        k = min(k, size)
+        similarities = matrix @ self._matrix[:size].T
+        if k < size:
+            top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(size), (matrix.shape[0], 1))
+        
+        results = []
+        for row, candidates in enumerate(top):
+            scores = similarities[row, candidates]
+            order = np.argsort(-scores)
+            results.append([
+                (self._ids[int(candidates[i])], float(scores[i])) for i in order
+            ])
+        return results
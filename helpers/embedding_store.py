@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped on-disk embedding store for Ollama Forge.
+
+An EmbeddingStore keeps vectors on disk so corpora larger than RAM can be
+searched with bounded memory. The format is two files:
+
+- ``<path>``: a 64-byte header (magic, version, dtype, dimension, row count,
+  committed id-table size, normalized flag) followed by contiguous
+  little-endian float32 or float16 rows
+- ``<path>.ids``: the id table, one JSON-encoded id per line, in row order
+
+Rows are opened with ``numpy.memmap`` and searched block by block through
+``top_k_similarities``.
+"""
+
+import json
+import os
+import struct
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .embedding import DEFAULT_SIMILARITY_BLOCK_SIZE, NUMPY_AVAILABLE, top_k_similarities
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+MAGIC = b"OFEMBED1"
+FORMAT_VERSION = 1
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<8sIIIQQB")
+_DTYPES: Dict[str, int] = {"float32": 0, "float16": 1}
+_DTYPE_NAMES = {code: name for name, code in _DTYPES.items()}
+
+
+class EmbeddingStore:
+    """
+    Append-only store of embedding vectors backed by a memory-mapped file.
+
+    Example:
+        ```
+        store = EmbeddingStore.create("corpus.emb", dim=768, dtype="float16")
+        client.batch_embeddings(model, chunks, store=store, store_ids=chunk_ids)
+        store.top_k(query_vector, k=10)   # [(chunk_id, similarity), ...]
+        ```
+
+    Attributes:
+        path: Path of the vector file
+        dim: Dimension of the stored vectors
+        dtype: Storage dtype name ("float32" or "float16")
+        normalized: Whether rows are normalized to unit length on append
+    """
+
+    def __init__(self, path: str):
+        """
+        Open an existing store.
+
+        Args:
+            path: Path of the vector file
+
+        Raises:
+            ImportError: If numpy is not installed
+            ValueError: If the file is not an embedding store
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("EmbeddingStore requires numpy")
+        self.path = path
+        with open(path, "rb") as f:
+            magic, version, dtype_code, dim, count, ids_bytes, normalized = _HEADER.unpack(
+                f.read(_HEADER.size)
+            )
+        if magic != MAGIC or version != FORMAT_VERSION or dtype_code not in _DTYPE_NAMES:
+            raise ValueError(f"{path} is not a supported embedding store")
+        self.dim = dim
+        self.dtype = _DTYPE_NAMES[dtype_code]
+        self.normalized = bool(normalized)
+        self._count = count
+        self._ids_bytes = ids_bytes
+        self._ids: Optional[List[Any]] = None
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        dim: int,
+        dtype: str = "float32",
+        normalize: bool = True
+    ) -> "EmbeddingStore":
+        """
+        Create an empty store, replacing any existing file at ``path``.
+
+        Args:
+            path: Path of the vector file
+            dim: Dimension of the stored vectors
+            dtype: Storage dtype, "float32" or "float16"
+            normalize: Normalize rows on append so similarity is a dot product
+
+        Returns:
+            The opened store
+        """
+        if dtype not in _DTYPES:
+            raise ValueError(f"Unsupported dtype {dtype!r}; use one of {sorted(_DTYPES)}")
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, _DTYPES[dtype], dim, 0, 0, int(normalize))
+                    .ljust(HEADER_SIZE, b"\0"))
+        open(cls._ids_path(path), "w").close()
+        return cls(path)
+
+    @classmethod
+    def open_or_create(cls, path: str, dim: int, **kwargs: Any) -> "EmbeddingStore":
+        """Open ``path`` if it exists, otherwise create it with ``dim`` and ``kwargs``."""
+        if os.path.exists(path):
+            store = cls(path)
+            if store.dim != dim:
+                raise ValueError(f"Store dimension {store.dim} doesn't match {dim}")
+            return store
+        return cls.create(path, dim, **kwargs)
+
+    @staticmethod
+    def _ids_path(path: str) -> str:
+        return path + ".ids"
+
+    @property
+    def _row_bytes(self) -> int:
+        return self.dim * np.dtype(self.dtype).itemsize
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def ids(self) -> List[Any]:
+        """Ids in row order, read from the id table on first access."""
+        if self._ids is None:
+            # Only the committed prefix counts; later bytes are from an interrupted append
+            with open(self._ids_path(self.path), "rb") as f:
+                committed = f.read(self._ids_bytes)
+            self._ids = [json.loads(line) for line in committed.splitlines()]
+        return self._ids
+
+    @property
+    def vectors(self) -> Any:
+        """Read-only ``numpy.memmap`` of shape (len(store), dim)."""
+        if self._count == 0:
+            return np.empty((0, self.dim), dtype=self.dtype)
+        return np.memmap(
+            self.path, dtype=np.dtype(self.dtype).newbyteorder("<"), mode="r",
+            offset=HEADER_SIZE, shape=(self._count, self.dim)
+        )
+
+    def append(self, ids: Sequence[Any], vectors: Any) -> None:
+        """
+        Append vectors and their ids.
+
+        Rows and ids are written before the header is updated, so an
+        interrupted append leaves the store readable at its previous size.
+
+        Args:
+            ids: JSON-serializable ids, one per vector
+            vectors: Sequence of vectors or a 2-D array
+
+        Raises:
+            ValueError: If lengths or dimensions don't match
+        """
+        matrix = np.array(vectors, dtype=np.float32, ndmin=2)
+        if len(ids) != matrix.shape[0]:
+            raise ValueError(f"Got {len(ids)} ids for {matrix.shape[0]} vectors")
+        if len(ids) == 0:
+            return
+        if matrix.shape[1] != self.dim:
+            raise ValueError(f"Vector dimensions don't match: {matrix.shape[1]} vs {self.dim}")
+        if self.normalized:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix = matrix / norms
+        data = matrix.astype(np.dtype(self.dtype).newbyteorder("<")).tobytes()
+        id_data = "".join(json.dumps(item_id) + "\n" for item_id in ids).encode("utf-8")
+
+        with open(self._ids_path(self.path), "r+b") as id_file:
+            id_file.seek(self._ids_bytes)
+            id_file.write(id_data)
+            id_file.truncate()
+        with open(self.path, "r+b") as f:
+            f.seek(HEADER_SIZE + self._count * self._row_bytes)
+            f.write(data)
+            f.truncate()
+            f.flush()
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, _DTYPES[self.dtype], self.dim,
+                                 self._count + len(ids), self._ids_bytes + len(id_data),
+                                 int(self.normalized)))
+        self._ids_bytes += len(id_data)
+
+        if self._ids is not None:
+            self._ids.extend(ids)
+        self._count += len(ids)
+
+    def top_k(
+        self,
+        query: List[float],
+        k: int = 5,
+        block_size: int = DEFAULT_SIMILARITY_BLOCK_SIZE
+    ) -> List[Tuple[Any, float]]:
+        """
+        Find the k most similar stored vectors, scanning in fixed-size blocks.
+
+        Args:
+            query: Query vector
+            k: Number of matches to return
+            block_size: Rows scored per block
+
+        Returns:
+            List of (id, similarity) tuples, most similar first
+        """
+        if not self.normalized:
+            raise ValueError("top_k requires a store created with normalize=True")
+        matches = top_k_similarities(query, self.vectors, k, block_size=block_size)
+        ids = self.ids
+        return [(ids[index], score) for index, score in matches]
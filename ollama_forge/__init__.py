@@ -61,11 +61,13 @@ __description__ = "Python client library and CLI for Ollama"
 try:
     from .client import OllamaClient
     from .async_client import AsyncOllamaClient
+    from .pool import PooledOllamaClient
     from .exceptions import (
         OllamaAPIError, OllamaConnectionError, 
         OllamaModelNotFoundError, OllamaServerError,
         ConnectionError, TimeoutError, ModelNotFoundError, 
-        ServerError, InvalidRequestError, StreamingError, ParseError
+        ServerError, InvalidRequestError, StreamingError, ParseError,
+        RateLimitError, CircuitOpenError
     )
 except ImportError as e:
     import warnings
@@ -73,12 +75,13 @@ except ImportError as e:
 
 # Define what's available when importing * from this package
 __all__ = [
-    'OllamaClient', 'AsyncOllamaClient', '__version__', 'get_version_string',
+    'OllamaClient', 'AsyncOllamaClient', 'PooledOllamaClient', '__version__', 'get_version_string',
     'DEFAULT_OLLAMA_API_URL', 'DEFAULT_CHAT_MODEL', 'BACKUP_CHAT_MODEL',
     'DEFAULT_EMBEDDING_MODEL', 'BACKUP_EMBEDDING_MODEL',
     'OllamaAPIError', 'OllamaConnectionError', 'OllamaModelNotFoundError', 'OllamaServerError',
     'ConnectionError', 'TimeoutError', 'ModelNotFoundError', 'ServerError', 
-    'InvalidRequestError', 'StreamingError', 'ParseError',
+    'InvalidRequestError', 'StreamingError', 'ParseError', 'RateLimitError',
+    'CircuitOpenError',
 ]
 
 # Debug mode detection
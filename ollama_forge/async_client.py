@@ -0,0 +1,595 @@
+#!/usr/bin/env python3
+"""
+Asynchronous client for the Ollama API.
+
+AsyncOllamaClient exposes every endpoint in ``API_ENDPOINTS`` as a coroutine
+and drives all of them through one pooled ``httpx.AsyncClient``, so a single
+event loop can keep hundreds of requests in flight.
+"""
+
+import asyncio
+import time
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence,
+    TypeVar, Union
+)
+
+from .client import BatchResult, OllamaClient, _pack_batches, HELPERS_AVAILABLE
+from .config import (
+    DEFAULT_OLLAMA_API_URL, DEFAULT_TIMEOUT, DEFAULT_MAX_RETRIES,
+    API_ENDPOINTS, DEFAULT_EMBEDDING_BATCH_SIZE, DEFAULT_EMBEDDING_BATCH_TOKENS,
+    DEFAULT_MAX_CONNECTIONS, DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    DEFAULT_KEEPALIVE_EXPIRY
+)
+from .exceptions import OllamaAPIError
+from .fallback import awith_fallback
+from .metrics import MetricsSink, RequestMetrics
+from .breaker import CircuitBreaker
+from .ratelimit import RequestLimiter
+from .retry import RetryPolicy
+from .scheduler import PriorityScheduler, request_priority
+from .tracing import Tracer, activate
+from .streaming import aiter_ndjson
+from helpers.model_constants import resolve_model_alias
+
+T = TypeVar("T")
+
+
+async def gather_with_concurrency(
+    limit: int,
+    *aws: Awaitable[T],
+    return_exceptions: bool = False
+) -> List[Union[T, BaseException]]:
+    """
+    Drop-in replacement for ``asyncio.gather`` that bounds concurrency.
+
+    At most ``limit`` awaitables run at once; results keep the input order.
+
+    Args:
+        limit: Maximum number of awaitables in flight
+        *aws: Awaitables to run
+        return_exceptions: Return exceptions in place of results instead of raising
+
+    Returns:
+        List of results in the order of ``aws``
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(aw: Awaitable[T]) -> T:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws), return_exceptions=return_exceptions)
+
+
+class AsyncOllamaClient:
+    """
+    Asynchronous client for interacting with the Ollama API.
+
+    All requests share one connection pool. Use the client as an async
+    context manager, or call ``aclose()`` when done.
+
+    Example:
+        ```
+        async with AsyncOllamaClient() as client:
+            replies = await client.gather(
+                *(client.generate(model, prompt) for prompt in prompts)
+            )
+        ```
+
+    Attributes:
+        base_url: Base URL for the Ollama API
+        timeout: Request timeout in seconds
+        max_retries: Maximum number of retries for failed requests
+        concurrency: Default in-flight limit for ``gather``
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_OLLAMA_API_URL,
+        timeout: int = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        concurrency: Optional[int] = None,
+        coalesce_requests: bool = True,
+        limiter: Optional[RequestLimiter] = None,
+        scheduler: Optional[PriorityScheduler] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Union[bool, CircuitBreaker, None] = None,
+        metrics_sink: Union[bool, MetricsSink, Callable[[RequestMetrics], None], None] = None,
+        tracer: Union[bool, Tracer, Any, None] = None,
+    ):
+        """
+        Initialize the async Ollama client.
+
+        Args:
+            base_url: Base URL for the Ollama API
+            timeout: Request timeout in seconds
+            max_retries: Maximum number of retries for failed requests
+            max_connections: Maximum concurrent connections in the pool
+            max_keepalive_connections: Maximum idle connections kept open
+            keepalive_expiry: Seconds an idle pooled connection is kept open
+            concurrency: Default in-flight limit for ``gather`` (defaults to max_connections)
+            coalesce_requests: Let concurrent identical embedding and
+                deterministic generate/chat requests share one upstream call
+            limiter: Optional RequestLimiter applying client-side rate limits
+                and admission control to every request
+            scheduler: Optional PriorityScheduler ordering requests by their
+                ``priority=`` class before they are sent
+            retry_policy: Retry policy (defaults to ``RetryPolicy(max_retries)``)
+            circuit_breaker: True or a CircuitBreaker to fail fast while the
+                server or a model keeps failing
+            metrics_sink: True for a MetricsRegistry, a MetricsSink, or a
+                function called with the RequestMetrics of every generate,
+                chat and embedding request
+            tracer: A Tracer, an OpenTelemetry tracer, or True for
+                OpenTelemetry's global tracer provider
+        """
+        # The sync client owns the pooled transport and its retry logic
+        self._transport = OllamaClient(
+            base_url=base_url,
+            timeout=timeout,
+            max_retries=max_retries,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            coalesce_requests=coalesce_requests,
+            limiter=limiter,
+            scheduler=scheduler,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            metrics_sink=metrics_sink,
+            tracer=tracer,
+        )
+        self.concurrency = concurrency or max_connections
+
+    @property
+    def base_url(self) -> str:
+        return self._transport.base_url
+
+    @property
+    def timeout(self) -> int:
+        return self._transport.timeout
+
+    @property
+    def max_retries(self) -> int:
+        return self._transport.max_retries
+
+    @property
+    def metrics_sink(self) -> Optional[MetricsSink]:
+        return self._transport.metrics_sink
+
+    @property
+    def tracer(self) -> Optional[Tracer]:
+        return self._transport.tracer
+
+    async def aclose(self) -> None:
+        """Close the connection pool."""
+        await self._transport.aclose()
+
+    async def __aenter__(self) -> "AsyncOllamaClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def gather(
+        self,
+        *aws: Awaitable[T],
+        limit: Optional[int] = None,
+        return_exceptions: bool = False
+    ) -> List[Union[T, BaseException]]:
+        """
+        Run awaitables with at most ``limit`` in flight (default: ``concurrency``).
+
+        Args:
+            *aws: Awaitables to run, typically calls on this client
+            limit: Maximum number of awaitables in flight
+            return_exceptions: Return exceptions in place of results instead of raising
+
+        Returns:
+            List of results in the order of ``aws``
+        """
+        return await gather_with_concurrency(
+            limit or self.concurrency, *aws, return_exceptions=return_exceptions
+        )
+
+    async def _request(self, method: str, operation: str,
+                       data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        response = await self._transport._with_async_retry(
+            method, API_ENDPOINTS[operation], data=data
+        )
+        if response is None:
+            raise OllamaAPIError(f"No response received from {API_ENDPOINTS[operation]}")
+        return response.json() if response.content else {}
+
+    async def _stream(self, operation: str,
+                      data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        response = await self._transport._with_async_retry(
+            "POST", API_ENDPOINTS[operation], data=data, stream=True
+        )
+        if response is None:
+            raise OllamaAPIError(f"No response received from {API_ENDPOINTS[operation]}")
+        return aiter_ndjson(response)
+
+    async def _request_or_stream(
+        self, operation: str, data: Dict[str, Any], stream: bool
+    ) -> Union[Dict[str, Any], AsyncIterator[Dict[str, Any]]]:
+        data["stream"] = stream
+        if stream:
+            return await self._stream(operation, data)
+        return await self._request("POST", operation, data)
+
+    async def _measured(
+        self, operation: str, data: Dict[str, Any], stream: bool = False
+    ) -> Union[Dict[str, Any], AsyncIterator[Dict[str, Any]]]:
+        """Send a generate, chat or embedding request, attaching its metrics and tracing it."""
+        start = time.perf_counter()
+        span = self._transport._start_operation(operation, data["model"], stream)
+        with activate(self._transport.tracer, span):
+            if operation == "embedding":
+                result = await self._request("POST", operation, data)
+            else:
+                result = await self._request_or_stream(operation, data, stream)
+        if stream:
+            return self._transport._ameasure_stream(operation, data["model"], result, start, span)
+        return self._transport._record_metrics(operation, data["model"], result, start, span)
+
+    @staticmethod
+    def _resolve(model: str) -> str:
+        return resolve_model_alias(model) if HELPERS_AVAILABLE else model
+
+    async def get_version(self) -> Dict[str, Any]:
+        """
+        Get the Ollama server version.
+
+        Returns:
+            Dictionary with version information
+        """
+        return await self._request("GET", "version")
+
+    async def list_models(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        List available models.
+
+        Returns:
+            Dictionary with models information
+        """
+        return await self._request("GET", "tags")
+
+    async def pull_model(
+        self, model: str, stream: bool = True
+    ) -> Union[Dict[str, Any], AsyncIterator[Dict[str, Any]]]:
+        """
+        Pull a model from the Ollama registry.
+
+        Args:
+            model: Name of the model to pull
+            stream: Whether to stream the progress
+
+        Returns:
+            If stream=True, an async iterator yielding progress updates
+            If stream=False, a dictionary with the pull result
+        """
+        return await self._request_or_stream("pull", {"name": model}, stream)
+
+    async def push_model(
+        self, model: str, stream: bool = True
+    ) -> Union[Dict[str, Any], AsyncIterator[Dict[str, Any]]]:
+        """
+        Push a model to the Ollama registry.
+
+        Args:
+            model: Name of the model to push (``namespace/model:tag``)
+            stream: Whether to stream the progress
+
+        Returns:
+            If stream=True, an async iterator yielding progress updates
+            If stream=False, a dictionary with the push result
+        """
+        return await self._request_or_stream("push", {"name": model}, stream)
+
+    async def delete_model(self, model: str) -> bool:
+        """
+        Delete a model.
+
+        Args:
+            model: Name of the model to delete
+
+        Returns:
+            True if successful
+        """
+        await self._request("DELETE", "delete", {"model": model})
+        return True
+
+    async def copy_model(self, source: str, destination: str) -> Dict[str, Any]:
+        """
+        Copy a model.
+
+        Args:
+            source: Source model name
+            destination: Destination model name
+
+        Returns:
+            Dictionary with operation result
+        """
+        return await self._request(
+            "POST", "copy", {"source": source, "destination": destination}
+        )
+
+    async def create_model(
+        self, name: str, modelfile: str, stream: bool = True
+    ) -> Union[Dict[str, Any], AsyncIterator[Dict[str, Any]]]:
+        """
+        Create a new model from a Modelfile.
+
+        Args:
+            name: Name for the new model
+            modelfile: Modelfile content
+            stream: Whether to stream the creation progress
+
+        Returns:
+            If stream=True, an async iterator yielding progress updates
+            If stream=False, a dictionary with the creation result
+        """
+        return await self._request_or_stream(
+            "create", {"name": name, "modelfile": modelfile}, stream
+        )
+
+    async def generate(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+        priority: Optional[str] = None,
+        fallback: bool = False
+    ) -> Union[Dict[str, Any], AsyncIterator[Dict[str, Any]]]:
+        """
+        Generate text from a prompt.
+
+        Args:
+            model: Name of the model to use
+            prompt: The prompt to generate from
+            options: Dictionary of generation options
+            stream: Whether to stream the response
+            priority: Scheduling class ("interactive", "normal" or "batch")
+                used when the client has a scheduler
+            fallback: On a missing or failing model, retry along the model's
+                fallback chain and return the first success
+
+        Returns:
+            If stream=True, an async iterator yielding response chunks
+            If stream=False, a dictionary with the complete response
+        """
+        if fallback:
+            return await awith_fallback(
+                self.base_url, self._resolve(model), "generate",
+                lambda name: self.generate(name, prompt, options, stream, priority)
+            )
+        data: Dict[str, Any] = {"model": self._resolve(model), "prompt": prompt}
+        if options:
+            data.update(options)
+        with request_priority(priority):
+            return await self._measured("generate", data, stream)
+
+    async def chat(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        options: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+        priority: Optional[str] = None,
+        fallback: bool = False
+    ) -> Union[Dict[str, Any], AsyncIterator[Dict[str, Any]]]:
+        """
+        Chat with a model.
+
+        Args:
+            model: Name of the model
+            messages: List of message dictionaries (role, content)
+            options: Chat options
+            stream: Whether to stream the response
+            priority: Scheduling class ("interactive", "normal" or "batch")
+                used when the client has a scheduler
+            fallback: On a missing or failing model, retry along the model's
+                fallback chain and return the first success
+
+        Returns:
+            If stream=True, an async iterator yielding response chunks
+            If stream=False, a dictionary with the complete response
+        """
+        if fallback:
+            return await awith_fallback(
+                self.base_url, self._resolve(model), "chat",
+                lambda name: self.chat(name, messages, options, stream, priority)
+            )
+        data: Dict[str, Any] = {"model": self._resolve(model), "messages": messages}
+        if options:
+            data.update(options)
+        with request_priority(priority):
+            return await self._measured("chat", data, stream)
+
+    async def create_embedding(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        priority: Optional[str] = None,
+        fallback: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Create an embedding vector for a text prompt.
+
+        Args:
+            model: Name of the model
+            prompt: Text to create embedding for
+            options: Optional embedding parameters
+            priority: Scheduling class ("interactive", "normal" or "batch")
+                used when the client has a scheduler
+            fallback: On a missing or failing model, retry along the model's
+                fallback chain and return the first success
+
+        Returns:
+            Dictionary with the embedding vector
+        """
+        if fallback:
+            return await awith_fallback(
+                self.base_url, self._resolve(model), "embedding",
+                lambda name: self.create_embedding(name, prompt, options, priority)
+            )
+        data: Dict[str, Any] = {"model": self._resolve(model), "input": prompt}
+        if options:
+            data.update(options)
+        with request_priority(priority):
+            return await self._measured("embedding", data)
+
+    async def batch_embeddings(
+        self,
+        model: str,
+        prompts: List[str],
+        options: Optional[Dict[str, Any]] = None,
+        batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+        max_batch_tokens: int = DEFAULT_EMBEDDING_BATCH_TOKENS,
+        concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Create embeddings for multiple prompts.
+
+        Prompts are packed as in ``OllamaClient.batch_embeddings`` and the
+        batches are sent concurrently, at most ``concurrency`` at a time.
+
+        Args:
+            model: Name of the model
+            prompts: List of texts to create embeddings for
+            options: Optional embedding parameters
+            batch_size: Maximum number of prompts sent in one request
+            max_batch_tokens: Maximum estimated tokens sent in one request
+            concurrency: Maximum batches in flight (defaults to ``self.concurrency``)
+
+        Returns:
+            List of dictionaries with an ``embedding`` vector, one per prompt
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        resolved_model = self._resolve(model)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(prompts)
+
+        async def embed_batch(batch: List[int]) -> None:
+            data: Dict[str, Any] = {
+                "model": resolved_model,
+                "input": [prompts[i] for i in batch],
+            }
+            if options:
+                data.update(options)
+            embeddings = (await self._request("POST", "embedding", data)).get("embeddings") or []
+            if len(embeddings) != len(batch):
+                raise OllamaAPIError(
+                    f"Expected {len(batch)} embeddings from model '{model}', "
+                    f"received {len(embeddings)}"
+                )
+            for index, vector in zip(batch, embeddings):
+                results[index] = {"model": resolved_model, "embedding": vector}
+
+        batches = _pack_batches(prompts, batch_size, max_batch_tokens)
+        await self.gather(*(embed_batch(batch) for batch in batches), limit=concurrency)
+        return results  # type: ignore [return-value]
+
+    async def _run_batch(
+        self,
+        func: Callable[[T], Awaitable[Dict[str, Any]]],
+        items: Sequence[T],
+        concurrency: Optional[int],
+        as_completed: bool
+    ) -> Union[List[BatchResult], AsyncIterator[BatchResult]]:
+        """
+        Run ``func`` over ``items`` under a semaphore, capturing per-item errors.
+
+        Args:
+            func: Coroutine function performing one request
+            items: Inputs to pass to ``func``
+            concurrency: Maximum requests in flight (defaults to ``self.concurrency``)
+            as_completed: Yield results in completion order instead of returning a list
+
+        Returns:
+            List of BatchResult in input order, or an async iterator in completion order
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def run_one(index: int) -> BatchResult:
+            async with semaphore:
+                try:
+                    return BatchResult(index, await func(items[index]), None)
+                except Exception as e:
+                    return BatchResult(index, None, e)
+
+        if not as_completed:
+            return list(await asyncio.gather(*(run_one(i) for i in range(len(items)))))
+
+        async def iterate() -> AsyncIterator[BatchResult]:
+            tasks = [asyncio.ensure_future(run_one(i)) for i in range(len(items))]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+            finally:
+                # Stop outstanding work if the consumer stops early
+                for task in tasks:
+                    task.cancel()
+
+        return iterate()
+
+    async def batch_generate(
+        self,
+        model: str,
+        prompts: Sequence[str],
+        options: Optional[Dict[str, Any]] = None,
+        concurrency: Optional[int] = None,
+        as_completed: bool = False
+    ) -> Union[List[BatchResult], AsyncIterator[BatchResult]]:
+        """
+        Generate text for many prompts concurrently.
+
+        Args:
+            model: Name of the model to use
+            prompts: Prompts to generate from
+            options: Dictionary of generation options applied to every prompt
+            concurrency: Maximum requests in flight (defaults to ``self.concurrency``)
+            as_completed: Yield results as they finish instead of returning a list
+
+        Returns:
+            List of BatchResult in input order, or an async iterator in completion order
+        """
+        return await self._run_batch(
+            lambda prompt: self.generate(model, prompt, options),  # type: ignore [arg-type, return-value]
+            prompts, concurrency, as_completed
+        )
+
+    async def batch_chat(
+        self,
+        model: str,
+        conversations: Sequence[List[Dict[str, str]]],
+        options: Optional[Dict[str, Any]] = None,
+        concurrency: Optional[int] = None,
+        as_completed: bool = False
+    ) -> Union[List[BatchResult], AsyncIterator[BatchResult]]:
+        """
+        Run many independent chat conversations concurrently.
+
+        Args:
+            model: Name of the model
+            conversations: Message lists, one per chat request
+            options: Chat options applied to every conversation
+            concurrency: Maximum requests in flight (defaults to ``self.concurrency``)
+            as_completed: Yield results as they finish instead of returning a list
+
+        Returns:
+            List of BatchResult in input order, or an async iterator in completion order
+        """
+        return await self._run_batch(
+            lambda messages: self.chat(model, messages, options),  # type: ignore [arg-type, return-value]
+            conversations, concurrency, as_completed
+        )
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+JSONL batch processing for the ``ollama-forge batch`` command.
+
+Each input line is one request: a JSON object, or plain text used as the
+prompt, message or text to embed. Lines are read as they are needed and at
+most ``BATCH_WINDOW_FACTOR * concurrency`` requests are held at once, so
+inputs of any size stream through one client and its connection pool.
+Results are written one JSON line per request as they finish, and a run can
+resume from the output file of an interrupted one.
+"""
+
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from .client import BatchResult, OllamaClient, _extract_embedding
+from .config import BATCH_WINDOW_FACTOR
+from .streaming import loads
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS = ("generate", "chat", "embed")
+
+# Operation names used by RequestMetrics
+_METRICS_OPERATIONS = {"generate": "generate", "chat": "chat", "embed": "embedding"}
+
+
+class BatchRecord(NamedTuple):
+    """
+    One request read from a batch input file.
+
+    Attributes:
+        index: Position among the input's non-blank lines, starting at 0
+        id: The line's "id" field, copied to its result, or None
+        model: Model named by the line, overriding the command's, or None
+        payload: Prompt, message list or text to embed
+        options: Remaining fields, sent as request parameters
+    """
+    index: int
+    id: Any
+    model: Optional[str]
+    payload: Any
+    options: Dict[str, Any]
+
+
+def parse_record(index: int, line: bytes, operation: str) -> BatchRecord:
+    """
+    Parse one input line.
+
+    Objects name their input with "prompt" (generate), "messages" or
+    "message" plus an optional "system" (chat), or "input", "text" or
+    "prompt" (embed). Lines that are not JSON objects are used as that
+    input directly.
+
+    Args:
+        index: Position of the line among non-blank lines
+        line: The line, without its newline
+        operation: "generate", "chat" or "embed"
+
+    Returns:
+        The parsed record
+
+    Raises:
+        ValueError: If a JSON object has no input field
+    """
+    try:
+        data = loads(line)
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        text = data if isinstance(data, str) else line.decode("utf-8", errors="replace")
+        data = {"message": text} if operation == "chat" else {"prompt": text}
+    else:
+        data = dict(data)
+
+    record_id = data.pop("id", None)
+    model = data.pop("model", None)
+    if operation == "chat":
+        if "messages" in data:
+            payload = data.pop("messages")
+        elif "message" in data:
+            payload = _as_messages(data.pop("message"), data.pop("system", None))
+        else:
+            raise ValueError(f"Line {index + 1} has no 'messages' or 'message' field")
+    else:
+        names = ("prompt",) if operation == "generate" else ("input", "text", "prompt")
+        field = next((name for name in names if name in data), None)
+        if field is None:
+            raise ValueError(f"Line {index + 1} has no {' or '.join(repr(n) for n in names)} field")
+        payload = data.pop(field)
+    return BatchRecord(index, record_id, model, payload, data)
+
+
+def _as_messages(message: str, system: Optional[str] = None) -> List[Dict[str, str]]:
+    messages = [{"role": "system", "content": system}] if system else []
+    messages.append({"role": "user", "content": message})
+    return messages
+
+
+def read_records(lines: Iterable[bytes], operation: str,
+                 skip: Optional[Set[int]] = None) -> Iterator[Tuple[int, Any]]:
+    """
+    Read input lines lazily.
+
+    Args:
+        lines: Input lines, e.g. a file opened in binary mode
+        operation: "generate", "chat" or "embed"
+        skip: Indices already completed, which are not yielded
+
+    Returns:
+        Iterator of ``(index, BatchRecord or ValueError)``; a malformed
+        line is reported as its error rather than stopping the batch
+    """
+    index = -1
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        index += 1
+        if skip and index in skip:
+            continue
+        try:
+            yield index, parse_record(index, line, operation)
+        except ValueError as e:
+            yield index, e
+
+
+def completed_indices(path: str) -> Set[int]:
+    """
+    Prepare an output file to be resumed and return the indices it completed.
+
+    Failed results and a partially written last line are removed from the
+    file, so those requests run again and are appended.
+
+    Args:
+        path: Output file of an earlier run
+
+    Returns:
+        Indices of the requests that succeeded
+    """
+    if not os.path.exists(path):
+        return set()
+    done: Set[int] = set()
+    kept: List[bytes] = []
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                result = loads(line)
+            except ValueError:
+                continue
+            if isinstance(result, dict) and "error" not in result and isinstance(result.get("index"), int):
+                if result["index"] not in done:
+                    done.add(result["index"])
+                    kept.append(line if line.endswith(b"\n") else line + b"\n")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.writelines(kept)
+    os.replace(tmp_path, path)
+    return done
+
+
+def _windowed(func: Callable[[Any], Any], items: Iterable[Any], concurrency: int,
+              ordered: bool) -> Iterator[Any]:
+    """
+    Map ``func`` over ``items`` on a thread pool with a bounded number of items in flight.
+
+    Args:
+        func: Callable applied to each item; must not raise
+        items: Inputs, consumed only as fast as results are taken
+        concurrency: Number of worker threads
+        ordered: Yield results in input order instead of completion order
+
+    Returns:
+        Iterator of ``func`` results
+    """
+    window = max(1, concurrency * BATCH_WINDOW_FACTOR)
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    queue: "deque[Future]" = deque()
+    running: Set[Future] = set()
+
+    def take() -> Iterator[Any]:
+        if ordered:
+            yield queue.popleft().result()
+            return
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            running.discard(future)
+            yield future.result()
+
+    try:
+        for item in items:
+            future = executor.submit(func, item)
+            (queue.append if ordered else running.add)(future)
+            if len(queue) + len(running) >= window:
+                yield from take()
+        while queue or running:
+            yield from take()
+    finally:
+        # Stop queued work if the consumer stops early
+        for future in list(queue) + list(running):
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def run_batch(
+    client: OllamaClient,
+    operation: str,
+    model: str,
+    records: Iterable[Tuple[int, Any]],
+    concurrency: int,
+    ordered: bool = True
+) -> Iterator[Tuple[Any, BatchResult]]:
+    """
+    Send batch records through ``client``.
+
+    Args:
+        client: Client whose connection pool serves every request
+        operation: "generate", "chat" or "embed"
+        model: Model for records that don't name one
+        records: Output of ``read_records``
+        concurrency: Maximum number of requests in flight
+        ordered: Yield results in input order instead of completion order
+
+    Returns:
+        Iterator of ``(record, BatchResult)``; the record is the parse
+        error for malformed lines
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    call = {
+        "generate": client.generate,
+        "chat": client.chat,
+        "embed": client.create_embedding,
+    }[operation]
+
+    def run_one(entry: Tuple[int, Any]) -> Tuple[Any, BatchResult]:
+        index, record = entry
+        if isinstance(record, ValueError):
+            return record, BatchResult(index, None, record)
+        try:
+            return record, BatchResult(index, call(record.model or model, record.payload, record.options), None)
+        except Exception as e:
+            logger.debug(f"Batch item {index} failed: {e}")
+            return record, BatchResult(index, None, e)
+
+    return _windowed(run_one, records, concurrency, ordered)
+
+
+def result_line(operation: str, record: Any, result: BatchResult) -> Dict[str, Any]:
+    """
+    Build the output object for one request.
+
+    Successful results carry "response" (generate), "message" (chat) or
+    "embedding" (embed), the model and the request's metrics; failures carry
+    "error" and "error_type".
+    """
+    line: Dict[str, Any] = {"index": result.index}
+    if isinstance(record, BatchRecord) and record.id is not None:
+        line["id"] = record.id
+    if result.error is not None:
+        line["error"] = str(result.error)
+        line["error_type"] = type(result.error).__name__
+        return line
+    response = result.result or {}
+    line["model"] = response.get("model")
+    if operation == "generate":
+        line["response"] = response.get("response", "")
+    elif operation == "chat":
+        line["message"] = response.get("message")
+    else:
+        line["embedding"] = _extract_embedding(response)
+    metrics = getattr(response, "metrics", None)
+    if metrics is not None:
+        line["metrics"] = metrics._asdict()
+    return line
+
+
+def process_batch(
+    client: OllamaClient,
+    operation: str,
+    model: str,
+    source: IO[bytes],
+    sink: IO[str],
+    concurrency: int,
+    ordered: bool = True,
+    skip: Optional[Set[int]] = None
+) -> Dict[str, Any]:
+    """
+    Run a batch from ``source`` to ``sink``, writing each result as it is ready.
+
+    Args:
+        client: Client whose connection pool serves every request
+        operation: "generate", "chat" or "embed"
+        model: Model for records that don't name one
+        source: Input lines, opened in binary mode
+        sink: Output, opened in text mode
+        concurrency: Maximum number of requests in flight
+        ordered: Write results in input order instead of completion order
+        skip: Indices completed by an earlier run
+
+    Returns:
+        Counts of succeeded, failed and skipped requests and elapsed seconds
+    """
+    stats = {"succeeded": 0, "failed": 0, "skipped": len(skip or ()), "elapsed": 0.0}
+    start = time.perf_counter()
+    records = read_records(source, operation, skip)
+    for record, result in run_batch(client, operation, model, records, concurrency, ordered):
+        sink.write(json.dumps(result_line(operation, record, result), ensure_ascii=False) + "\n")
+        sink.flush()
+        stats["succeeded" if result.ok else "failed"] += 1
+    stats["elapsed"] = time.perf_counter() - start
+    return stats
+
+
+def format_summary(operation: str, stats: Dict[str, Any], metrics: Optional[Any] = None) -> List[str]:
+    """
+    Describe a finished batch for the terminal.
+
+    Args:
+        operation: "generate", "chat" or "embed"
+        stats: Output of ``process_batch``
+        metrics: The client's MetricsRegistry, for latency and token throughput
+
+    Returns:
+        Summary lines
+    """
+    processed = stats["succeeded"] + stats["failed"]
+    elapsed = stats["elapsed"]
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    lines = [
+        f"Processed {processed} requests in {elapsed:.2f}s ({rate:.1f}/s): "
+        f"{stats['succeeded']} succeeded, {stats['failed']} failed, {stats['skipped']} skipped"
+    ]
+    if metrics is None:
+        return lines
+    for model, fields in metrics.summary().get(_METRICS_OPERATIONS[operation], {}).items():
+        wall = fields.get("wall_time")
+        if wall:
+            lines.append(
+                f"{model}: latency p50 {wall['p50']:.3f}s, p95 {wall['p95']:.3f}s, "
+                f"p99 {wall['p99']:.3f}s, mean {wall['mean']:.3f}s"
+            )
+        tokens = metrics.tokens("completion", _METRICS_OPERATIONS[operation], model)
+        if tokens and elapsed > 0:
+            lines.append(f"{model}: {tokens} tokens generated ({tokens / elapsed:.1f} tokens/s overall)")
+    return lines
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Circuit breaking for Ollama Forge.
+
+A CircuitBreaker tracks failures per server and per model. After
+``failure_threshold`` consecutive failures a circuit opens, and requests
+through it fail at once with CircuitOpenError instead of waiting through
+timeouts and retries. Once ``recovery_time`` has passed the circuit is
+half-open: a few trial requests go through, and it closes again when they
+succeed or re-opens when one fails.
+
+Connection failures count against the server's circuit. Timeouts and
+server errors count against the model's circuit when the request names a
+model, so one model that fails to load doesn't cut off the others.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import (
+    DEFAULT_BREAKER_FAILURE_THRESHOLD, DEFAULT_BREAKER_RECOVERY_TIME,
+    DEFAULT_BREAKER_HALF_OPEN_CALLS
+)
+from .exceptions import (
+    CircuitOpenError, ConnectionError, OllamaAPIError, RateLimitError, ServerError, TimeoutError
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _Circuit:
+    """State and counters of one circuit."""
+
+    __slots__ = ("state", "failures", "opened_at", "trials", "total_failures",
+                 "total_successes", "rejected", "times_opened")
+
+    def __init__(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trials = 0
+        self.total_failures = 0
+        self.total_successes = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+
+class Ticket:
+    """Passage of one request through its circuits; record its outcome once."""
+
+    __slots__ = ("_breaker", "_circuits", "_model", "_recorded")
+
+    def __init__(self, breaker: "CircuitBreaker", circuits: List[Tuple[str, _Circuit, bool]],
+                 model: Optional[str]):
+        self._breaker = breaker
+        self._circuits = circuits
+        self._model = model
+        self._recorded = False
+
+    def record(self, error: Optional[BaseException] = None) -> None:
+        """
+        Record how the request ended.
+
+        Args:
+            error: The exception the request raised, or None if it succeeded
+        """
+        if not self._recorded:
+            self._recorded = True
+            self._breaker._record(self._circuits, self._model, error)
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuits per server and per model.
+
+    Example:
+        ```
+        client = OllamaClient(circuit_breaker=CircuitBreaker(recovery_time=10.0))
+        with client.fallback_context("chat"):
+            client.chat(model, messages)  # An open circuit falls back at once
+        print(client.circuit_breaker.stats())
+        ```
+
+    Attributes:
+        failure_threshold: Consecutive failures that open a circuit
+        recovery_time: Seconds a circuit stays open before trial requests
+        half_open_calls: Trial requests allowed at once while half-open
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_BREAKER_FAILURE_THRESHOLD,
+        recovery_time: float = DEFAULT_BREAKER_RECOVERY_TIME,
+        half_open_calls: int = DEFAULT_BREAKER_HALF_OPEN_CALLS
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open a circuit
+            recovery_time: Seconds a circuit stays open before trial requests
+            half_open_calls: Trial requests allowed at once while half-open
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.half_open_calls = half_open_calls
+        self._lock = threading.Lock()
+        self._circuits: Dict[str, _Circuit] = {}
+
+    @staticmethod
+    def _model_key(name: str) -> str:
+        return name if ":" in name else f"{name}:latest"
+
+    def _keys(self, host: str, model: Optional[str]) -> List[str]:
+        keys = [f"host:{host}"]
+        if model:
+            keys.append(f"model:{host}/{self._model_key(model)}")
+        return keys
+
+    def _passage(self, circuit: _Circuit, now: float) -> Optional[bool]:
+        """Return False to pass normally, True to pass as a trial, or None to reject."""
+        if circuit.state == OPEN and now - circuit.opened_at >= self.recovery_time:
+            circuit.state = HALF_OPEN
+            circuit.trials = 0
+        if circuit.state == CLOSED:
+            return False
+        if circuit.state == HALF_OPEN and circuit.trials < self.half_open_calls:
+            return True
+        return None
+
+    def before(self, host: str, model: Optional[str] = None) -> Ticket:
+        """
+        Admit a request through its server and model circuits.
+
+        Args:
+            host: Base URL of the server
+            model: Model the request is for
+
+        Returns:
+            Ticket on which to record the request's outcome
+
+        Raises:
+            CircuitOpenError: If a circuit is open, or half-open with all
+                trial slots taken
+        """
+        now = time.monotonic()
+        with self._lock:
+            circuits = [
+                (key, self._circuits.setdefault(key, _Circuit())) for key in self._keys(host, model)
+            ]
+            passages = [self._passage(circuit, now) for _, circuit in circuits]
+            for (key, circuit), passage in zip(circuits, passages):
+                if passage is None:
+                    circuit.rejected += 1
+                    retry_in = max(0.0, circuit.opened_at + self.recovery_time - now)
+                    raise CircuitOpenError(
+                        f"Circuit {key} is {circuit.state}; retry in {retry_in:.1f}s",
+                        {"model": model, "circuit": key, "retry_in": retry_in} if model
+                        else {"circuit": key, "retry_in": retry_in},
+                    )
+            for (_, circuit), trial in zip(circuits, passages):
+                if trial:
+                    circuit.trials += 1
+        entries = [(key, circuit, bool(trial)) for (key, circuit), trial in zip(circuits, passages)]
+        return Ticket(self, entries, model)
+
+    def _record(self, circuits: List[Tuple[str, _Circuit, bool]], model: Optional[str],
+                error: Optional[BaseException]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for key, circuit, trial in circuits:
+                if trial:
+                    circuit.trials -= 1
+                outcome = _outcome(key.startswith("model:"), model, error)
+                if outcome is None:
+                    continue
+                if outcome:
+                    circuit.total_successes += 1
+                    circuit.failures = 0
+                    if circuit.state == HALF_OPEN:
+                        circuit.state = CLOSED
+                    continue
+                circuit.total_failures += 1
+                circuit.failures += 1
+                if circuit.state == HALF_OPEN or (
+                    circuit.state == CLOSED and circuit.failures >= self.failure_threshold
+                ):
+                    circuit.state = OPEN
+                    circuit.opened_at = now
+                    circuit.times_opened += 1
+
+    def _current_state(self, circuit: _Circuit) -> str:
+        if circuit.state == OPEN and time.monotonic() - circuit.opened_at >= self.recovery_time:
+            return HALF_OPEN
+        return circuit.state
+
+    def state(self, host: str, model: Optional[str] = None) -> str:
+        """
+        Return the state of the server's circuit, or of the model's when given.
+
+        Returns:
+            "closed", "open" or "half_open"
+        """
+        with self._lock:
+            circuit = self._circuits.get(self._keys(host, model)[-1])
+            return CLOSED if circuit is None else self._current_state(circuit)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Report every circuit's state and counters.
+
+        Returns:
+            Dictionary keyed by ``host:<url>`` or ``model:<url>/<model>``, with
+            state, consecutive_failures, failures, successes, rejected and
+            times_opened for each circuit
+        """
+        with self._lock:
+            return {
+                key: {
+                    "state": self._current_state(circuit),
+                    "consecutive_failures": circuit.failures,
+                    "failures": circuit.total_failures,
+                    "successes": circuit.total_successes,
+                    "rejected": circuit.rejected,
+                    "times_opened": circuit.times_opened,
+                }
+                for key, circuit in self._circuits.items()
+            }
+
+    def reset(self) -> None:
+        """Close every circuit and clear the counters."""
+        with self._lock:
+            self._circuits.clear()
+
+
+def _outcome(model_circuit: bool, model: Optional[str], error: Optional[BaseException]) -> Optional[bool]:
+    """Classify a request for one circuit: True success, False failure, None not counted."""
+    if error is None:
+        return True
+    if isinstance(error, (CircuitOpenError, RateLimitError)) or not isinstance(error, OllamaAPIError):
+        return None  # Never reached the server, or failed in the client
+    if isinstance(error, ConnectionError):
+        return None if model_circuit else False
+    if isinstance(error, (TimeoutError, ServerError)):
+        # Blame the model when there is one; the server accepted the connection
+        if model:
+            return False if model_circuit else None
+        return False
+    return True  # The server answered, e.g. with a 4xx
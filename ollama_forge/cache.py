@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Caches for Ollama Forge.
+
+EmbeddingCache is a content-addressed, size-bounded on-disk store for
+embedding vectors. Entries are keyed by model, model digest, options and a
+hash of the text, so a re-pulled model or changed option never serves stale
+vectors. Vectors are stored as raw little-endian float32.
+
+ResponseCache stores complete generate/chat responses for deterministic
+requests in an in-memory LRU, optionally backed by SQLite.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .config import (
+    EMBEDDING_CACHE_DIR, DEFAULT_EMBEDDING_CACHE_MAX_BYTES,
+    DEFAULT_RESPONSE_CACHE_ENTRIES
+)
+
+logger = logging.getLogger(__name__)
+
+_ENTRY_SUFFIX = ".f32"
+
+
+# Request fields that don't change what the model produces
+_UNKEYED_FIELDS = ("stream", "keep_alive")
+
+
+def _canonical_json(value: Any) -> str:
+    """Serialize a value deterministically for use in cache keys."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def is_deterministic(data: Dict[str, Any]) -> bool:
+    """
+    Check whether a generate/chat request always produces the same output.
+
+    A request is deterministic when it sets ``temperature`` to 0 or fixes a
+    ``seed``, either at the top level or in its ``options``.
+
+    Args:
+        data: Request body
+
+    Returns:
+        True if the response can be cached
+    """
+    for source in (data, data.get("options") or {}):
+        if source.get("seed") is not None or source.get("temperature") == 0:
+            return True
+    return False
+
+
+class EmbeddingCache:
+    """
+    Size-bounded, least-recently-used on-disk cache of embedding vectors.
+
+    The cache is safe to share between threads. Recency is persisted through
+    file modification times, so LRU order survives process restarts.
+
+    Attributes:
+        directory: Directory holding the cache entries
+        max_bytes: Upper bound on the total size of stored vectors
+        hits: Number of lookups served from the cache
+        misses: Number of lookups not found in the cache
+    """
+
+    def __init__(
+        self,
+        directory: str = EMBEDDING_CACHE_DIR,
+        max_bytes: int = DEFAULT_EMBEDDING_CACHE_MAX_BYTES,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding the cache entries (created on first write)
+            max_bytes: Upper bound on the total size of stored vectors
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: Optional["OrderedDict[str, int]"] = None
+        self._total_bytes = 0
+
+    @staticmethod
+    def make_key(
+        model: str,
+        digest: str,
+        text: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Build the content address of an embedding.
+
+        Args:
+            model: Resolved model name
+            digest: Model digest reported by ``/api/tags``
+            text: Text that was embedded
+            options: Request options that affect the vector
+
+        Returns:
+            Hex digest identifying the entry
+        """
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        payload = _canonical_json([model, digest, options or {}, text_hash])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + _ENTRY_SUFFIX)
+
+    def _index(self) -> "OrderedDict[str, int]":
+        """Return the LRU index, scanning the directory on first use."""
+        if self._entries is None:
+            found = []
+            if os.path.isdir(self.directory):
+                for root, _, files in os.walk(self.directory):
+                    for name in files:
+                        if not name.endswith(_ENTRY_SUFFIX):
+                            continue
+                        try:
+                            stat = os.stat(os.path.join(root, name))
+                        except OSError:
+                            continue
+                        found.append((stat.st_mtime, name[:-len(_ENTRY_SUFFIX)], stat.st_size))
+            found.sort()
+            self._entries = OrderedDict((key, size) for _, key, size in found)
+            self._total_bytes = sum(self._entries.values())
+        return self._entries
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """
+        Look up a vector.
+
+        Args:
+            key: Entry key from ``make_key``
+
+        Returns:
+            The cached vector, or None on a miss
+        """
+        with self._lock:
+            entries = self._index()
+            if key not in entries:
+                self.misses += 1
+                return None
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    raw = f.read()
+                os.utime(path)
+            except OSError:
+                self._total_bytes -= entries.pop(key)
+                self.misses += 1
+                return None
+            entries.move_to_end(key)
+            self.hits += 1
+
+        vector = array("f")
+        vector.frombytes(raw)
+        if sys.byteorder == "big":
+            vector.byteswap()
+        return vector.tolist()
+
+    def put(self, key: str, vector: Sequence[float]) -> None:
+        """
+        Store a vector, evicting least-recently-used entries beyond ``max_bytes``.
+
+        Args:
+            key: Entry key from ``make_key``
+            vector: Embedding vector
+        """
+        packed = array("f", vector)
+        if sys.byteorder == "big":
+            packed.byteswap()
+        data = packed.tobytes()
+        path = self._path(key)
+
+        with self._lock:
+            entries = self._index()
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Write atomically so concurrent readers never see partial vectors
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Failed to write embedding cache entry: {e}")
+                return
+
+            self._total_bytes += len(data) - entries.pop(key, 0)
+            entries[key] = len(data)
+            while self._total_bytes > self.max_bytes and len(entries) > 1:
+                old_key, size = entries.popitem(last=False)
+                self._total_bytes -= size
+                try:
+                    os.remove(self._path(old_key))
+                except OSError:
+                    pass
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            for key in list(self._index()):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._entries = OrderedDict()
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cache usage.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, entries and bytes
+        """
+        with self._lock:
+            entries = self._index()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(entries),
+                "bytes": self._total_bytes,
+            }
+
+
+class ResponseCache:
+    """
+    Least-recently-used cache of generate/chat responses.
+
+    Entries live in memory, bounded by ``max_entries``. With a ``path`` they
+    are also written to a SQLite database, so repeated runs of the same
+    requests are served without inference. Entries are kept as JSON, so
+    each hit is a fresh copy the caller may modify. The cache is safe to
+    share between threads.
+
+    Attributes:
+        max_entries: Maximum responses held in memory
+        path: SQLite database path, or None for memory only
+        hits: Number of lookups served from the cache
+        misses: Number of lookups not found in the cache
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_RESPONSE_CACHE_ENTRIES,
+        path: Optional[str] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum responses held in memory
+            path: SQLite database path (e.g. ``config.RESPONSE_CACHE_PATH``),
+                created on first write; None keeps entries in memory only
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, str]" = OrderedDict()  # Key to serialized response
+        self._db: Optional[sqlite3.Connection] = None
+
+    @staticmethod
+    def make_key(endpoint: str, data: Dict[str, Any], digest: str) -> str:
+        """
+        Build the key of a request.
+
+        Args:
+            endpoint: API endpoint path
+            data: Request body
+            digest: Model digest reported by ``/api/tags``
+
+        Returns:
+            Hex digest identifying the entry
+        """
+        request = {key: value for key, value in data.items() if key not in _UNKEYED_FIELDS}
+        payload = _canonical_json([endpoint, digest, request])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _connect(self, create: bool) -> Optional[sqlite3.Connection]:
+        """Open the database, creating it only when ``create`` is set."""
+        if self._db is None and self.path is not None:
+            if not create and not os.path.exists(self.path):
+                return None
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                db = sqlite3.connect(self.path, check_same_thread=False)
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS responses "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+                )
+                self._db = db
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Failed to open response cache database: {e}")
+                self.path = None
+        return self._db
+
+    def _remember(self, key: str, value: str) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a response.
+
+        Args:
+            key: Entry key from ``make_key``
+
+        Returns:
+            A copy of the cached response, or None on a miss
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            else:
+                db = self._connect(create=False)
+                if db is not None:
+                    row = db.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+                    if row is not None:
+                        value = row[0]
+                        self._remember(key, value)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(value)
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        """
+        Store a complete response.
+
+        Args:
+            key: Entry key from ``make_key``
+            response: Non-streaming response body
+        """
+        value = json.dumps(response)
+        with self._lock:
+            self._remember(key, value)
+            db = self._connect(create=True)
+            if db is not None:
+                try:
+                    with db:
+                        db.execute(
+                            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                            (key, value, time.time())
+                        )
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to write response cache entry: {e}")
+
+    def record(self, key: str, chunks: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Pass a stream through, storing the assembled response once it completes.
+
+        Args:
+            key: Entry key from ``make_key``
+            chunks: Stream chunks from ``generate`` or ``chat``
+
+        Returns:
+            Iterator yielding the same chunks
+        """
+        parts: List[str] = []
+        message: Dict[str, Any] = {}
+        for chunk in chunks:
+            if "message" in chunk:
+                message.update({k: v for k, v in chunk["message"].items() if k != "content"})
+                parts.append(chunk["message"].get("content") or "")
+            else:
+                parts.append(chunk.get("response") or "")
+            if chunk.get("done"):
+                response = dict(chunk)
+                if "message" in chunk:
+                    response["message"] = dict(message, content="".join(parts))
+                else:
+                    response["response"] = "".join(parts)
+                self.put(key, response)
+            yield chunk
+
+    @staticmethod
+    def replay(response: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Replay a cached response as a stream.
+
+        Args:
+            response: Cached non-streaming response
+
+        Returns:
+            Iterator yielding a content chunk followed by the final chunk
+        """
+        base = {key: response[key] for key in ("model", "created_at") if key in response}
+        if "message" in response:
+            yield dict(base, message=response["message"], done=False)
+            yield dict(response, message=dict(response["message"], content=""))
+        else:
+            yield dict(base, response=response.get("response", ""), done=False)
+            yield dict(response, response="")
+
+    def clear(self) -> None:
+        """Remove every entry, in memory and on disk, and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            db = self._connect(create=False)
+            if db is not None:
+                with db:
+                    db.execute("DELETE FROM responses")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cache usage.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, entries and disk_entries
+        """
+        with self._lock:
+            db = self._connect(create=False)
+            disk_entries = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] if db else 0
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "disk_entries": disk_entries,
+            }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -9,10 +9,128 @@ Built with Eidosian principles to ensure both power and simplicity.
 import argparse
 import sys
 import textwrap
-from typing import List, Optional, Any, Dict, Union
+from typing import List, Optional, Any, Callable, Dict, Iterable, Tuple, Union
 
 from . import __version__, DEFAULT_CHAT_MODEL, DEFAULT_EMBEDDING_MODEL
-from .client import OllamaClient
+from .client import OllamaClient, _estimate_tokens
+from .config import (
+    DEFAULT_OLLAMA_API_URL, RECOMMENDED_CONTEXT, CHAT_REPLY_RESERVE_FRACTION, DEFAULT_BATCH_CONCURRENCY
+)
+from .streaming import chunk_text
+
+
+class ChatContext:
+    """
+    Chat history kept within a model's context window.
+    
+    Token counts start as estimates and are corrected from the
+    ``prompt_eval_count``/``eval_count`` the server reports for each reply.
+    When the next request would not leave room for a reply, the oldest
+    exchanges are dropped; the system message is always kept.
+    
+    Attributes:
+        messages: Messages to send with the next request
+        context_window: Context length in tokens
+        reserve_tokens: Tokens kept free for the model's reply
+    """
+    
+    def __init__(
+        self,
+        system: str,
+        context_window: int = RECOMMENDED_CONTEXT,
+        reserve_tokens: Optional[int] = None
+    ):
+        self.messages: List[Dict[str, Any]] = [{"role": "system", "content": system}]
+        self.context_window = context_window
+        if reserve_tokens is None:
+            reserve_tokens = int(context_window * CHAT_REPLY_RESERVE_FRACTION)
+        self.reserve_tokens = reserve_tokens
+        self._tokens = [_estimate_tokens(system)]
+    
+    @property
+    def used_tokens(self) -> int:
+        """Tokens taken by the current history."""
+        return sum(self._tokens)
+    
+    def add_user(self, content: str) -> int:
+        """
+        Append a user message, trimming old exchanges to make room.
+        
+        Args:
+            content: The user's message
+            
+        Returns:
+            Number of messages dropped from the history
+        """
+        self.messages.append({"role": "user", "content": content})
+        self._tokens.append(_estimate_tokens(content))
+        
+        budget = self.context_window - self.reserve_tokens
+        dropped = 0
+        # Keep the system message and the new user message
+        while len(self.messages) > 2 and (
+            self.used_tokens > budget or (dropped and self.messages[1]["role"] != "user")
+        ):
+            # Drop whole exchanges so the history never starts with a reply
+            del self.messages[1]
+            del self._tokens[1]
+            dropped += 1
+        return dropped
+    
+    def discard_user(self) -> None:
+        """Remove a trailing user message that never got a reply."""
+        if self.messages[-1]["role"] == "user":
+            self.messages.pop()
+            self._tokens.pop()
+    
+    def add_reply(self, message: Dict[str, Any], final_chunk: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Append the assistant's reply and calibrate token counts.
+        
+        Args:
+            message: The assistant message
+            final_chunk: Last stream chunk, carrying the server's token counts
+        """
+        final_chunk = final_chunk or {}
+        prompt_tokens = final_chunk.get("prompt_eval_count")
+        earlier = sum(self._tokens[:-1])
+        # A partially cached prompt reports fewer tokens; keep the estimate then
+        if prompt_tokens and prompt_tokens > earlier:
+            self._tokens[-1] = prompt_tokens - earlier
+        
+        self.messages.append(message)
+        self._tokens.append(final_chunk.get("eval_count") or _estimate_tokens(message.get("content", "")))
+
+
+def accumulate_reply(
+    chunks: Iterable[Dict[str, Any]],
+    on_text: Optional[Callable[[str], None]] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Build the assistant message from streamed chat chunks.
+    
+    Args:
+        chunks: Chunks from ``client.chat(..., stream=True)``
+        on_text: Called with each piece of text as it arrives
+        
+    Returns:
+        Tuple of (assistant message, final chunk)
+    """
+    parts: List[str] = []
+    message: Dict[str, Any] = {"role": "assistant"}
+    final_chunk: Dict[str, Any] = {}
+    for chunk in chunks:
+        text = chunk_text(chunk)
+        if text:
+            parts.append(text)
+            if on_text is not None:
+                on_text(text)
+        for key, value in (chunk.get("message") or {}).items():
+            if key not in ("role", "content"):
+                message[key] = value
+        final_chunk = chunk
+    message["content"] = "".join(parts)
+    return message, final_chunk
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -90,6 +208,12 @@ def create_parser() -> argparse.ArgumentParser:
         default="You are a helpful assistant.",
         help="System message (default: You are a helpful assistant.)",
     )
+    chat_session_parser.add_argument(
+        "--context-window",
+        type=int,
+        default=RECOMMENDED_CONTEXT,
+        help=f"Context length in tokens; older turns are dropped to fit (default: {RECOMMENDED_CONTEXT})",
+    )
 
     # Embedding command
     embed_parser = subparsers.add_parser("embed", help="Generate embeddings for text")
@@ -104,6 +228,39 @@ def create_parser() -> argparse.ArgumentParser:
     pull_parser = subparsers.add_parser("pull", help="Pull a model")
     pull_parser.add_argument("model", help="Model name to pull")
 
+    # Batch command: one request per JSONL input line
+    batch_parser = subparsers.add_parser(
+        "batch", help="Run one request per line of a JSONL file",
+        description="Run one request per input line. A line is a JSON object "
+                    '(e.g. {"id": 1, "prompt": "..."}) or plain text used as the prompt, '
+                    "message or text to embed. Results are written as JSON lines.",
+    )
+    batch_parser.add_argument(
+        "operation", choices=("generate", "chat", "embed"), help="Request to run for each line"
+    )
+    batch_parser.add_argument(
+        "--model", "-m", default=None,
+        help="Model for lines that don't name one (default: the default chat or embedding model)",
+    )
+    batch_parser.add_argument(
+        "--input", "-i", default="-", help="Input JSONL file (default: stdin)"
+    )
+    batch_parser.add_argument(
+        "--output", "-o", default="-", help="Output JSONL file (default: stdout)"
+    )
+    batch_parser.add_argument(
+        "--concurrency", "-c", type=int, default=DEFAULT_BATCH_CONCURRENCY,
+        help=f"Requests in flight (default: {DEFAULT_BATCH_CONCURRENCY})",
+    )
+    batch_parser.add_argument(
+        "--order", choices=("input", "completion"), default="input",
+        help="Write results in input order or as they complete (default: input)",
+    )
+    batch_parser.add_argument(
+        "--resume", action="store_true",
+        help="Skip lines that already succeeded in --output and append the rest",
+    )
+
     # Add more commands as needed...
 
     return parser
@@ -159,7 +316,9 @@ def handle_chat_session(args: argparse.Namespace, client: OllamaClient) -> int:
     from colorama import Fore, Style, init
     init()  # Initialize colorama
     
-    messages = [{"role": "system", "content": args.system}]
+    context = ChatContext(args.system, context_window=args.context_window)
+    # Ask the server for the same window the history is trimmed to
+    options = {"options": {"num_ctx": args.context_window}}
     
     print(f"{Fore.CYAN}Welcome to Ollama Forge Chat Session{Style.RESET_ALL}")
     print(f"{Fore.YELLOW}Model: {args.model}{Style.RESET_ALL}")
@@ -173,17 +332,18 @@ def handle_chat_session(args: argparse.Namespace, client: OllamaClient) -> int:
             if user_input.lower() in ("exit", "quit", "/exit", "/quit"):
                 break
                 
-            messages.append({"role": "user", "content": user_input})
+            dropped = context.add_user(user_input)
+            if dropped:
+                print(f"{Fore.YELLOW}(Dropped {dropped} earlier messages to fit the "
+                      f"{args.context_window}-token context){Style.RESET_ALL}")
             
             print(f"{Fore.BLUE}Assistant: {Style.RESET_ALL}", end="")
-            for chunk in client.chat(model=args.model, messages=messages, stream=True):
-                if "message" in chunk and "content" in chunk["message"]:
-                    print(chunk["message"]["content"], end="", flush=True)
-            
-            # Add assistant's full response to messages for context
-            response = client.chat(model=args.model, messages=messages, stream=False)
-            if "message" in response:
-                messages.append(response["message"])
+            # The streamed reply is the one kept in history, so each turn runs once
+            message, final_chunk = accumulate_reply(
+                client.chat(model=args.model, messages=context.messages, options=options, stream=True),
+                on_text=lambda text: print(text, end="", flush=True),
+            )
+            context.add_reply(message, final_chunk)
             
             print("\n" + "─" * 50)
             
@@ -191,6 +351,8 @@ def handle_chat_session(args: argparse.Namespace, client: OllamaClient) -> int:
             print("\nExiting chat session...")
             break
         except Exception as e:
+            # Keep the history consistent: drop the unanswered user message
+            context.discard_user()
             print(f"\n{Fore.RED}Error: {e}{Style.RESET_ALL}")
     
     return 0
@@ -226,7 +388,7 @@ def handle_pull(args: argparse.Namespace, client: OllamaClient) -> int:
     
     with tqdm(unit="B", unit_scale=True, desc=args.model) as pbar:
         last_total = 0
-        for progress in client.pull(args.model, stream=True):
+        for progress in client.pull_model(args.model, stream=True):
             if "completed" in progress and progress.get("total", 0) > 0:
                 progress_bytes = int(progress["completed"])
                 total_bytes = int(progress["total"])
@@ -242,6 +404,42 @@ def handle_pull(args: argparse.Namespace, client: OllamaClient) -> int:
     return 0
 
 
+def handle_batch(args: argparse.Namespace, client: OllamaClient) -> int:
+    """Handle batch processing of a JSONL file over one pooled client."""
+    from .batch import completed_indices, format_summary, process_batch
+    
+    if args.concurrency < 1:
+        print("--concurrency must be at least 1", file=sys.stderr)
+        return 1
+    if args.resume and args.output == "-":
+        print("--resume needs an --output file", file=sys.stderr)
+        return 1
+    model = args.model or (DEFAULT_EMBEDDING_MODEL if args.operation == "embed" else DEFAULT_CHAT_MODEL)
+    # A dedicated client sized for the batch, recording metrics for the summary
+    batch_client = OllamaClient(
+        base_url=client.base_url, max_connections=args.concurrency, metrics_sink=True
+    )
+    skip = completed_indices(args.output) if args.resume else set()
+    
+    source = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    sink = sys.stdout if args.output == "-" else open(args.output, "a" if args.resume else "w", encoding="utf-8")
+    try:
+        stats = process_batch(
+            batch_client, args.operation, model, source, sink, args.concurrency,
+            ordered=args.order == "input", skip=skip,
+        )
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+        batch_client.session.close()
+    
+    for line in format_summary(args.operation, stats, batch_client.metrics_sink):
+        print(line, file=sys.stderr)
+    return 0 if stats["failed"] == 0 else 2
+
+
 def main(args: Optional[List[str]] = None) -> int:
     """
     Main entry point for the CLI with perfect flow control.
@@ -260,7 +458,7 @@ def main(args: Optional[List[str]] = None) -> int:
         return 1
     
     try:
-        client = OllamaClient(api_base=parsed_args.api_url)
+        client = OllamaClient(base_url=parsed_args.api_url or DEFAULT_OLLAMA_API_URL)
         
         # Command dispatch with elegant pattern
         handlers = {
@@ -270,6 +468,7 @@ def main(args: Optional[List[str]] = None) -> int:
             "embed": handle_embed,
             "list": handle_list,
             "pull": handle_pull,
+            "batch": handle_batch,
             # Add more handlers as needed...
         }
         
@@ -1,37 +1,205 @@
-import json
 import time
 import threading
-from typing import Any, Dict, Generator, Iterator, List, Optional, Union, AsyncIterator
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, Generator, Iterator, List, NamedTuple, Optional,
+    Sequence, TypeVar, Union, AsyncIterator
+)
 import logging
+import importlib.util
 import requests
-import httpx
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed as futures_as_completed
 import asyncio  # Added to fix "asyncio is not defined" warning
 from contextlib import contextmanager
-from tqdm.auto import tqdm  # Explicit import from tqdm.auto
+
+# httpx is imported on first async use and tqdm when a progress bar is shown
+if TYPE_CHECKING:
+    import httpx
 
 # Internal imports
 from .exceptions import (
     OllamaAPIError, ConnectionError, ModelNotFoundError,
-    ServerError, TimeoutError,
+    ServerError, TimeoutError, InvalidRequestError,
     StreamingError,
     get_exception_for_status
 )
 from .config import (
     DEFAULT_OLLAMA_API_URL, DEFAULT_TIMEOUT,
     API_ENDPOINTS, DISABLE_PROGRESS_BARS,
-    DEBUG_MODE
+    DEBUG_MODE, DEFAULT_EMBEDDING_BATCH_SIZE,
+    DEFAULT_EMBEDDING_BATCH_TOKENS, CHARS_PER_TOKEN_ESTIMATE,
+    DEFAULT_MAX_CONNECTIONS, DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    DEFAULT_KEEPALIVE_EXPIRY, DEFAULT_BATCH_CONCURRENCY,
+    MODEL_DIGEST_TTL, DEFAULT_KEEP_ALIVE
+)
+from .breaker import CircuitBreaker
+from .keepalive import KeepAlive, ModelKeeper
+from .metrics import (
+    CallbackSink, MeteredResponse, MetricsRegistry, MetricsSink, RequestMetrics, ameasure_stream,
+    measure_stream, request_metrics
+)
+from .fallback import OPERATION_MODEL_TYPES, awith_fallback, with_fallback
+from .cache import EmbeddingCache, ResponseCache, _canonical_json, is_deterministic
+from .coalesce import AsyncSingleFlight, SingleFlight
+from .ratelimit import RequestLimiter
+from .retry import RetryPolicy, parse_retry_after
+from .scheduler import PriorityScheduler, request_priority
+from .streaming import aiter_ndjson, iter_ndjson, loads
+from .tracing import (
+    Tracer, activate, as_tracer, atrace_stream, end_span, metrics_attributes, start_span,
+    trace_span, trace_stream
 )
 from helpers.model_constants import (
     resolve_model_alias, get_fallback_model
 )
 
 # Utility flags and functions
-TQDM_AVAILABLE = True
+TQDM_AVAILABLE = importlib.util.find_spec("tqdm") is not None
 HELPERS_AVAILABLE = True # Set to True if helper functions are available
     
 # Set up module logger
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+class BatchResult(NamedTuple):
+    """
+    Outcome of one item in a batch request.
+    
+    Attributes:
+        index: Position of the item in the batch input
+        result: Response dictionary, or None if the item failed
+        error: Exception raised for the item, or None if it succeeded
+    """
+    index: int
+    result: Optional[Dict[str, Any]]
+    error: Optional[BaseException]
+    
+    @property
+    def ok(self) -> bool:
+        """Whether the item completed without error."""
+        return self.error is None
+
+
+def _extract_embedding(response: Dict[str, Any]) -> Optional[List[float]]:
+    """Return the single vector from an /api/embed or legacy embedding response."""
+    embeddings = response.get("embeddings")
+    if embeddings and isinstance(embeddings[0], list):
+        return embeddings[0]
+    return response.get("embedding")
+
+
+def _error_for_status(status_code: int, body: str) -> OllamaAPIError:
+    """Build the exception for an HTTP error response from its status and body."""
+    message = body or f"HTTP {status_code}"
+    payload = None
+    try:
+        payload = loads(body)
+        if isinstance(payload, dict) and "error" in payload:
+            message = payload["error"]
+        else:
+            payload = None
+    except ValueError:
+        pass
+    return get_exception_for_status(status_code, message, payload)
+
+
+def _note_model(error: OllamaAPIError, data: Optional[Dict[str, Any]]) -> None:
+    """Record the requested model on an error so fallback handling can find it."""
+    model = (data or {}).get("model")
+    if model:
+        if error.response is None:
+            error.response = {}
+        error.response.setdefault("model", model)
+
+
+def _release_all(releases: List[Callable[[], None]]) -> None:
+    """Release admissions in the reverse order they were acquired."""
+    for release in reversed(releases):
+        release()
+
+
+def _call_on_close(response: requests.Response, callback: Callable[[], None]) -> None:
+    """Run ``callback`` once, after a streamed response is closed."""
+    close = response.close
+    called = []
+
+    def close_and_call() -> None:
+        try:
+            close()
+        finally:
+            if not called:
+                called.append(True)
+                callback()
+
+    response.close = close_and_call  # type: ignore [method-assign]
+
+
+def _call_on_aclose(response: "httpx.Response", callback: Callable[[], None]) -> None:
+    """Run ``callback`` once, after a streamed async response is closed."""
+    aclose = response.aclose
+    called = []
+
+    async def aclose_and_call() -> None:
+        try:
+            await aclose()
+        finally:
+            if not called:
+                called.append(True)
+                callback()
+
+    response.aclose = aclose_and_call  # type: ignore [method-assign]
+
+
+def _trace_response(span: Any, status_code: int, stream: bool) -> None:
+    """Record an attempt's response status; a stream's headers are its first byte."""
+    span.set_attribute("http.response.status_code", status_code)
+    if stream:
+        span.add_event("first_byte")
+
+
+def _estimate_tokens(text: str) -> int:
+    """Cheap token estimate used to bound embedding batch sizes."""
+    return len(text) // CHARS_PER_TOKEN_ESTIMATE + 1
+
+
+def _pack_batches(
+    texts: List[str],
+    max_items: int,
+    max_tokens: int
+) -> List[List[int]]:
+    """
+    Greedily pack texts into batches bounded by item count and estimated tokens.
+    
+    A single text larger than ``max_tokens`` still gets a batch of its own so
+    that the server can decide whether to truncate it.
+    
+    Args:
+        texts: Texts to pack
+        max_items: Maximum number of texts per batch
+        max_tokens: Maximum estimated tokens per batch
+        
+    Returns:
+        List of batches, each a list of indices into ``texts``
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    
+    for index, text in enumerate(texts):
+        tokens = _estimate_tokens(text)
+        if current and (len(current) >= max_items or current_tokens + tokens > max_tokens):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(index)
+        current_tokens += tokens
+        
+    if current:
+        batches.append(current)
+    return batches
+
 
 class OllamaClient:
     """
@@ -41,18 +209,55 @@ class OllamaClient:
     with support for both synchronous and asynchronous requests, streaming responses,
     and robust error handling.
     
+    Asynchronous methods share one lazily created ``httpx.AsyncClient`` with
+    keep-alive connection pooling. Close it with ``aclose()`` or by using the
+    client as an async context manager.
+    
+    Passing ``embedding_cache=True`` (or an ``EmbeddingCache``) makes
+    ``create_embedding`` and ``batch_embeddings`` serve repeated texts from
+    disk, so only cache misses are sent to the server. Likewise
+    ``response_cache=True`` (or a ``ResponseCache``) serves repeated
+    deterministic ``generate``/``chat`` requests (``temperature=0`` or a
+    fixed ``seed``) without running the model again.
+    
     Attributes:
         base_url: Base URL for the Ollama API
         timeout: Request timeout in seconds
         max_retries: Maximum number of retries for failed requests
+        limits: Connection pool limits for the async client
+        embedding_cache: On-disk embedding cache, or None when disabled
+        response_cache: Generate/chat response cache, or None when disabled
+        coalesce_requests: Whether identical concurrent requests share one call
+        limiter: Client-side rate limiter, or None when disabled
+        scheduler: Priority scheduler, or None when disabled
+        retry_policy: Policy deciding when failed requests are retried
+        circuit_breaker: Per-server and per-model circuit breaker, or None when disabled
+        metrics_sink: Receiver of per-request metrics, or None when disabled
+        tracer: Tracer receiving request spans, or None when disabled
     """
     
+    # Subclasses that choose a server per request set this and check the
+    # circuit breaker against the chosen server in their transport
+    _breaker_per_host = False
+    
     def __init__(
         self,
         base_url: str = DEFAULT_OLLAMA_API_URL,
         timeout: int = DEFAULT_TIMEOUT,
         max_retries: int = 3,
         session: Optional[requests.Session] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        embedding_cache: Union[bool, EmbeddingCache, None] = None,
+        response_cache: Union[bool, ResponseCache, None] = None,
+        coalesce_requests: bool = True,
+        limiter: Optional[RequestLimiter] = None,
+        scheduler: Optional[PriorityScheduler] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Union[bool, CircuitBreaker, None] = None,
+        metrics_sink: Union[bool, MetricsSink, Callable[[RequestMetrics], None], None] = None,
+        tracer: Union[bool, Tracer, Any, None] = None,
     ):
         """
         Initialize the Ollama client.
@@ -62,12 +267,112 @@ class OllamaClient:
             timeout: Request timeout in seconds
             max_retries: Maximum number of retries for failed requests
             session: Optional requests.Session to use
+            max_connections: Maximum concurrent connections in the async pool
+            max_keepalive_connections: Maximum idle connections kept open
+            keepalive_expiry: Seconds an idle pooled connection is kept open
+            embedding_cache: True for the default on-disk embedding cache, or
+                an EmbeddingCache instance; disabled by default
+            response_cache: True for an in-memory response cache, or a
+                ResponseCache instance (which may persist to SQLite);
+                disabled by default
+            coalesce_requests: Let concurrent identical embedding and
+                deterministic generate/chat requests share one upstream call
+            limiter: Optional RequestLimiter applying client-side rate limits
+                and admission control to every request
+            scheduler: Optional PriorityScheduler ordering requests by their
+                ``priority=`` class before they are sent
+            retry_policy: Retry policy (defaults to ``RetryPolicy(max_retries)``);
+                its max_retries takes precedence over the argument
+            circuit_breaker: True for a CircuitBreaker with default settings,
+                or a CircuitBreaker instance (which may be shared by clients);
+                disabled by default
+            metrics_sink: True for a MetricsRegistry, a MetricsSink, or a
+                function called with the RequestMetrics of every generate,
+                chat and embedding request
+            tracer: A Tracer (such as InMemoryTracer), an OpenTelemetry
+                tracer, or True for OpenTelemetry's global tracer provider;
+                disabled by default
         """
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
-        self.max_retries = max_retries
-        self.session = session or requests.Session()
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=max_retries)
+        self.max_retries = self.retry_policy.max_retries
+        if session is None:
+            # Size the sync pool like the async one so threads don't discard connections
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=max_connections)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+        self._limits_args = {
+            "max_connections": max_connections,
+            "max_keepalive_connections": max_keepalive_connections,
+            "keepalive_expiry": keepalive_expiry,
+        }
+        self._limits: Optional["httpx.Limits"] = None
         self._thread_local = threading.local()
+        self._async_client: Optional["httpx.AsyncClient"] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.embedding_cache = EmbeddingCache() if embedding_cache is True else (embedding_cache or None)
+        self.response_cache = ResponseCache() if response_cache is True else (response_cache or None)
+        self.coalesce_requests = coalesce_requests
+        self.limiter = limiter
+        self.scheduler = scheduler
+        self.circuit_breaker = CircuitBreaker() if circuit_breaker is True else (circuit_breaker or None)
+        if metrics_sink is True:
+            metrics_sink = MetricsRegistry()
+        elif callable(metrics_sink) and not isinstance(metrics_sink, MetricsSink):
+            metrics_sink = CallbackSink(metrics_sink)
+        self.metrics_sink: Optional[MetricsSink] = metrics_sink or None
+        self.tracer = as_tracer(tracer)
+        self._single_flight = SingleFlight()
+        self._async_single_flight = AsyncSingleFlight()
+        self._model_digests: Dict[str, str] = {}
+        self._model_digests_at = 0.0
+        self._model_digests_lock = threading.Lock()
+    
+    @property
+    def limits(self) -> "httpx.Limits":
+        """Connection pool limits of the async client."""
+        if self._limits is None:
+            import httpx
+            self._limits = httpx.Limits(**self._limits_args)
+        return self._limits
+
+    def _get_async_client(self) -> "httpx.AsyncClient":
+        """
+        Return the pooled async client, creating it on first use.
+        
+        An ``httpx.AsyncClient`` is bound to the event loop it first ran on,
+        so a new one is created when called from a different loop.
+        """
+        import httpx
+        loop = asyncio.get_running_loop()
+        if (
+            self._async_client is None
+            or self._async_client.is_closed
+            or self._async_client_loop is not loop
+        ):
+            self._async_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                follow_redirects=True,
+            )
+            self._async_client_loop = loop
+        return self._async_client
+    
+    async def aclose(self) -> None:
+        """Close the pooled async client and its keep-alive connections."""
+        client, self._async_client = self._async_client, None
+        self._async_client_loop = None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+    
+    async def __aenter__(self) -> "OllamaClient":
+        return self
+    
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
     
     def _with_retry(
         self,
@@ -78,7 +383,91 @@ class OllamaClient:
         headers: Optional[Dict[str, str]] = None,
     ) -> Optional[requests.Response]:
         """
-        Make an HTTP request with retry logic.
+        Make an HTTP request with retry logic, coalescing identical requests.
+        
+        Concurrent identical embedding requests and deterministic
+        generate/chat requests share one upstream call (see ``_coalesce_key``).
+        Model and server errors name the requested model in ``response``.
+        Arguments, return value and exceptions are those of ``_send_with_retry``.
+        """
+        key = self._coalesce_key(method, endpoint, data, stream)
+        attributes = self._request_attributes(method, endpoint, data, stream)
+        with trace_span(self.tracer, "ollama.request", attributes) as span:
+            try:
+                if key is None:
+                    response = self._send_limited(method, endpoint, data, stream, headers)
+                else:
+                    response = self._single_flight.do(
+                        key, lambda: self._send_limited(method, endpoint, data, stream, headers)
+                    )
+            except (ModelNotFoundError, ServerError) as e:
+                _note_model(e, data)
+                raise
+            if span is not None and response is not None:
+                span.set_attribute("http.response.status_code", response.status_code)
+            return response
+    
+    def _send_limited(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        stream: bool,
+        headers: Optional[Dict[str, str]],
+    ) -> Optional[requests.Response]:
+        """
+        Send a request once the circuit breaker, scheduler and limiter admit it.
+        
+        The scheduler slot and limiter permit are held until the response is
+        complete; for a stream, until the response is closed. The outcome,
+        after any retries, is recorded on the circuit breaker.
+        
+        Raises:
+            CircuitOpenError: If the server's or model's circuit is open
+            RateLimitError: If the request isn't admitted before the queue timeout
+        """
+        breaker = None if self._breaker_per_host else self.circuit_breaker
+        if self.scheduler is None and self.limiter is None and breaker is None:
+            return self._send_with_retry(method, endpoint, data, stream, headers)
+        model = (data or {}).get("model")
+        ticket = None
+        releases: List[Callable[[], None]] = []
+        try:
+            with trace_span(self.tracer, "ollama.queue"):
+                if breaker is not None:
+                    ticket = breaker.before(self.base_url, model)
+                if self.scheduler is not None:
+                    releases.append(self.scheduler.acquire().release)
+                if self.limiter is not None:
+                    releases.append(self.limiter.acquire(endpoint, model).release)
+            response = self._send_with_retry(method, endpoint, data, stream, headers)
+        except BaseException as e:
+            _release_all(releases)
+            if ticket is not None:
+                ticket.record(e)
+            raise
+        if ticket is not None:
+            ticket.record()
+        if stream and response is not None:
+            _call_on_close(response, lambda: _release_all(releases))
+        else:
+            _release_all(releases)
+        return response
+    
+    def _send_with_retry(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Optional[requests.Response]:
+        """
+        Make an HTTP request, retrying failures as ``retry_policy`` allows.
+        
+        Timeouts, connection failures and retryable statuses (such as 429
+        and 503) are retried after a jittered wait, at least as long as any
+        Retry-After header asks. Other errors are raised at once.
         
         Args:
             method: HTTP method (GET, POST, etc.)
@@ -93,7 +482,7 @@ class OllamaClient:
         Raises:
             ConnectionError: If connection fails after all retries
             ModelNotFoundError: If the model is not found
-            ServerError: If the server returns a 5xx error
+            ServerError: If the server returns a 5xx or 429 error
             InvalidRequestError: If the request is invalid
             TimeoutError: If the request times out
             OllamaAPIError: For other API errors
@@ -102,63 +491,45 @@ class OllamaClient:
         request_headers = {"Content-Type": "application/json"}
         if headers:
             request_headers.update(headers)
-            
-        # Exponential backoff parameters
-        backoff_factor = 0.5
         
-        for attempt in range(self.max_retries + 1):
-            try:
-                if DEBUG_MODE and attempt > 0:
-                    logger.debug(f"Retry attempt {attempt} for request to {url}")
-                    
-                # Type-annotate response and ignore "json" param warning
-                response: requests.Response = self.session.request(  
-                    method=method,
-                    url=url,
-                    json=data,  # type: ignore [call-arg]
-                    headers=request_headers,
-                    timeout=self.timeout,
-                    stream=stream,
-                )
-                
-                status_code: int = response.status_code  # Force known int type
-                if status_code >= 400:
-                    text: str = response.text  # Force known string type
-                    error_message = f"HTTP {status_code}"
-                    try:
-                        error_data = response.json()
-                        if "error" in error_data:
-                            error_message = error_data["error"]
-                    except (ValueError, KeyError):
-                        # If JSON parsing fails, use the response text
-                        error_message = text or error_message
-                        
-                    # Raise specific exception based on status code
-                    exception = get_exception_for_status(
-                        status_code, error_message, response.json() if "json" in response.headers.get("content-type", "") else None
+        retry = self.retry_policy.start()
+        attempt = 0
+        while True:
+            retry_after = None
+            attempt += 1
+            with trace_span(self.tracer, "ollama.attempt", self._attempt_attributes(attempt)) as span:
+                try:
+                    response: requests.Response = self.session.request(
+                        method=method,
+                        url=url,
+                        json=data,  # type: ignore [call-arg]
+                        headers=request_headers,
+                        timeout=retry.timeout(self.timeout),
+                        stream=stream,
                     )
-                    raise exception
-                    
-                return response
-                
-            except requests.exceptions.Timeout:
-                if attempt == self.max_retries:
-                    raise TimeoutError(f"Request to {url} timed out after {self.timeout}s and {self.max_retries} retries")
+                except requests.exceptions.Timeout:
+                    error: OllamaAPIError = TimeoutError(f"Request to {url} timed out after {self.timeout}s")
+                except requests.exceptions.ConnectionError as e:
+                    error = ConnectionError(f"Connection to Ollama server failed: {e}")
+                else:
+                    if span is not None:
+                        _trace_response(span, response.status_code, stream)
+                    if response.status_code < 400:
+                        return response
+                    error = _error_for_status(response.status_code, response.text)
+                    response.close()
+                    if not self.retry_policy.is_retryable_status(response.status_code):
+                        raise error
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if span is not None:
+                    span.set_attribute("error.type", type(error).__name__)
             
-            except requests.exceptions.ConnectionError as e:
-                if attempt == self.max_retries:
-                    raise ConnectionError(f"Connection to Ollama server failed: {str(e)}")
-                
-            except Exception as e:
-                if attempt == self.max_retries:
-                    raise OllamaAPIError(f"Unexpected error: {str(e)}")
-                    
-                # Exponential backoff before retry
-                wait_time = backoff_factor * (2 ** attempt)
-                time.sleep(wait_time)
-                
-            # If we get here, all retries failed but no exception was raised
-            return None  # Return None if we couldn't get a valid response
+            delay = retry.next_delay(retry_after)
+            if delay is None:
+                raise error
+            logger.debug(f"Retrying request to {url} in {delay:.2f}s after: {error}")
+            with trace_span(self.tracer, "ollama.backoff", {"ollama.backoff.delay": delay}):
+                time.sleep(delay)
 
     async def _with_async_retry(
         self,
@@ -167,59 +538,294 @@ class OllamaClient:
         data: Optional[Dict[str, Any]] = None,
         stream: bool = False,
         headers: Optional[Dict[str, str]] = None,
-    ) -> Optional[httpx.Response]:
+    ) -> Optional["httpx.Response"]:
+        """
+        Make an asynchronous HTTP request with retry logic, coalescing identical requests.
+        
+        The async counterpart of ``_with_retry``. Arguments, return value and
+        exceptions are those of ``_send_with_async_retry``.
+        """
+        key = self._coalesce_key(method, endpoint, data, stream)
+        attributes = self._request_attributes(method, endpoint, data, stream)
+        with trace_span(self.tracer, "ollama.request", attributes) as span:
+            try:
+                if key is None:
+                    response = await self._send_limited_async(method, endpoint, data, stream, headers)
+                else:
+                    response = await self._async_single_flight.do(
+                        key, lambda: self._send_limited_async(method, endpoint, data, stream, headers)
+                    )
+            except (ModelNotFoundError, ServerError) as e:
+                _note_model(e, data)
+                raise
+            if span is not None and response is not None:
+                span.set_attribute("http.response.status_code", response.status_code)
+            return response
+    
+    async def _send_limited_async(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        stream: bool,
+        headers: Optional[Dict[str, str]],
+    ) -> Optional["httpx.Response"]:
+        """The async counterpart of ``_send_limited``."""
+        breaker = None if self._breaker_per_host else self.circuit_breaker
+        if self.scheduler is None and self.limiter is None and breaker is None:
+            return await self._send_with_async_retry(method, endpoint, data, stream, headers)
+        model = (data or {}).get("model")
+        ticket = None
+        releases: List[Callable[[], None]] = []
+        try:
+            with trace_span(self.tracer, "ollama.queue"):
+                if breaker is not None:
+                    ticket = breaker.before(self.base_url, model)
+                if self.scheduler is not None:
+                    releases.append((await self.scheduler.aacquire()).release)
+                if self.limiter is not None:
+                    releases.append((await self.limiter.aacquire(endpoint, model)).release)
+            response = await self._send_with_async_retry(method, endpoint, data, stream, headers)
+        except BaseException as e:
+            _release_all(releases)
+            if ticket is not None:
+                ticket.record(e)
+            raise
+        if ticket is not None:
+            ticket.record()
+        if stream and response is not None:
+            _call_on_aclose(response, lambda: _release_all(releases))
+        else:
+            _release_all(releases)
+        return response
+    
+    async def _send_with_async_retry(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Optional["httpx.Response"]:
+        """
+        Make an asynchronous HTTP request, retrying failures as ``retry_policy`` allows.
+        
+        Retries follow the same policy as ``_send_with_retry``. With ``stream=True`` the response is returned as soon as its headers
+        arrive and the body is left unread. The caller must consume it and
+        call ``response.aclose()`` to return the connection to the pool.
+        
+        Args:
+            method: HTTP method (GET, POST, DELETE)
+            endpoint: API endpoint to call
+            data: Request data
+            stream: Whether to return before the body has been read
+            headers: Optional request headers
+            
+        Returns:
+            Response object
+            
+        Raises:
+            ConnectionError: If connection fails after all retries
+            ModelNotFoundError: If the model is not found
+            ServerError: If the server returns a 5xx or 429 error
+            InvalidRequestError: If the request is invalid
+            TimeoutError: If the request times out
+            OllamaAPIError: For other API errors
+        """
         url = f"{self.base_url}{endpoint}"
         request_headers = {"Content-Type": "application/json"}
         if headers:
             request_headers.update(headers)
+        if method not in ("GET", "POST", "DELETE"):
+            raise OllamaAPIError(f"Unsupported method: {method}")
 
-        backoff_factor = 0.5
-        for attempt in range(self.max_retries + 1):
-            try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    if method == "POST":
-                        response: httpx.Response = await client.post(  # Type-annotate
-                            url,
-                            json=data,  # type: ignore [call-arg]
-                            headers=request_headers,
-                            timeout=self.timeout,
-                            follow_redirects=True
-                        )
-                    elif method == "GET":
-                        response = await client.get(
-                            url,
-                            params=data,
-                            headers=request_headers,
-                            timeout=self.timeout,
-                            follow_redirects=True
-                        )
-                    elif method == "DELETE":
-                        response = await client.delete(
-                            url,
-                            json=data,  # type: ignore [call-arg]
-                            headers=request_headers,
-                            timeout=self.timeout,
-                            follow_redirects=True
-                        )
-                    else:
-                        raise OllamaAPIError(f"Unsupported method: {method}")
-
-                    status_code: int = response.status_code
-                    if 200 <= status_code < 300:
+        import httpx
+        retry = self.retry_policy.start()
+        attempt = 0
+        while True:
+            retry_after = None
+            attempt += 1
+            client = self._get_async_client()
+            timeout = retry.timeout(self.timeout)
+            if method == "GET":
+                request = client.build_request(
+                    method, url, params=data, headers=request_headers, timeout=timeout
+                )
+            else:
+                request = client.build_request(
+                    method, url, json=data, headers=request_headers, timeout=timeout
+                )
+            with trace_span(self.tracer, "ollama.attempt", self._attempt_attributes(attempt)) as span:
+                try:
+                    response: httpx.Response = await client.send(request, stream=stream)
+                except httpx.TimeoutException:
+                    error: OllamaAPIError = TimeoutError(f"Request to {url} timed out after {self.timeout}s")
+                except httpx.RequestError as e:
+                    error = ConnectionError(f"Connection to Ollama server failed: {e}")
+                else:
+                    if span is not None:
+                        _trace_response(span, response.status_code, stream)
+                    if response.status_code < 400:
                         return response
-                    elif status_code == 404:
-                        raise ModelNotFoundError(f"Model not found at {url}")
-                    elif 400 <= response.status_code < 500:
-                        raise OllamaAPIError(f"Client error {status_code}: {response.text}")
-                    else:
-                        raise ServerError(f"Server error {status_code}: {response.text}")
+                    # Error bodies are small; read them so the connection is released
+                    if stream:
+                        await response.aread()
+                        await response.aclose()
+                    error = _error_for_status(response.status_code, response.text)
+                    if not self.retry_policy.is_retryable_status(response.status_code):
+                        raise error
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if span is not None:
+                    span.set_attribute("error.type", type(error).__name__)
 
-            except (httpx.TimeoutException, httpx.RequestError) as e:
-                if attempt == self.max_retries:
-                    raise ConnectionError(f"Connection failed after retries: {e}")
-                await asyncio.sleep(backoff_factor * (2 ** attempt))
-
-        return None
+            delay = retry.next_delay(retry_after)
+            if delay is None:
+                raise error
+            logger.debug(f"Retrying request to {url} in {delay:.2f}s after: {error}")
+            with trace_span(self.tracer, "ollama.backoff", {"ollama.backoff.delay": delay}):
+                await asyncio.sleep(delay)
+    
+    def _coalesce_key(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        stream: bool
+    ) -> Optional[str]:
+        """
+        Return the single-flight key of a request, or None if it must not be shared.
+        
+        Only complete (non-streaming) responses of requests whose output
+        depends on nothing but the payload are shared: embeddings, and
+        generate/chat with ``temperature=0`` or a fixed ``seed``.
+        """
+        if not self.coalesce_requests or stream or method != "POST" or data is None:
+            return None
+        if endpoint != API_ENDPOINTS["embedding"] and not (
+            endpoint in (API_ENDPOINTS["generate"], API_ENDPOINTS["chat"]) and is_deterministic(data)
+        ):
+            return None
+        # The payload already carries the resolved model name
+        return _canonical_json([endpoint, data])
+    
+    def _model_digest(self, model: str) -> Optional[str]:
+        """
+        Return the digest of an installed model, read from ``/api/tags``.
+        
+        Digests are refreshed at most every ``MODEL_DIGEST_TTL`` seconds.
+        
+        Args:
+            model: Resolved model name
+            
+        Returns:
+            The model digest, or None if the model is unknown or the lookup fails
+        """
+        name = model if ":" in model else f"{model}:latest"
+        with self._model_digests_lock:
+            if time.monotonic() - self._model_digests_at > MODEL_DIGEST_TTL:
+                try:
+                    models = self.list_models().get("models", [])
+                except OllamaAPIError as e:
+                    logger.debug(f"Could not read model digests: {e}")
+                    return None
+                digests: Dict[str, str] = {}
+                for entry in models:
+                    for key in ("name", "model"):
+                        tag = entry.get(key)
+                        if tag and entry.get("digest"):
+                            digests[tag if ":" in tag else f"{tag}:latest"] = entry["digest"]
+                self._model_digests = digests
+                self._model_digests_at = time.monotonic()
+            return self._model_digests.get(name)
+    
+    def _embedding_cache_key(
+        self, model: str, text: str, options: Optional[Dict[str, Any]]
+    ) -> Optional[str]:
+        """Return the cache key for an embedding, or None if it can't be cached."""
+        if self.embedding_cache is None:
+            return None
+        digest = self._model_digest(model)
+        if digest is None:
+            return None
+        return EmbeddingCache.make_key(model, digest, text, options)
+    
+    def _response_cache_key(self, endpoint: str, data: Dict[str, Any]) -> Optional[str]:
+        """Return the cache key for a generate/chat request, or None if it can't be cached."""
+        if self.response_cache is None or not is_deterministic(data):
+            return None
+        digest = self._model_digest(data["model"])
+        if digest is None:
+            return None
+        return ResponseCache.make_key(endpoint, data, digest)
+    
+    def _request_attributes(
+        self, method: str, endpoint: str, data: Optional[Dict[str, Any]], stream: bool
+    ) -> Optional[Dict[str, Any]]:
+        """Return the attributes of an ``ollama.request`` span, or None when tracing is off."""
+        if self.tracer is None:
+            return None
+        return {
+            "http.request.method": method,
+            "ollama.endpoint": endpoint,
+            "ollama.model": (data or {}).get("model"),
+            "ollama.stream": stream,
+            "server.address": self.base_url,
+        }
+    
+    def _attempt_attributes(self, attempt: int) -> Optional[Dict[str, Any]]:
+        """Return the attributes of an ``ollama.attempt`` span, or None when tracing is off."""
+        if self.tracer is None:
+            return None
+        return {"ollama.attempt": attempt, "server.address": self.base_url}
+    
+    def _start_operation(self, operation: str, model: str, stream: bool = False) -> Optional[Any]:
+        """Start the span of a generate, chat or embedding call, or return None when tracing is off."""
+        if self.tracer is None:
+            return None
+        return start_span(self.tracer, f"ollama.{operation}", {
+            "ollama.operation": operation, "ollama.model": model, "ollama.stream": stream,
+        })
+    
+    def _record_metrics(
+        self, operation: str, model: str, result: Dict[str, Any], start: float,
+        span: Optional[Any] = None, cache_hit: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Return a complete response as a MeteredResponse.
+        
+        Its metrics go to the sink and onto the operation span, which is ended.
+        """
+        metrics = request_metrics(
+            operation, model, result, time.perf_counter() - start, cache_hit=cache_hit
+        )
+        metered = MeteredResponse(result, metrics)
+        if self.metrics_sink is not None:
+            self.metrics_sink.record(metrics)
+        if span is not None:
+            end_span(span, metrics_attributes(metrics))
+        return metered
+    
+    def _measure_stream(
+        self, operation: str, model: str, chunks: Iterator[Dict[str, Any]], start: float,
+        span: Optional[Any] = None, cache_hit: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Return the final chunk of a stream as a MeteredResponse.
+        
+        Its metrics go to the sink; the operation span ends with the stream.
+        """
+        on_done = self.metrics_sink.record if self.metrics_sink is not None else None
+        chunks = measure_stream(chunks, operation, model, start, on_done, cache_hit)
+        return chunks if span is None else trace_stream(chunks, span)
+    
+    def _ameasure_stream(
+        self, operation: str, model: str, chunks: AsyncIterator[Dict[str, Any]], start: float,
+        span: Optional[Any] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """The async counterpart of ``_measure_stream``."""
+        on_done = self.metrics_sink.record if self.metrics_sink is not None else None
+        chunks = ameasure_stream(chunks, operation, model, start, on_done)
+        return chunks if span is None else atrace_stream(chunks, span)
     
     def get_version(self) -> Dict[str, Any]:
         """
@@ -255,6 +861,111 @@ class OllamaClient:
             raise OllamaAPIError("Failed to list models: No response received")
         return response.json()
     
+    def list_running_models(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        List models currently loaded in memory.
+        
+        Returns:
+            Dictionary with running models information
+            
+        Raises:
+            ConnectionError: If cannot connect to Ollama server
+            OllamaAPIError: If the response is invalid
+        """
+        endpoint = API_ENDPOINTS["ps"]
+        response = self._with_retry("GET", endpoint)
+        if response is None:
+            raise OllamaAPIError("Failed to list running models: No response received")
+        return response.json()
+    
+    def preload(
+        self,
+        models: Union[str, Sequence[str]],
+        keep_alive: KeepAlive = DEFAULT_KEEP_ALIVE
+    ) -> Dict[str, float]:
+        """
+        Load models into memory so the next request doesn't pay the load time.
+        
+        Each model is loaded with an empty generate request, or an empty
+        embed request for embedding-only models.
+        
+        Args:
+            models: Model name or names
+            keep_alive: How long the server keeps each model loaded, as
+                seconds or a duration string ("10m"); negative keeps it
+                loaded indefinitely
+            
+        Returns:
+            Load duration in seconds per model, from the server's
+            ``load_duration`` (near zero when it was already loaded)
+            
+        Raises:
+            ConnectionError: If cannot connect to Ollama server
+            ModelNotFoundError: If a model does not exist
+        """
+        durations: Dict[str, float] = {}
+        for model in [models] if isinstance(models, str) else models:
+            name = resolve_model_alias(model) if HELPERS_AVAILABLE else model
+            try:
+                response = self._with_retry(
+                    "POST", API_ENDPOINTS["generate"], data={"model": name, "keep_alive": keep_alive}
+                )
+            except InvalidRequestError:
+                # Embedding-only models don't support generate
+                response = self._with_retry(
+                    "POST", API_ENDPOINTS["embedding"],
+                    data={"model": name, "input": [], "keep_alive": keep_alive},
+                )
+            if response is None:
+                raise OllamaAPIError(f"Failed to preload model '{model}'")
+            durations[model] = (response.json().get("load_duration") or 0) / 1e9
+        return durations
+    
+    def unload(self, model: str) -> bool:
+        """
+        Unload a model from memory now instead of when its keep-alive expires.
+        
+        Args:
+            model: Name of the model
+            
+        Returns:
+            True once the server has accepted the request
+            
+        Raises:
+            ConnectionError: If cannot connect to Ollama server
+            ModelNotFoundError: If the model does not exist
+        """
+        name = resolve_model_alias(model) if HELPERS_AVAILABLE else model
+        response = self._with_retry(
+            "POST", API_ENDPOINTS["generate"], data={"model": name, "keep_alive": 0}
+        )
+        if response is None:
+            raise OllamaAPIError(f"Failed to unload model '{model}'")
+        return True
+    
+    def keep_warm(
+        self,
+        models: Sequence[str],
+        keep_alive: KeepAlive = DEFAULT_KEEP_ALIVE,
+        interval: Optional[float] = None,
+        on_warm: Optional[Callable[[str, float], None]] = None
+    ) -> ModelKeeper:
+        """
+        Keep models loaded by re-warming them on a background thread.
+        
+        Args:
+            models: Models to keep loaded
+            keep_alive: keep_alive sent with each warm-up
+            interval: Seconds between warm-ups (defaults to shortly before
+                the keep-alive expires)
+            on_warm: Called with the model and its load duration in seconds
+                after each warm-up
+            
+        Returns:
+            The started ModelKeeper; call ``stop()`` to end it
+        """
+        return ModelKeeper(self, models, keep_alive, interval, on_warm).start()
+    
     def pull_model(
         self, 
         model: str, 
@@ -295,38 +1006,30 @@ class OllamaClient:
             last_status = None
             
             try:
-                for line in response.iter_lines():
-                    if not line:
-                        continue
-                        
-                    try:
-                        progress = json.loads(line)
-                        
-                        # Update progress bar if available
-                        if TQDM_AVAILABLE and not DISABLE_PROGRESS_BARS:
-                            if "total" in progress and "completed" in progress:
-                                if progress_bar is None:
-                                    progress_bar = tqdm(
-                                        total=progress["total"], 
-                                        desc=f"Pulling {model}",
-                                        unit="B", 
-                                        unit_scale=True
-                                    )
+                for progress in iter_ndjson(response, skip_invalid=True):
+                    # Update progress bar if available
+                    if TQDM_AVAILABLE and not DISABLE_PROGRESS_BARS:
+                        if "total" in progress and "completed" in progress:
+                            if progress_bar is None:
+                                from tqdm.auto import tqdm
+                                progress_bar = tqdm(
+                                    total=progress["total"], 
+                                    desc=f"Pulling {model}",
+                                    unit="B", 
+                                    unit_scale=True
+                                )
+                            
+                            # Update progress    
+                            if progress["completed"] > progress_bar.n:
+                                progress_bar.update(progress["completed"] - progress_bar.n)
                                 
-                                # Update progress    
-                                if progress["completed"] > progress_bar.n:
-                                    progress_bar.update(progress["completed"] - progress_bar.n)
-                                    
-                        # Only yield status changes to avoid flooding logs
-                        if "status" in progress:
-                            if progress["status"] != last_status:
-                                last_status = progress["status"]
-                                yield progress
-                        else:
+                    # Only yield status changes to avoid flooding logs
+                    if "status" in progress:
+                        if progress["status"] != last_status:
+                            last_status = progress["status"]
                             yield progress
-                            
-                    except json.JSONDecodeError:
-                        logger.warning(f"Failed to parse progress line: {line}")
+                    else:
+                        yield progress
                         
             finally:
                 # Clean up progress bar
@@ -340,7 +1043,9 @@ class OllamaClient:
         model: str, 
         prompt: str, 
         options: Optional[Dict[str, Any]] = None, 
-        stream: bool = False
+        stream: bool = False,
+        priority: Optional[str] = None,
+        fallback: bool = False
     ) -> Union[Dict[str, Any], Iterator[Dict[str, Any]]]:
         """
         Generate text from a prompt.
@@ -350,6 +1055,10 @@ class OllamaClient:
             prompt: The prompt to generate from
             options: Dictionary of generation options
             stream: Whether to stream the response
+            priority: Scheduling class ("interactive", "normal" or "batch")
+                used when the client has a scheduler
+            fallback: On a missing or failing model, retry along the model's
+                fallback chain and return the first success
             
         Returns:
             If stream=True, a generator yielding response chunks
@@ -360,6 +1069,12 @@ class OllamaClient:
             ModelNotFoundError: If the model does not exist
             InvalidRequestError: If the request is invalid
         """
+        if fallback:
+            return with_fallback(
+                self.base_url, resolve_model_alias(model) if HELPERS_AVAILABLE else model, "generate",
+                lambda name: self.generate(name, prompt, options, stream, priority)
+            )
+        
         endpoint = API_ENDPOINTS["generate"]
         data: Dict[str, Any] = {
             "model": resolve_model_alias(model) if HELPERS_AVAILABLE else model,
@@ -372,38 +1087,49 @@ class OllamaClient:
             for key, value in options.items():
                 data[key] = value
         
+        start = time.perf_counter()
+        cache_key = self._response_cache_key(endpoint, data)
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)  # type: ignore [union-attr]
+            if cached is not None:
+                span = self._start_operation("generate", data["model"], stream)
+                if stream:
+                    return self._measure_stream(
+                        "generate", data["model"], ResponseCache.replay(cached), start, span, cache_hit=True
+                    )
+                return self._record_metrics("generate", data["model"], cached, start, span, cache_hit=True)
+        
+        span = self._start_operation("generate", data["model"], stream)
         if not stream:
             # Single response
-            response = self._with_retry("POST", endpoint, data=data)
+            with request_priority(priority), activate(self.tracer, span):
+                response = self._with_retry("POST", endpoint, data=data)
             if response is None:
                 raise OllamaAPIError(f"Failed to generate text with model '{model}'")
-            return response.json()
+            result = response.json()
+            if cache_key is not None:
+                self.response_cache.put(cache_key, result)  # type: ignore [union-attr]
+            return self._record_metrics("generate", data["model"], result, start, span)
         
         # Stream responses
-        response = self._with_retry("POST", endpoint, data=data, stream=True)
+        with request_priority(priority), activate(self.tracer, span):
+            response = self._with_retry("POST", endpoint, data=data, stream=True)
         if response is None:
             raise OllamaAPIError(f"Failed to generate streaming text with model '{model}'")
         
-        def generate_chunks() -> Iterator[Dict[str, Any]]:
-            for line in response.iter_lines():
-                if not line:
-                    continue
-                    
-                try:
-                    chunk = json.loads(line)
-                    yield chunk
-                except json.JSONDecodeError:
-                    logger.error(f"Failed to parse response chunk: {line}")
-                    raise StreamingError("Failed to parse streaming response")
-        
-        return generate_chunks()
+        chunks = iter_ndjson(response)
+        if cache_key is not None:
+            chunks = self.response_cache.record(cache_key, chunks)  # type: ignore [union-attr]
+        return self._measure_stream("generate", data["model"], chunks, start, span)
     
     def chat(
         self, 
         model: str, 
         messages: List[Dict[str, str]], 
         options: Optional[Dict[str, Any]] = None, 
-        stream: bool = False
+        stream: bool = False,
+        priority: Optional[str] = None,
+        fallback: bool = False
     ) -> Union[Dict[str, Any], Iterator[Dict[str, Any]]]:
         """
         Chat with a model.
@@ -413,6 +1139,10 @@ class OllamaClient:
             messages: List of message dictionaries (role, content)
             options: Chat options
             stream: Whether to stream the response
+            priority: Scheduling class ("interactive", "normal" or "batch")
+                used when the client has a scheduler
+            fallback: On a missing or failing model, retry along the model's
+                fallback chain and return the first success
             
         Returns:
             If stream=True, a generator yielding response chunks
@@ -423,6 +1153,12 @@ class OllamaClient:
             ModelNotFoundError: If the model does not exist
             InvalidRequestError: If the messages format is invalid
         """
+        if fallback:
+            return with_fallback(
+                self.base_url, resolve_model_alias(model) if HELPERS_AVAILABLE else model, "chat",
+                lambda name: self.chat(name, messages, options, stream, priority)
+            )
+        
         endpoint = API_ENDPOINTS["chat"]
         data: Dict[str, Any] = {
             "model": resolve_model_alias(model) if HELPERS_AVAILABLE else model,
@@ -435,37 +1171,48 @@ class OllamaClient:
             for key, value in options.items():
                 data[key] = value
         
+        start = time.perf_counter()
+        cache_key = self._response_cache_key(endpoint, data)
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)  # type: ignore [union-attr]
+            if cached is not None:
+                span = self._start_operation("chat", data["model"], stream)
+                if stream:
+                    return self._measure_stream(
+                        "chat", data["model"], ResponseCache.replay(cached), start, span, cache_hit=True
+                    )
+                return self._record_metrics("chat", data["model"], cached, start, span, cache_hit=True)
+        
+        span = self._start_operation("chat", data["model"], stream)
         if not stream:
             # Single response
-            response = self._with_retry("POST", endpoint, data=data)
+            with request_priority(priority), activate(self.tracer, span):
+                response = self._with_retry("POST", endpoint, data=data)
             if response is None:
                 raise OllamaAPIError(f"Failed to chat with model '{model}'")
-            return response.json()
+            result = response.json()
+            if cache_key is not None:
+                self.response_cache.put(cache_key, result)  # type: ignore [union-attr]
+            return self._record_metrics("chat", data["model"], result, start, span)
         
         # Stream responses
-        response = self._with_retry("POST", endpoint, data=data, stream=True)
+        with request_priority(priority), activate(self.tracer, span):
+            response = self._with_retry("POST", endpoint, data=data, stream=True)
         if response is None:
             raise OllamaAPIError(f"Failed to stream chat with model '{model}'")
         
-        def generate_chunks() -> Iterator[Dict[str, Any]]:
-            for line in response.iter_lines():
-                if not line:
-                    continue
-                    
-                try:
-                    chunk = json.loads(line)
-                    yield chunk
-                except json.JSONDecodeError:
-                    logger.error(f"Failed to parse chat response chunk: {line}")
-                    raise StreamingError("Failed to parse streaming chat response")
-        
-        return generate_chunks()
+        chunks = iter_ndjson(response)
+        if cache_key is not None:
+            chunks = self.response_cache.record(cache_key, chunks)  # type: ignore [union-attr]
+        return self._measure_stream("chat", data["model"], chunks, start, span)
     
     def create_embedding(
         self, 
         model: str, 
         prompt: str,
-        options: Optional[Dict[str, Any]] = None
+        options: Optional[Dict[str, Any]] = None,
+        priority: Optional[str] = None,
+        fallback: bool = False
     ) -> Dict[str, Any]:
         """
         Create an embedding vector for a text prompt.
@@ -474,66 +1221,274 @@ class OllamaClient:
             model: Name of the model
             prompt: Text to create embedding for
             options: Optional embedding parameters
+            priority: Scheduling class ("interactive", "normal" or "batch")
+                used when the client has a scheduler
+            fallback: On a missing or failing model, retry along the model's
+                fallback chain and return the first success
             
         Returns:
-            Dictionary with the embedding vector
+            Dictionary with the embedding vector. Cache hits are returned in
+            the ``/api/embed`` shape: ``{"model": ..., "embeddings": [vector]}``
             
         Raises:
             ConnectionError: If cannot connect to Ollama server
             ModelNotFoundError: If the model does not exist
         """
+        if fallback:
+            return with_fallback(
+                self.base_url, resolve_model_alias(model) if HELPERS_AVAILABLE else model, "embedding",
+                lambda name: self.create_embedding(name, prompt, options, priority)
+            )
+        
         endpoint = API_ENDPOINTS["embedding"]
         data: Dict[str, Any] = {
             "model": resolve_model_alias(model) if HELPERS_AVAILABLE else model,
-            "prompt": prompt
+            "input": prompt
         }
         
+        start = time.perf_counter()
+        cache_key = self._embedding_cache_key(data["model"], prompt, options)
+        if cache_key is not None:
+            cached = self.embedding_cache.get(cache_key)  # type: ignore [union-attr]
+            if cached is not None:
+                span = self._start_operation("embedding", data["model"])
+                return self._record_metrics(
+                    "embedding", data["model"], {"model": data["model"], "embeddings": [cached]},
+                    start, span, cache_hit=True
+                )
+        
         # Add optional parameters
         if options:
             for key, value in options.items():
                 data[key] = value
                 
-        response = self._with_retry("POST", endpoint, data=data)
+        span = self._start_operation("embedding", data["model"])
+        with request_priority(priority), activate(self.tracer, span):
+            response = self._with_retry("POST", endpoint, data=data)
         if response is None:
             raise OllamaAPIError(f"Failed to create embedding with model '{model}'")
-        return response.json()
+        result = response.json()
+        
+        if cache_key is not None:
+            vector = _extract_embedding(result)
+            if vector:
+                self.embedding_cache.put(cache_key, vector)  # type: ignore [union-attr]
+        return self._record_metrics("embedding", data["model"], result, start, span)
     
     def batch_embeddings(
         self, 
         model: str, 
         prompts: List[str],
         options: Optional[Dict[str, Any]] = None,
-        show_progress: bool = False
+        show_progress: bool = False,
+        batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+        max_batch_tokens: int = DEFAULT_EMBEDDING_BATCH_TOKENS,
+        store: Optional[Any] = None,
+        store_ids: Optional[List[Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         Create embeddings for multiple prompts.
         
+        Prompts are packed into batches bounded by ``batch_size`` and an
+        estimated token budget, and each batch is sent as a single request
+        using the list ``input`` of ``/api/embed``. Results are returned in
+        the same order as ``prompts``. With an embedding cache enabled, only
+        prompts missing from the cache are sent.
+        
         Args:
             model: Name of the model
             prompts: List of texts to create embeddings for
             options: Optional embedding parameters
             show_progress: Whether to show a progress bar
+            batch_size: Maximum number of prompts sent in one request
+            max_batch_tokens: Maximum estimated tokens sent in one request
+            store: Optional ``helpers.embedding_store.EmbeddingStore`` to append
+                the vectors to, in prompt order
+            store_ids: Ids recorded in ``store``, one per prompt (defaults to
+                consecutive row numbers)
             
         Returns:
-            List of embedding vectors
+            List of dictionaries with an ``embedding`` vector, one per prompt
             
         Raises:
             ConnectionError: If cannot connect to Ollama server
             ModelNotFoundError: If the model does not exist
+            OllamaAPIError: If the server returns the wrong number of embeddings
         """
-        results: List[Dict[str, Any]] = []
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if store_ids is not None and len(store_ids) != len(prompts):
+            raise ValueError("store_ids must contain one id per prompt")
+        
+        endpoint = API_ENDPOINTS["embedding"]
+        resolved_model = resolve_model_alias(model) if HELPERS_AVAILABLE else model
+        results: List[Optional[Dict[str, Any]]] = [None] * len(prompts)
+        
+        # Serve what we can from the cache; only misses go over the wire
+        cache_keys: List[Optional[str]] = [None] * len(prompts)
+        pending = list(range(len(prompts)))
+        if self.embedding_cache is not None and prompts:
+            pending = []
+            for index, prompt in enumerate(prompts):
+                cache_keys[index] = self._embedding_cache_key(resolved_model, prompt, options)
+                cached = self.embedding_cache.get(cache_keys[index]) if cache_keys[index] else None
+                if cached is not None:
+                    results[index] = {"model": resolved_model, "embedding": cached}
+                else:
+                    pending.append(index)
+        
+        pending_prompts = [prompts[i] for i in pending]
+        batches = [
+            [pending[i] for i in batch]
+            for batch in _pack_batches(pending_prompts, batch_size, max_batch_tokens)
+        ]
         
         # Prepare progress bar
+        progress_bar = None
         if show_progress and TQDM_AVAILABLE and not DISABLE_PROGRESS_BARS:
-            iterator = tqdm(prompts, desc=f"Creating embeddings with {model}")
-        else:
-            iterator = prompts
+            from tqdm.auto import tqdm
+            progress_bar = tqdm(total=len(prompts), desc=f"Creating embeddings with {model}")
+            progress_bar.update(len(prompts) - len(pending))
+        
+        try:
+            for batch in batches:
+                data: Dict[str, Any] = {
+                    "model": resolved_model,
+                    "input": [prompts[i] for i in batch]
+                }
+                if options:
+                    for key, value in options.items():
+                        data[key] = value
+                        
+                response = self._with_retry("POST", endpoint, data=data)
+                if response is None:
+                    raise OllamaAPIError(f"Failed to create embeddings with model '{model}'")
+                
+                embeddings = response.json().get("embeddings") or []
+                if len(embeddings) != len(batch):
+                    raise OllamaAPIError(
+                        f"Expected {len(batch)} embeddings from model '{model}', "
+                        f"received {len(embeddings)}"
+                    )
+                
+                # Scatter the batch back to the original prompt positions
+                for index, vector in zip(batch, embeddings):
+                    results[index] = {"model": resolved_model, "embedding": vector}
+                    if cache_keys[index] is not None:
+                        self.embedding_cache.put(cache_keys[index], vector)  # type: ignore [union-attr, arg-type]
+                    
+                if progress_bar is not None:
+                    progress_bar.update(len(batch))
+        finally:
+            if progress_bar is not None:
+                progress_bar.close()
+        
+        if store is not None and results:
+            if store_ids is None:
+                store_ids = list(range(len(store), len(store) + len(results)))
+            store.append(store_ids, [item["embedding"] for item in results])  # type: ignore [index]
             
-        for prompt in iterator:
-            embedding = self.create_embedding(model, prompt, options)
-            results.append(embedding)
+        return results  # type: ignore [return-value]
+    
+    def _run_batch(
+        self,
+        func: Callable[[T], Dict[str, Any]],
+        items: Sequence[T],
+        max_workers: int,
+        as_completed: bool
+    ) -> Union[List[BatchResult], Iterator[BatchResult]]:
+        """
+        Run ``func`` over ``items`` on a thread pool, capturing per-item errors.
+        
+        Args:
+            func: Callable performing one request
+            items: Inputs to pass to ``func``
+            max_workers: Maximum number of requests in flight
+            as_completed: Yield results in completion order instead of returning a list
             
-        return results
+        Returns:
+            List of BatchResult in input order, or an iterator in completion order
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        
+        def run_one(index: int) -> BatchResult:
+            try:
+                return BatchResult(index, func(items[index]), None)
+            except Exception as e:
+                logger.debug(f"Batch item {index} failed: {e}")
+                return BatchResult(index, None, e)
+        
+        def iterate() -> Iterator[BatchResult]:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            futures = [executor.submit(run_one, i) for i in range(len(items))]
+            try:
+                for future in futures_as_completed(futures):
+                    yield future.result()
+            finally:
+                # Stop queued work if the consumer stops early
+                for future in futures:
+                    future.cancel()
+                executor.shutdown(wait=False)
+        
+        if as_completed:
+            return iterate()
+        return sorted(iterate(), key=lambda item: item.index)
+    
+    def batch_generate(
+        self,
+        model: str,
+        prompts: Sequence[str],
+        options: Optional[Dict[str, Any]] = None,
+        max_workers: int = DEFAULT_BATCH_CONCURRENCY,
+        as_completed: bool = False
+    ) -> Union[List[BatchResult], Iterator[BatchResult]]:
+        """
+        Generate text for many prompts concurrently.
+        
+        A failing prompt does not abort the batch; its BatchResult carries the
+        exception raised by ``generate`` instead.
+        
+        Args:
+            model: Name of the model to use
+            prompts: Prompts to generate from
+            options: Dictionary of generation options applied to every prompt
+            max_workers: Maximum number of requests in flight
+            as_completed: Yield results as they finish instead of returning a list
+            
+        Returns:
+            List of BatchResult in input order, or an iterator in completion order
+        """
+        return self._run_batch(
+            lambda prompt: self.generate(model, prompt, options),  # type: ignore [arg-type, return-value]
+            prompts, max_workers, as_completed
+        )
+    
+    def batch_chat(
+        self,
+        model: str,
+        conversations: Sequence[List[Dict[str, str]]],
+        options: Optional[Dict[str, Any]] = None,
+        max_workers: int = DEFAULT_BATCH_CONCURRENCY,
+        as_completed: bool = False
+    ) -> Union[List[BatchResult], Iterator[BatchResult]]:
+        """
+        Run many independent chat conversations concurrently.
+        
+        Args:
+            model: Name of the model
+            conversations: Message lists, one per chat request
+            options: Chat options applied to every conversation
+            max_workers: Maximum number of requests in flight
+            as_completed: Yield results as they finish instead of returning a list
+            
+        Returns:
+            List of BatchResult in input order, or an iterator in completion order
+        """
+        return self._run_batch(
+            lambda messages: self.chat(model, messages, options),  # type: ignore [arg-type, return-value]
+            conversations, max_workers, as_completed
+        )
     
     def delete_model(self, model: str) -> bool:
         """
@@ -617,25 +1572,20 @@ class OllamaClient:
         if response is None:
             raise OllamaAPIError(f"Failed to create model '{name}' with streaming")
         
-        def generate_updates() -> Iterator[Dict[str, Any]]:
-            for line in response.iter_lines():
-                if not line:
-                    continue
-                    
-                try:
-                    update = json.loads(line)
-                    yield update
-                except json.JSONDecodeError:
-                    logger.error(f"Failed to parse creation progress: {line}")
-                    raise StreamingError("Failed to parse streaming response")
-        
-        return generate_updates()
+        return iter_ndjson(response)
 
     @contextmanager
     def fallback_context(self, operation: str):
         """
         Context manager for automatic model fallback.
         
+        The fallback model is left in thread-local state for the caller to
+        retry with; ``fallback=True`` on ``generate``, ``chat`` and
+        ``create_embedding`` retries internally instead and also works in
+        async code. With a circuit breaker, a request whose model circuit is open raises
+        CircuitOpenError naming the model without contacting the server, so
+        the fallback model is chosen at once.
+        
         Args:
             operation: Operation type ("chat", "generate", "embedding")
             
@@ -661,7 +1611,9 @@ class OllamaClient:
                 model = e.response.get("model") if hasattr(e, "response") and e.response else None
                 
                 if model:
-                    fallback_model = get_fallback_model(model, operation)
+                    fallback_model = get_fallback_model(
+                        model, OPERATION_MODEL_TYPES.get(operation, operation)
+                    )
                     
                     # Log the fallback
                     logger.warning(f"Falling back from {model} to {fallback_model}")
@@ -697,8 +1649,37 @@ class OllamaClient:
         model: str, 
         prompt: str, 
         options: Optional[Dict[str, Any]] = None, 
-        stream: bool = False
+        stream: bool = False,
+        priority: Optional[str] = None,
+        fallback: bool = False
     ) -> Union[Dict[str, Any], AsyncIterator[Dict[str, Any]]]:
+        """
+        Asynchronously generate text from a prompt.
+        
+        With ``stream=True`` chunks are yielded as the server produces them.
+        Call ``aclose()`` on the returned iterator when stopping early so
+        the connection is released immediately.
+        
+        Args:
+            model: Name of the model to use
+            prompt: The prompt to generate from
+            options: Dictionary of generation options
+            stream: Whether to stream the response
+            priority: Scheduling class ("interactive", "normal" or "batch")
+                used when the client has a scheduler
+            fallback: On a missing or failing model, retry along the model's
+                fallback chain and return the first success
+            
+        Returns:
+            If stream=True, an async iterator yielding response chunks
+            If stream=False, a dictionary with the complete response
+        """
+        if fallback:
+            return await awith_fallback(
+                self.base_url, resolve_model_alias(model) if HELPERS_AVAILABLE else model, "generate",
+                lambda name: self.agenerate(name, prompt, options, stream, priority)
+            )
+
         data: Dict[str, Any] = {
             "model": resolve_model_alias(model) if HELPERS_AVAILABLE else model,
             "prompt": prompt,
@@ -707,34 +1688,56 @@ class OllamaClient:
         if options:
             data.update(options)
 
+        start = time.perf_counter()
+        span = self._start_operation("generate", data["model"], stream)
         if not stream:
-            response = await self._with_async_retry("POST", API_ENDPOINTS["generate"], data=data)
+            with request_priority(priority), activate(self.tracer, span):
+                response = await self._with_async_retry("POST", API_ENDPOINTS["generate"], data=data)
             if response is None:
                 raise OllamaAPIError(f"agenerate failed for model '{model}'")
-            return response.json()
+            return self._record_metrics("generate", data["model"], response.json(), start, span)
 
-        response = await self._with_async_retry("POST", API_ENDPOINTS["generate"], data=data, stream=True)
+        with request_priority(priority), activate(self.tracer, span):
+            response = await self._with_async_retry("POST", API_ENDPOINTS["generate"], data=data, stream=True)
         if response is None:
             raise OllamaAPIError(f"Streaming agenerate failed for model '{model}'")
 
-        async def generate_chunks() -> AsyncIterator[Dict[str, Any]]:
-            async for line in response.aiter_lines():
-                if not line:
-                    continue
-                try:
-                    yield json.loads(line)
-                except json.JSONDecodeError:
-                    raise StreamingError(f"Failed to parse streamed line: {line}")
-
-        return generate_chunks()
+        return self._ameasure_stream("generate", data["model"], aiter_ndjson(response), start, span)
 
     async def achat(
         self, 
         model: str, 
         messages: List[Dict[str, str]], 
         options: Optional[Dict[str, Any]] = None, 
-        stream: bool = False
+        stream: bool = False,
+        priority: Optional[str] = None,
+        fallback: bool = False
     ) -> Union[Dict[str, Any], AsyncIterator[Dict[str, Any]]]:
+        """
+        Asynchronously chat with a model.
+        
+        Streaming behaves as in ``agenerate``.
+        
+        Args:
+            model: Name of the model
+            messages: List of message dictionaries (role, content)
+            options: Chat options
+            stream: Whether to stream the response
+            priority: Scheduling class ("interactive", "normal" or "batch")
+                used when the client has a scheduler
+            fallback: On a missing or failing model, retry along the model's
+                fallback chain and return the first success
+            
+        Returns:
+            If stream=True, an async iterator yielding response chunks
+            If stream=False, a dictionary with the complete response
+        """
+        if fallback:
+            return await awith_fallback(
+                self.base_url, resolve_model_alias(model) if HELPERS_AVAILABLE else model, "chat",
+                lambda name: self.achat(name, messages, options, stream, priority)
+            )
+
         data: Dict[str, Any] = {
             "model": resolve_model_alias(model) if HELPERS_AVAILABLE else model,
             "messages": messages,
@@ -743,41 +1746,62 @@ class OllamaClient:
         if options:
             data.update(options)
 
+        start = time.perf_counter()
+        span = self._start_operation("chat", data["model"], stream)
         if not stream:
-            response = await self._with_async_retry("POST", API_ENDPOINTS["chat"], data=data)
+            with request_priority(priority), activate(self.tracer, span):
+                response = await self._with_async_retry("POST", API_ENDPOINTS["chat"], data=data)
             if response is None:
                 raise OllamaAPIError(f"achat failed for model '{model}'")
-            return response.json()
+            return self._record_metrics("chat", data["model"], response.json(), start, span)
 
-        response = await self._with_async_retry("POST", API_ENDPOINTS["chat"], data=data, stream=True)
+        with request_priority(priority), activate(self.tracer, span):
+            response = await self._with_async_retry("POST", API_ENDPOINTS["chat"], data=data, stream=True)
         if response is None:
             raise OllamaAPIError(f"Streaming achat failed for model '{model}'")
 
-        async def generate_chunks() -> AsyncIterator[Dict[str, Any]]:
-            async for line in response.aiter_lines():
-                if not line:
-                    continue
-                try:
-                    yield json.loads(line)
-                except json.JSONDecodeError:
-                    raise StreamingError(f"Failed to parse streamed line: {line}")
-
-        return generate_chunks()
+        return self._ameasure_stream("chat", data["model"], aiter_ndjson(response), start, span)
 
     async def acreate_embedding(
         self, 
         model: str, 
         prompt: str,
-        options: Optional[Dict[str, Any]] = None
+        options: Optional[Dict[str, Any]] = None,
+        priority: Optional[str] = None,
+        fallback: bool = False
     ) -> Dict[str, Any]:
+        """
+        Asynchronously create an embedding vector for a text prompt.
+        
+        Args:
+            model: Name of the model
+            prompt: Text to create embedding for
+            options: Optional embedding parameters
+            priority: Scheduling class ("interactive", "normal" or "batch")
+                used when the client has a scheduler
+            fallback: On a missing or failing model, retry along the model's
+                fallback chain and return the first success
+            
+        Returns:
+            Dictionary with the embedding vector
+        """
+        if fallback:
+            return await awith_fallback(
+                self.base_url, resolve_model_alias(model) if HELPERS_AVAILABLE else model, "embedding",
+                lambda name: self.acreate_embedding(name, prompt, options, priority)
+            )
+
         data: Dict[str, Any] = {
             "model": resolve_model_alias(model) if HELPERS_AVAILABLE else model,
-            "prompt": prompt
+            "input": prompt
         }
         if options:
             data.update(options)
 
-        response = await self._with_async_retry("POST", API_ENDPOINTS["embedding"], data=data)
+        start = time.perf_counter()
+        span = self._start_operation("embedding", data["model"])
+        with request_priority(priority), activate(self.tracer, span):
+            response = await self._with_async_retry("POST", API_ENDPOINTS["embedding"], data=data)
         if response is None:
             raise OllamaAPIError(f"acreate_embedding failed for model '{model}'")
-        return response.json()
\ No newline at end of file
+        return self._record_metrics("embedding", data["model"], response.json(), start, span)
\ No newline at end of file
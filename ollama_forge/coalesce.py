@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Request coalescing for Ollama Forge.
+
+Concurrent identical requests share one upstream call: the first caller
+(the leader) sends it, later callers with the same key wait for it, and
+every caller receives the leader's result or exception. SingleFlight
+coordinates threads; AsyncSingleFlight coordinates tasks on an event loop.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    """An in-flight call shared by every thread waiting on its key."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _AsyncCall:
+    """An in-flight call shared by every task waiting on its key."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Future[Any]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Thread-safe coalescing of identical concurrent calls.
+
+    Attributes:
+        calls: Number of upstream calls made
+        shared: Number of callers served by another caller's upstream call
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.shared = 0
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        """
+        Run ``func`` unless an identical call is already in flight.
+
+        Args:
+            key: Identity of the call
+            func: Performs the upstream call
+
+        Returns:
+            The result of the shared call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        with self._lock:
+            call = self._in_flight.get(key)
+            if call is None:
+                call = self._in_flight[key] = _Call()
+                leader = True
+                self.calls += 1
+            else:
+                leader = False
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = func()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._in_flight[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+
+class AsyncSingleFlight:
+    """
+    Coalescing of identical concurrent calls across tasks.
+
+    The upstream call runs in its own task, so a waiter being cancelled
+    doesn't cancel it for the others; it is cancelled only once every
+    waiter has gone. Calls on different event loops are never shared.
+
+    Attributes:
+        calls: Number of upstream calls made
+        shared: Number of callers served by another caller's upstream call
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.shared = 0
+        self._in_flight: Dict[Tuple[int, Hashable], _AsyncCall] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await ``func()`` unless an identical call is already in flight.
+
+        Args:
+            key: Identity of the call
+            func: Returns the awaitable performing the upstream call
+
+        Returns:
+            The result of the shared call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        flight_key = (id(asyncio.get_running_loop()), key)
+        call = self._in_flight.get(flight_key)
+        if call is None or call.task.done():
+            call = self._in_flight[flight_key] = _AsyncCall(asyncio.ensure_future(func()))
+            call.task.add_done_callback(lambda _, call=call: self._forget(flight_key, call))
+            self.calls += 1
+        else:
+            self.shared += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if not call.task.done() and call.waiters == 1:
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, flight_key: Tuple[int, Hashable], call: _AsyncCall) -> None:
+        if self._in_flight.get(flight_key) is call:
+            del self._in_flight[flight_key]
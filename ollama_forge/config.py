@@ -34,6 +34,63 @@ DEFAULT_OLLAMA_API_URL = "http://localhost:11434"
 DEFAULT_TIMEOUT = 60
 DEFAULT_MAX_RETRIES = 3
 
+# Async connection pool - shared by all requests of one client
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0  # Seconds an idle connection stays open
+
+# Multi-host pool - health checks and ejection of failing hosts
+DEFAULT_HEALTH_CHECK_INTERVAL = 10.0  # Seconds between background host probes
+DEFAULT_HOST_EJECT_SECONDS = 5.0  # First ejection; doubles on repeated failures
+MAX_HOST_EJECT_SECONDS = 300.0
+HOST_EJECT_AFTER_SERVER_ERRORS = 3  # Consecutive 5xx responses before a host is ejected
+HOST_LATENCY_EWMA_ALPHA = 0.3  # Weight of the newest sample in the latency average
+
+# Client-side rate limiting
+LIMITER_WAIT_SAMPLES = 1024  # Recent queue waits kept for percentile metrics
+
+# Retry policy
+DEFAULT_RETRY_BASE_DELAY = 0.5  # Shortest wait before a retry, in seconds
+DEFAULT_RETRY_MAX_DELAY = 30.0  # Longest jittered wait before a retry
+RETRYABLE_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+DEFAULT_RETRY_BUDGET_RATIO = 0.2  # Retries may add at most 20% to the request load
+DEFAULT_RETRY_BUDGET_MIN = 10  # Retries available before any requests have been made
+
+# Circuit breaker
+DEFAULT_BREAKER_FAILURE_THRESHOLD = 5  # Consecutive failures that open a circuit
+DEFAULT_BREAKER_RECOVERY_TIME = 30.0  # Seconds open before trial requests
+DEFAULT_BREAKER_HALF_OPEN_CALLS = 1  # Trial requests at once while half-open
+
+# Model fallback
+MAX_FALLBACK_DEPTH = 3  # Fallback models tried after the requested one
+UNAVAILABLE_MODEL_TTL = 300.0  # Seconds a model reported missing is skipped
+
+# Model warm-up
+DEFAULT_KEEP_ALIVE = "5m"  # Ollama's own default
+KEEPER_REFRESH_FRACTION = 0.8  # Re-warm after this fraction of the keep-alive
+COLD_LOAD_THRESHOLD = 0.5  # Seconds of load_duration that mean the model was unloaded
+
+# Request metrics - histogram bucket upper bounds
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DEFAULT_THROUGHPUT_BUCKETS = (1.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0)
+
+# Priority scheduling
+DEFAULT_SCHEDULER_SLOTS = 4  # Matches Ollama's default OLLAMA_NUM_PARALLEL
+DEFAULT_PRIORITY = "normal"
+DEFAULT_PRIORITY_WEIGHTS = {"interactive": 16.0, "normal": 4.0, "batch": 1.0}
+
+# Default number of concurrent requests for batch_generate / batch_chat
+DEFAULT_BATCH_CONCURRENCY = 4
+BATCH_WINDOW_FACTOR = 2  # CLI batch requests held in memory per concurrent slot
+
+# Embedding batch packing - bounds for a single /api/embed request
+DEFAULT_EMBEDDING_BATCH_SIZE = 64  # Maximum inputs per request
+DEFAULT_EMBEDDING_BATCH_TOKENS = 8192  # Estimated token budget per request
+CHARS_PER_TOKEN_ESTIMATE = 4  # Rough heuristic used when no tokenizer is available
+
+# Streaming - bytes requested per read when decoding NDJSON responses
+DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024
+
 # Model defaults - critical for cross-module consistency
 DEFAULT_CHAT_MODEL = "deepseek-r1:1.5b"  # Optimal balance of speed and quality
 BACKUP_CHAT_MODEL = "qwen2.5:0.5b-Instruct"  # Excellent small model fallback
@@ -43,6 +100,7 @@ BACKUP_EMBEDDING_MODEL = BACKUP_CHAT_MODEL
 # Context window configurations
 DEFAULT_MIN_CONTEXT = 2048
 RECOMMENDED_CONTEXT = 4096
+CHAT_REPLY_RESERVE_FRACTION = 0.25  # Share of the context window kept free for the reply
 
 # Package authors
 AUTHORS = [
@@ -60,6 +118,13 @@ DISABLE_PROGRESS_BARS = os.environ.get("OLLAMA_FORGE_NO_PROGRESS") == "1"
 USER_CONFIG_DIR = os.path.expanduser(os.path.join("~", ".config", "ollama_forge"))
 USER_CACHE_DIR = os.path.expanduser(os.path.join("~", ".cache", "ollama_forge"))
 USER_DATA_DIR = os.path.expanduser(os.path.join("~", ".local", "share", "ollama_forge"))
+EMBEDDING_CACHE_DIR = os.path.join(USER_CACHE_DIR, "embeddings")
+RESPONSE_CACHE_PATH = os.path.join(USER_CACHE_DIR, "responses.sqlite3")
+
+# Cache configuration
+DEFAULT_EMBEDDING_CACHE_MAX_BYTES = 512 * 1024 * 1024  # 512 MiB of float32 vectors
+DEFAULT_RESPONSE_CACHE_ENTRIES = 1024  # In-memory generate/chat responses
+MODEL_DIGEST_TTL = 300.0  # Seconds before model digests are re-read from /api/tags
 
 # API endpoints mapping - centralizes all endpoint definitions
 API_ENDPOINTS = {
@@ -68,6 +133,7 @@ API_ENDPOINTS = {
     "chat": "/api/chat",
     "embedding": "/api/embed",
     "tags": "/api/tags",
+    "ps": "/api/ps",
     "pull": "/api/pull",
     "push": "/api/push",
     "delete": "/api/delete",
@@ -104,12 +170,8 @@ def is_debug_mode() -> bool:
     """Check if debug mode is enabled."""
     return DEBUG_MODE
 
-# Create user directories if they don't exist
-for directory in [USER_CONFIG_DIR, USER_CACHE_DIR, USER_DATA_DIR]:
-    try:
-        os.makedirs(directory, exist_ok=True)
-    except OSError:
-        pass  # Silent pass if directory creation fails
+# User directories are created by whatever first writes to them (the caches
+# do this), not at import time
 
 # Runtime configuration that may be modified during execution
 runtime_config: dict[str, Any] = {
@@ -65,6 +65,16 @@ class ValidationError(OllamaAPIError):
     pass
 
 
+class RateLimitError(OllamaAPIError):
+    """Raised when the client-side limiter can't admit a request before its deadline."""
+    pass
+
+
+class CircuitOpenError(ServerError):
+    """Raised without contacting the server while its or the model's circuit is open."""
+    pass
+
+
 class OllamaConnectionError(ConnectionError):
     """Legacy alias for ConnectionError for backwards compatibility."""
     pass
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Transparent model fallback for Ollama Forge.
+
+With ``fallback=True``, ``generate``, ``chat`` and ``create_embedding``
+retry a failed request on the next model of a fallback chain built from
+``get_fallback_model`` and return the first success. Models the server
+reported as missing are remembered per process for a TTL, so later calls
+skip them without a failed request. Nothing is kept in thread-local state,
+so the same logic serves threads and asyncio tasks.
+"""
+
+import logging
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from .config import MAX_FALLBACK_DEPTH, UNAVAILABLE_MODEL_TTL
+from .exceptions import ModelNotFoundError, OllamaAPIError, ServerError
+from helpers.model_constants import (
+    MODEL_TYPE_CHAT, MODEL_TYPE_COMPLETION, MODEL_TYPE_EMBEDDING, get_fallback_model
+)
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# Client operations mapped to the model types get_fallback_model understands
+OPERATION_MODEL_TYPES = {
+    "chat": MODEL_TYPE_CHAT,
+    "generate": MODEL_TYPE_COMPLETION,
+    "embedding": MODEL_TYPE_EMBEDDING,
+}
+
+# Errors after which the next model of the chain is tried
+FALLBACK_ERRORS = (ModelNotFoundError, ServerError)
+
+
+def fallback_chain(model: str, operation: str, depth: int = MAX_FALLBACK_DEPTH) -> List[str]:
+    """
+    Return the models to try for a request, starting with the requested one.
+
+    Args:
+        model: Requested model
+        operation: Client operation ("chat", "generate" or "embedding")
+        depth: Maximum number of fallback models after the requested one
+
+    Returns:
+        Distinct model names in the order they should be tried
+    """
+    model_type = OPERATION_MODEL_TYPES.get(operation, operation)
+    chain = [model]
+    seen = {model.lower()}
+    while len(chain) <= depth:
+        candidate = get_fallback_model(chain[-1], model_type)
+        if candidate.lower() in seen:
+            break
+        chain.append(candidate)
+        seen.add(candidate.lower())
+    return chain
+
+
+class UnavailableModels:
+    """
+    Models a server reported as missing, remembered for a TTL.
+
+    Attributes:
+        ttl: Seconds a model is skipped after being reported missing
+    """
+
+    def __init__(self, ttl: float = UNAVAILABLE_MODEL_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._until: Dict[Tuple[str, str], float] = {}
+
+    @staticmethod
+    def _key(host: str, model: str) -> Tuple[str, str]:
+        return host, model if ":" in model else f"{model}:latest"
+
+    def mark(self, host: str, model: str) -> None:
+        """Remember that ``host`` doesn't have ``model``."""
+        with self._lock:
+            self._until[self._key(host, model)] = time.monotonic() + self.ttl
+
+    def is_unavailable(self, host: str, model: str) -> bool:
+        """Return whether ``model`` was reported missing on ``host`` within the TTL."""
+        key = self._key(host, model)
+        with self._lock:
+            until = self._until.get(key)
+            if until is None:
+                return False
+            if until <= time.monotonic():
+                del self._until[key]
+                return False
+            return True
+
+    def forget(self, host: Optional[str] = None, model: Optional[str] = None) -> None:
+        """Forget every remembered model, or those matching ``host`` and ``model``."""
+        with self._lock:
+            if host is None and model is None:
+                self._until.clear()
+                return
+            for key in list(self._until):
+                if (host is None or key[0] == host) and (model is None or key == self._key(key[0], model)):
+                    del self._until[key]
+
+
+# Shared by every client in the process
+UNAVAILABLE_MODELS = UnavailableModels()
+
+
+def _candidates(host: str, model: str, operation: str) -> List[str]:
+    chain = fallback_chain(model, operation)
+    available = [m for m in chain if not UNAVAILABLE_MODELS.is_unavailable(host, m)]
+    # If every model was reported missing, ask again for the requested one
+    return available or chain[:1]
+
+
+def _failed(host: str, model: str, error: OllamaAPIError, remaining: List[str]) -> None:
+    if isinstance(error, ModelNotFoundError):
+        UNAVAILABLE_MODELS.mark(host, model)
+    if remaining:
+        logger.warning(f"Falling back from {model} to {remaining[0]}: {error}")
+
+
+def with_fallback(host: str, model: str, operation: str, call: Callable[[str], T]) -> T:
+    """
+    Run ``call`` with each model of the fallback chain until one succeeds.
+
+    Args:
+        host: Base URL of the server, used to remember missing models
+        model: Requested model
+        operation: Client operation ("chat", "generate" or "embedding")
+        call: Sends the request for a given model
+
+    Returns:
+        The first successful result
+
+    Raises:
+        ModelNotFoundError: If every model is missing (the last error)
+        ServerError: If every model failed (the last error)
+    """
+    candidates = _candidates(host, model, operation)
+    last_error: Optional[OllamaAPIError] = None
+    for index, candidate in enumerate(candidates):
+        try:
+            return call(candidate)
+        except FALLBACK_ERRORS as e:
+            _failed(host, candidate, e, candidates[index + 1:])
+            last_error = e
+    assert last_error is not None
+    raise last_error
+
+
+async def awith_fallback(host: str, model: str, operation: str,
+                         call: Callable[[str], Awaitable[T]]) -> T:
+    """The async counterpart of ``with_fallback``; ``call`` returns an awaitable."""
+    candidates = _candidates(host, model, operation)
+    last_error: Optional[OllamaAPIError] = None
+    for index, candidate in enumerate(candidates):
+        try:
+            return await call(candidate)
+        except FALLBACK_ERRORS as e:
+            _failed(host, candidate, e, candidates[index + 1:])
+            last_error = e
+    assert last_error is not None
+    raise last_error
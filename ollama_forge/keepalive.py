@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Model warm-up and keep-alive management for Ollama Forge.
+
+Ollama unloads a model once its ``keep_alive`` expires, and the next request
+pays the full load time. ``OllamaClient.preload`` loads models ahead of use,
+``OllamaClient.unload`` frees them, and a ModelKeeper re-warms a set of
+models on a background thread shortly before their keep-alive runs out.
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from .config import DEFAULT_KEEP_ALIVE, KEEPER_REFRESH_FRACTION, COLD_LOAD_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+KeepAlive = Union[str, int, float]
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_keep_alive(value: KeepAlive) -> Optional[float]:
+    """
+    Convert a ``keep_alive`` value to seconds.
+
+    Args:
+        value: Seconds as a number, or a duration string such as "5m",
+            "1h30m" or "90s", as accepted by Ollama
+
+    Returns:
+        Seconds, or None if the model is kept loaded indefinitely (negative values)
+
+    Raises:
+        ValueError: If the value is not a valid duration
+    """
+    if isinstance(value, (int, float)):
+        seconds = float(value)
+    else:
+        text = value.strip()
+        try:
+            seconds = float(text)
+        except ValueError:
+            sign = -1.0 if text.startswith("-") else 1.0
+            body = text.lstrip("+-")
+            parts = _DURATION_PART.findall(body)
+            if not parts or "".join(n + u for n, u in parts) != body:
+                raise ValueError(f"Invalid keep_alive duration: {value!r}")
+            seconds = sign * sum(float(n) * _UNIT_SECONDS[u] for n, u in parts)
+    return None if seconds < 0 else seconds
+
+
+class ModelKeeper:
+    """
+    Keeps models loaded by re-warming them before their keep-alive expires.
+
+    Each model is warmed once when the keeper starts and then every
+    ``interval`` seconds. A warm-up whose ``load_duration`` exceeds
+    ``COLD_LOAD_THRESHOLD`` means the model had been unloaded in between and
+    is counted as a cold load.
+
+    Example:
+        ```
+        keeper = client.keep_warm(["llama3.2", "nomic-embed-text"], keep_alive="10m")
+        ...
+        print(keeper.stats())
+        keeper.stop()
+        ```
+
+    Attributes:
+        models: Models kept loaded
+        keep_alive: keep_alive sent with each warm-up
+        interval: Seconds between warm-ups of a model
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        models: Iterable[str],
+        keep_alive: KeepAlive = DEFAULT_KEEP_ALIVE,
+        interval: Optional[float] = None,
+        on_warm: Optional[Callable[[str, float], None]] = None
+    ):
+        """
+        Initialize the keeper; call ``start`` to begin warming.
+
+        Args:
+            client: OllamaClient used for the warm-up requests
+            models: Models to keep loaded
+            keep_alive: keep_alive sent with each warm-up
+            interval: Seconds between warm-ups (defaults to
+                ``KEEPER_REFRESH_FRACTION`` of the keep-alive, or the
+                default keep-alive when it is indefinite)
+            on_warm: Called with the model and its load duration in seconds
+                after each warm-up
+        """
+        self.client = client
+        self.models: List[str] = list(models)
+        self.keep_alive = keep_alive
+        if interval is None:
+            seconds = parse_keep_alive(keep_alive)
+            if not seconds:
+                seconds = parse_keep_alive(DEFAULT_KEEP_ALIVE) or 300.0
+            interval = seconds * KEEPER_REFRESH_FRACTION
+        self.interval = interval
+        self.on_warm = on_warm
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {
+            model: {"warmups": 0, "cold_loads": 0, "failures": 0,
+                    "last_load_duration": None, "max_load_duration": 0.0, "last_warmed": None}
+            for model in self.models
+        }
+
+    def warm(self) -> Dict[str, float]:
+        """
+        Warm every model once, now.
+
+        Returns:
+            Load duration in seconds for each model that was warmed
+        """
+        durations = {}
+        for model in self.models:
+            if self._stop.is_set():
+                break
+            try:
+                duration = self.client.preload([model], keep_alive=self.keep_alive)[model]
+            except Exception as e:
+                logger.warning(f"Failed to warm {model}: {e}")
+                with self._lock:
+                    self._stats[model]["failures"] += 1
+                continue
+            durations[model] = duration
+            with self._lock:
+                stats = self._stats[model]
+                stats["warmups"] += 1
+                stats["last_load_duration"] = duration
+                stats["max_load_duration"] = max(stats["max_load_duration"], duration)
+                stats["last_warmed"] = time.time()
+                if duration >= COLD_LOAD_THRESHOLD:
+                    stats["cold_loads"] += 1
+            if self.on_warm is not None:
+                self.on_warm(model, duration)
+        return durations
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.warm()
+            self._stop.wait(self.interval)
+
+    def start(self) -> "ModelKeeper":
+        """Start warming on a daemon thread; returns self."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="ollama-model-keeper", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop warming; models stay loaded until their keep-alive expires."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Report warm-up results per model.
+
+        Returns:
+            Dictionary keyed by model with warmups, cold_loads, failures,
+            last_load_duration and max_load_duration (seconds), and
+            last_warmed (Unix time)
+        """
+        with self._lock:
+            return {model: dict(stats) for model, stats in self._stats.items()}
+
+    def __enter__(self) -> "ModelKeeper":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Per-request performance metrics for Ollama Forge.
+
+Ollama reports its own timings (``total_duration``, ``load_duration``,
+``prompt_eval_count``, ``prompt_eval_duration``, ``eval_count`` and
+``eval_duration``) on every complete response and on the final chunk of a
+stream. The client combines them with its own wall-clock measurements into a
+RequestMetrics, available as ``result.metrics`` (for a stream, on the final
+chunk), and hands it to the client's metrics sink, if any. Results stay
+plain dictionaries to everything else: the metrics are not a key, so they
+don't change equality, caching or JSON output. Responses served from the
+response cache are measured too, with ``cache_hit`` set and only the
+client-side timings.
+
+A MetricsRegistry keeps in-process histograms per operation and model and
+exports them in the Prometheus text format; a CallbackSink passes each
+RequestMetrics to a function.
+"""
+
+import bisect
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import (
+    Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional,
+    Sequence, Tuple
+)
+
+from .config import DEFAULT_LATENCY_BUCKETS, DEFAULT_THROUGHPUT_BUCKETS
+from .streaming import chunk_text
+
+
+class RequestMetrics(NamedTuple):
+    """
+    Timings of one generate, chat or embedding request.
+
+    Durations are in seconds. Fields the server didn't report, and stream
+    timings of non-streaming requests, are None.
+
+    Attributes:
+        operation: "generate", "chat" or "embedding"
+        model: Model that served the request
+        wall_time: Client-side time from the call to the complete response,
+            including queueing and retries
+        ttft: Time to the first generated text (streams only)
+        inter_token_latency: Mean time between chunks of generated text
+            (streams only)
+        load_time: Time the server spent loading the model
+        server_time: Total time the server spent on the request
+        prompt_tokens: Prompt tokens evaluated
+        completion_tokens: Tokens generated
+        prompt_tokens_per_sec: Server-side prompt evaluation rate
+        tokens_per_sec: Server-side generation rate
+        cache_hit: Whether the response cache served the request; the
+            server-reported fields are then None
+    """
+    operation: str
+    model: str
+    wall_time: float
+    ttft: Optional[float] = None
+    inter_token_latency: Optional[float] = None
+    load_time: Optional[float] = None
+    server_time: Optional[float] = None
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    prompt_tokens_per_sec: Optional[float] = None
+    tokens_per_sec: Optional[float] = None
+    cache_hit: bool = False
+
+
+class MeteredResponse(dict):
+    """A response dictionary carrying the RequestMetrics of its request as ``metrics``."""
+
+    __slots__ = ("metrics",)
+
+    def __init__(self, response: Dict[str, Any], metrics: RequestMetrics):
+        super().__init__(response)
+        self.metrics = metrics
+
+
+def _seconds(nanoseconds: Any) -> Optional[float]:
+    return nanoseconds / 1e9 if isinstance(nanoseconds, (int, float)) else None
+
+
+def _rate(count: Any, nanoseconds: Any) -> Optional[float]:
+    if isinstance(count, int) and isinstance(nanoseconds, (int, float)) and nanoseconds > 0:
+        return count / (nanoseconds / 1e9)
+    return None
+
+
+def request_metrics(
+    operation: str,
+    model: str,
+    response: Dict[str, Any],
+    wall_time: float,
+    ttft: Optional[float] = None,
+    inter_token_latency: Optional[float] = None,
+    cache_hit: bool = False
+) -> RequestMetrics:
+    """
+    Build the metrics of a request from its response and client-side timings.
+
+    Args:
+        operation: "generate", "chat" or "embedding"
+        model: Requested model, used if the response doesn't name one
+        response: Complete response, or the final chunk of a stream
+        wall_time: Seconds from the call to the complete response
+        ttft: Seconds to the first generated text, for streams
+        inter_token_latency: Mean seconds between text chunks, for streams
+        cache_hit: The response came from the response cache, so its
+            server timings describe an earlier request and are left out
+
+    Returns:
+        The request's metrics
+    """
+    if cache_hit:
+        return RequestMetrics(
+            operation=operation,
+            model=response.get("model") or model,
+            wall_time=wall_time,
+            ttft=ttft,
+            inter_token_latency=inter_token_latency,
+            cache_hit=True,
+        )
+    return RequestMetrics(
+        operation=operation,
+        model=response.get("model") or model,
+        wall_time=wall_time,
+        ttft=ttft,
+        inter_token_latency=inter_token_latency,
+        load_time=_seconds(response.get("load_duration")),
+        server_time=_seconds(response.get("total_duration")),
+        prompt_tokens=response.get("prompt_eval_count"),
+        completion_tokens=response.get("eval_count"),
+        prompt_tokens_per_sec=_rate(response.get("prompt_eval_count"), response.get("prompt_eval_duration")),
+        tokens_per_sec=_rate(response.get("eval_count"), response.get("eval_duration")),
+    )
+
+
+class _StreamTimer:
+    """Arrival times of the text chunks of one stream."""
+
+    __slots__ = ("start", "cache_hit", "first", "last", "gaps")
+
+    def __init__(self, start: float, cache_hit: bool = False):
+        self.start = start
+        self.cache_hit = cache_hit
+        self.first: Optional[float] = None
+        self.last = 0.0
+        self.gaps = 0
+
+    def observe(self, chunk: Dict[str, Any]) -> None:
+        if not chunk_text(chunk):
+            return
+        now = time.perf_counter()
+        if self.first is None:
+            self.first = now
+        else:
+            self.gaps += 1
+        self.last = now
+
+    def finish(self, operation: str, model: str, chunk: Dict[str, Any]) -> RequestMetrics:
+        ttft = None if self.first is None else self.first - self.start
+        itl = (self.last - self.first) / self.gaps if self.gaps and self.first is not None else None
+        return request_metrics(
+            operation, model, chunk, time.perf_counter() - self.start, ttft, itl, self.cache_hit
+        )
+
+
+def measure_stream(
+    chunks: Iterable[Dict[str, Any]],
+    operation: str,
+    model: str,
+    start: float,
+    on_done: Optional[Callable[[RequestMetrics], None]] = None,
+    cache_hit: bool = False
+) -> Iterator[Dict[str, Any]]:
+    """
+    Pass a stream through, returning its final chunk as a MeteredResponse.
+
+    Args:
+        chunks: Stream chunks from ``generate`` or ``chat``
+        operation: "generate" or "chat"
+        model: Requested model
+        start: ``time.perf_counter()`` when the request was made
+        on_done: Called with the metrics once the final chunk arrives
+        cache_hit: The chunks are replayed from the response cache
+
+    Returns:
+        Iterator yielding the same chunks, the final one with ``metrics``
+    """
+    timer = _StreamTimer(start, cache_hit)
+    try:
+        for chunk in chunks:
+            timer.observe(chunk)
+            if chunk.get("done"):
+                chunk = MeteredResponse(chunk, timer.finish(operation, model, chunk))
+                if on_done is not None:
+                    on_done(chunk.metrics)
+            yield chunk
+    finally:
+        # Closing this iterator early must release the underlying response
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+async def ameasure_stream(
+    chunks: AsyncIterator[Dict[str, Any]],
+    operation: str,
+    model: str,
+    start: float,
+    on_done: Optional[Callable[[RequestMetrics], None]] = None,
+    cache_hit: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
+    """The async counterpart of ``measure_stream``."""
+    timer = _StreamTimer(start, cache_hit)
+    try:
+        async for chunk in chunks:
+            timer.observe(chunk)
+            if chunk.get("done"):
+                chunk = MeteredResponse(chunk, timer.finish(operation, model, chunk))
+                if on_done is not None:
+                    on_done(chunk.metrics)
+            yield chunk
+    finally:
+        # Closing this iterator early must release the underlying response
+        aclose = getattr(chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed bucket upper bounds, as in Prometheus.
+
+    Attributes:
+        buckets: Finite upper bounds, ascending
+        count: Observations recorded
+        sum: Sum of the observations
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)  # The last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by interpolating within its bucket.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            The estimate (capped at the largest finite bound), or None if empty
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1] if self.buckets else None
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1] if self.buckets else None
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Return ``(upper bound, observations <= bound)`` pairs, ending with +Inf."""
+        pairs = []
+        total = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), self.counts):
+            total += bucket_count
+            pairs.append((bound, total))
+        return pairs
+
+
+class MetricsSink(ABC):
+    """Receives the metrics of every completed request; subclass and implement ``record``."""
+
+    @abstractmethod
+    def record(self, metrics: RequestMetrics) -> None:
+        """Handle the metrics of one request."""
+
+
+class CallbackSink(MetricsSink):
+    """Passes each RequestMetrics to a function."""
+
+    def __init__(self, callback: Callable[[RequestMetrics], None]):
+        self.callback = callback
+
+    def record(self, metrics: RequestMetrics) -> None:
+        self.callback(metrics)
+
+
+# RequestMetrics field, Prometheus name, help text, and whether it is a rate
+_SERIES = (
+    ("wall_time", "ollama_forge_request_duration_seconds",
+     "Client-side wall time of a request.", False),
+    ("ttft", "ollama_forge_time_to_first_token_seconds",
+     "Time from a streamed request to its first generated text.", False),
+    ("inter_token_latency", "ollama_forge_inter_token_latency_seconds",
+     "Mean time between generated text chunks of a stream.", False),
+    ("load_time", "ollama_forge_model_load_seconds",
+     "Time the server spent loading the model.", False),
+    ("prompt_tokens_per_sec", "ollama_forge_prompt_tokens_per_second",
+     "Server-side prompt evaluation rate.", True),
+    ("tokens_per_sec", "ollama_forge_generation_tokens_per_second",
+     "Server-side generation rate.", True),
+)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class MetricsRegistry(MetricsSink):
+    """
+    In-process histograms of request metrics per operation and model.
+
+    Example:
+        ```
+        registry = MetricsRegistry()
+        client = OllamaClient(metrics_sink=registry)
+        ...
+        print(registry.summary()["chat"]["llama3.2"]["ttft"]["p95"])
+        open("metrics.prom", "w").write(registry.to_prometheus())
+        ```
+
+    Attributes:
+        latency_buckets: Bucket bounds of the duration histograms, in seconds
+        throughput_buckets: Bucket bounds of the tokens/sec histograms
+    """
+
+    def __init__(
+        self,
+        latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        throughput_buckets: Sequence[float] = DEFAULT_THROUGHPUT_BUCKETS
+    ):
+        self.latency_buckets = tuple(latency_buckets)
+        self.throughput_buckets = tuple(throughput_buckets)
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str, str], Histogram] = {}
+        self._tokens: Dict[Tuple[str, str, str], int] = {}
+
+    def record(self, metrics: RequestMetrics) -> None:
+        """Add one request's metrics to the histograms."""
+        with self._lock:
+            for field, _, _, is_rate in _SERIES:
+                value = getattr(metrics, field)
+                if value is None:
+                    continue
+                key = (field, metrics.operation, metrics.model)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(
+                        self.throughput_buckets if is_rate else self.latency_buckets
+                    )
+                histogram.observe(value)
+            for kind, count in (("prompt", metrics.prompt_tokens), ("completion", metrics.completion_tokens)):
+                if count:
+                    key = (kind, metrics.operation, metrics.model)
+                    self._tokens[key] = self._tokens.get(key, 0) + count
+
+    def histogram(self, field: str, operation: str, model: str) -> Optional[Histogram]:
+        """Return the histogram of a RequestMetrics field, or None if nothing was recorded."""
+        return self._histograms.get((field, operation, model))
+
+    def tokens(self, kind: str, operation: str, model: str) -> int:
+        """Return the total "prompt" or "completion" tokens recorded for an operation and model."""
+        with self._lock:
+            return self._tokens.get((kind, operation, model), 0)
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, Dict[str, Optional[float]]]]]:
+        """
+        Summarize the histograms.
+
+        Returns:
+            ``{operation: {model: {field: {"count", "mean", "p50", "p95", "p99"}}}}``
+        """
+        result: Dict[str, Dict[str, Dict[str, Dict[str, Optional[float]]]]] = {}
+        with self._lock:
+            for (field, operation, model), histogram in sorted(self._histograms.items()):
+                result.setdefault(operation, {}).setdefault(model, {})[field] = {
+                    "count": histogram.count,
+                    "mean": histogram.sum / histogram.count,
+                    "p50": histogram.quantile(0.5),
+                    "p95": histogram.quantile(0.95),
+                    "p99": histogram.quantile(0.99),
+                }
+        return result
+
+    def to_prometheus(self) -> str:
+        """
+        Export the histograms and token counters in the Prometheus text format.
+
+        Returns:
+            Exposition text, one metric family per RequestMetrics field
+        """
+        lines: List[str] = []
+        with self._lock:
+            for field, name, help_text, _ in _SERIES:
+                series = sorted(
+                    (key, histogram) for key, histogram in self._histograms.items() if key[0] == field
+                )
+                if not series:
+                    continue
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for (_, operation, model), histogram in series:
+                    labels = f'operation="{_label(operation)}",model="{_label(model)}"'
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{{labels},le="{_number(bound)}"}} {count}')
+                    lines.append(f"{name}_sum{{{labels}}} {_number(histogram.sum)}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+            if self._tokens:
+                lines.append("# HELP ollama_forge_tokens_total Tokens processed by the server.")
+                lines.append("# TYPE ollama_forge_tokens_total counter")
+                for (kind, operation, model), count in sorted(self._tokens.items()):
+                    lines.append(
+                        f'ollama_forge_tokens_total{{operation="{_label(operation)}",'
+                        f'model="{_label(model)}",kind="{kind}"}} {count}'
+                    )
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def reset(self) -> None:
+        """Clear every histogram and counter."""
+        with self._lock:
+            self._histograms.clear()
+            self._tokens.clear()
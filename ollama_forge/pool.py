@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Multi-host client for Ollama Forge.
+
+PooledOllamaClient spreads requests across several Ollama servers. It has
+the same API as OllamaClient; only the transport differs. Each request goes
+to one healthy host, chosen by outstanding requests or latency, with a
+preference for hosts that already have the requested model loaded. Hosts
+that fail are ejected and re-admitted once a health probe succeeds.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import requests
+
+from .breaker import Ticket
+from .client import OllamaClient, _call_on_aclose, _call_on_close
+from .config import (
+    DEFAULT_TIMEOUT, DEFAULT_MAX_RETRIES, API_ENDPOINTS,
+    DEFAULT_MAX_CONNECTIONS, DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    DEFAULT_KEEPALIVE_EXPIRY, DEFAULT_HEALTH_CHECK_INTERVAL,
+    DEFAULT_HOST_EJECT_SECONDS, MAX_HOST_EJECT_SECONDS, HOST_EJECT_AFTER_SERVER_ERRORS,
+    HOST_LATENCY_EWMA_ALPHA
+)
+from .exceptions import (
+    OllamaAPIError, CircuitOpenError, ConnectionError, ModelNotFoundError, ServerError, TimeoutError
+)
+from .retry import RetryState
+from .tracing import trace_span
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("least_outstanding", "ewma")
+
+# Failures that say the host itself is unreachable or unresponsive
+_HOST_FAILURES = (ConnectionError, TimeoutError)
+
+# Requests that leave their model loaded on the host that served them
+_MODEL_ENDPOINTS = (API_ENDPOINTS["generate"], API_ENDPOINTS["chat"], API_ENDPOINTS["embedding"])
+
+
+def _record(ticket: Optional[Ticket], error: Optional[BaseException] = None) -> None:
+    """Record a request's outcome on its host's circuits, if a breaker is configured."""
+    if ticket is not None:
+        ticket.record(error)
+
+
+def _model_tag(name: str) -> str:
+    """Normalize a model name so "llama3" and "llama3:latest" match."""
+    return name if ":" in name else f"{name}:latest"
+
+
+def _model_tags(entries: Iterable[Dict[str, Any]]) -> Set[str]:
+    tags = set()
+    for entry in entries:
+        for key in ("name", "model"):
+            if entry.get(key):
+                tags.add(_model_tag(entry[key]))
+    return tags
+
+
+class _Host:
+    """Routing state of one server in the pool."""
+
+    __slots__ = ("url", "client", "outstanding", "latency", "ejections",
+                 "ejected_until", "server_errors", "installed", "loaded")
+
+    def __init__(self, url: str, client: OllamaClient):
+        self.url = url
+        self.client = client
+        self.outstanding = 0
+        self.latency: Optional[float] = None
+        self.ejections = 0
+        self.ejected_until = 0.0  # 0.0 while the host is admitted
+        self.server_errors = 0  # Consecutive 5xx responses
+        self.installed: Set[str] = set()
+        self.loaded: Set[str] = set()
+
+
+class PooledOllamaClient(OllamaClient):
+    """
+    Client load-balancing requests across several Ollama servers.
+
+    A drop-in replacement for OllamaClient. For each request:
+
+    - Hosts that have the requested model installed (``/api/tags``) are
+      preferred over those that would have to pull it
+    - Among those, the host with the fewest outstanding requests is chosen
+      (``strategy="least_outstanding"``), or the one with the lowest
+      latency average scaled by its outstanding requests (``strategy="ewma"``).
+      A host without the model loaded (``/api/ps``) counts as one request
+      busier, so loaded hosts win unless they are already busier
+    - Connection failures and timeouts eject the host, as do
+      ``HOST_EJECT_AFTER_SERVER_ERRORS`` consecutive 5xx errors. After any of
+      them the request is retried on another host, waiting between hosts as
+      ``retry_policy`` does between retries, up to ``max_retries`` times
+    - With a ``circuit_breaker``, circuits are kept per host URL, and hosts
+      whose circuit for the server or model is open are skipped
+
+    A background thread probes every host with ``get_version`` every
+    ``health_interval`` seconds, refreshing its model lists and re-admitting
+    ejected hosts once their ejection period is over. Call ``close()`` to
+    stop it.
+
+    Example:
+        ```
+        client = PooledOllamaClient(["http://gpu-a:11434", "http://gpu-b:11434"])
+        client.generate("llama3.2", "Hello")
+        print(client.host_status())
+        ```
+
+    Attributes:
+        strategy: Host selection strategy, one of ``STRATEGIES``
+        health_interval: Seconds between background health probes (0 disables them)
+    """
+
+    _breaker_per_host = True
+
+    def __init__(
+        self,
+        endpoints: Sequence[str],
+        strategy: str = "least_outstanding",
+        health_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL,
+        timeout: int = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        **kwargs: Any
+    ):
+        """
+        Initialize the pooled client.
+
+        Args:
+            endpoints: Base URLs of the Ollama servers
+            strategy: "least_outstanding" or "ewma"
+            health_interval: Seconds between background health probes (0 disables them)
+            timeout: Request timeout in seconds
+            max_retries: Maximum number of other hosts tried after a failure
+            max_connections: Maximum concurrent connections per host
+            max_keepalive_connections: Maximum idle connections kept open per host
+            keepalive_expiry: Seconds an idle pooled connection is kept open
+            **kwargs: Other OllamaClient options (caches, request coalescing)
+
+        Raises:
+            ValueError: If no endpoints are given or the strategy is unknown
+        """
+        if not endpoints:
+            raise ValueError("PooledOllamaClient needs at least one endpoint")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy!r}; use one of {STRATEGIES}")
+        super().__init__(
+            base_url=endpoints[0],
+            timeout=timeout,
+            max_retries=max_retries,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            **kwargs
+        )
+        self.strategy = strategy
+        self.health_interval = health_interval
+        # Per-host transports; the pool retries across hosts instead
+        self._hosts = [
+            _Host(url.rstrip("/"), OllamaClient(
+                base_url=url,
+                timeout=timeout,
+                max_retries=0,
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+                coalesce_requests=False,
+                tracer=self.tracer,
+            ))
+            for url in endpoints
+        ]
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+
+    def host_status(self) -> List[Dict[str, Any]]:
+        """
+        Report the routing state of every host.
+
+        Returns:
+            One dictionary per host with url, healthy, outstanding,
+            latency (EWMA seconds, or None), ejected_for (seconds) and
+            loaded_models
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [{
+                "url": host.url,
+                "healthy": host.ejected_until == 0.0,
+                "outstanding": host.outstanding,
+                "latency": host.latency,
+                "ejected_for": max(0.0, host.ejected_until - now) if host.ejected_until else 0.0,
+                "loaded_models": sorted(host.loaded),
+            } for host in self._hosts]
+
+    def check_health(self) -> List[Dict[str, Any]]:
+        """
+        Probe every host now, refreshing model lists and admission state.
+
+        Returns:
+            The resulting ``host_status()``
+        """
+        for host in self._hosts:
+            self._probe(host)
+        return self.host_status()
+
+    def close(self) -> None:
+        """Stop health probes and close every host's connections."""
+        self._closed.set()
+        if self._health_thread is not None:
+            self._health_thread.join()
+        for host in self._hosts:
+            host.client.session.close()
+        self.session.close()
+
+    async def aclose(self) -> None:
+        """Close the async connection pools of every host."""
+        for host in self._hosts:
+            await host.client.aclose()
+        await super().aclose()
+
+    def _probe(self, host: _Host) -> bool:
+        """Check one host with ``get_version`` and refresh its model lists."""
+        try:
+            host.client.get_version()
+            installed = _model_tags(host.client.list_models().get("models", []))
+        except OllamaAPIError as e:
+            logger.debug(f"Health probe of {host.url} failed: {e}")
+            with self._lock:
+                self._eject(host)
+            return False
+        try:
+            loaded: Optional[Set[str]] = _model_tags(host.client.list_running_models().get("models", []))
+        except OllamaAPIError:
+            loaded = None  # Servers without /api/ps
+        with self._lock:
+            if host.ejected_until:
+                logger.info(f"Re-admitting Ollama host {host.url}")
+            host.ejected_until = 0.0
+            host.installed = installed
+            if loaded is not None:
+                host.loaded = loaded
+        return True
+
+    def _health_loop(self) -> None:
+        while True:
+            now = time.monotonic()
+            for host in self._hosts:
+                if self._closed.is_set():
+                    return
+                if host.ejected_until == 0.0 or now >= host.ejected_until:
+                    self._probe(host)
+            if self._closed.wait(self.health_interval):
+                return
+
+    def _eject(self, host: _Host) -> None:
+        """Take a host out of rotation, backing off exponentially. Call with the lock held."""
+        host.ejections += 1
+        host.server_errors = 0
+        duration = min(DEFAULT_HOST_EJECT_SECONDS * 2 ** (host.ejections - 1), MAX_HOST_EJECT_SECONDS)
+        host.ejected_until = time.monotonic() + duration
+        logger.warning(f"Ejecting Ollama host {host.url} for {duration:.0f}s")
+
+    def _score(self, host: _Host, tag: Optional[str]) -> Any:
+        # A host that would have to load the model counts as one request busier
+        load = host.outstanding + (0 if tag is None or tag in host.loaded else 1)
+        if self.strategy == "ewma":
+            return ((host.latency or 0.0) * (load + 1), load)
+        return (load, host.latency or 0.0)
+
+    def _select(self, model: Optional[str], exclude: List[_Host]) -> Optional[_Host]:
+        """Pick a host and count the request against it, or return None if none is admitted."""
+        if self.health_interval and self._health_thread is None and not self._closed.is_set():
+            with self._lock:
+                if self._health_thread is None:
+                    self._health_thread = threading.Thread(
+                        target=self._health_loop, name="ollama-forge-health", daemon=True
+                    )
+                    self._health_thread.start()
+
+        with self._lock:
+            candidates = [h for h in self._hosts if h.ejected_until == 0.0 and h not in exclude]
+            if not candidates:
+                return None
+            tag = _model_tag(model) if model else None
+            if tag is not None:
+                candidates = [h for h in candidates if tag in h.installed] or candidates
+            host = min(candidates, key=lambda h: self._score(h, tag))
+            host.outstanding += 1
+            return host
+
+    def _select_admitted(
+        self, model: Optional[str], tried: List[_Host], rejections: List[CircuitOpenError]
+    ) -> Tuple[Optional[_Host], Optional[Ticket]]:
+        """
+        Pick a host whose circuits admit the request.
+
+        Hosts with an open circuit are skipped: they are added to ``tried``
+        and their rejection to ``rejections``.
+
+        Returns:
+            The host and its circuit breaker ticket (None without a breaker),
+            or ``(None, None)`` if no host is admitted
+        """
+        while True:
+            host = self._select(model, tried)
+            if host is None or self.circuit_breaker is None:
+                return host, None
+            try:
+                return host, self.circuit_breaker.before(host.url, model)
+            except CircuitOpenError as e:
+                self._finished(host)
+                tried.append(host)
+                rejections.append(e)
+
+    def _probe_ejected(self, exclude: List[_Host]) -> None:
+        """Last resort when no host is admitted: probe the ejected ones now."""
+        for host in self._hosts:
+            if host.ejected_until and host not in exclude:
+                self._probe(host)
+
+    def _succeeded(self, host: _Host, elapsed: float, endpoint: str, model: Optional[str]) -> None:
+        with self._lock:
+            if host.latency is None:
+                host.latency = elapsed
+            else:
+                host.latency += HOST_LATENCY_EWMA_ALPHA * (elapsed - host.latency)
+            host.ejections = 0
+            host.server_errors = 0
+            if model and endpoint in _MODEL_ENDPOINTS:
+                host.loaded.add(_model_tag(model))
+
+    def _finished(self, host: _Host, error: Optional[BaseException] = None,
+                  model: Optional[str] = None) -> None:
+        with self._lock:
+            host.outstanding -= 1
+            if isinstance(error, _HOST_FAILURES):
+                self._eject(host)
+            elif isinstance(error, ServerError):
+                # A single 5xx is often one failing request; keep the host unless it persists
+                host.server_errors += 1
+                if host.server_errors >= HOST_EJECT_AFTER_SERVER_ERRORS:
+                    self._eject(host)
+            elif isinstance(error, ModelNotFoundError) and model:
+                host.installed.discard(_model_tag(model))
+                host.loaded.discard(_model_tag(model))
+
+    def _failover_delay(self, retry: RetryState, tried: List[_Host], error: BaseException) -> Optional[float]:
+        """
+        Decide whether to try another host after a failed attempt.
+
+        Returns:
+            Seconds to wait first, as ``retry_policy`` allows, or None when
+            retries are exhausted or every host has been tried
+        """
+        if len(tried) >= len(self._hosts):
+            return None
+        delay = retry.next_delay()
+        if delay is not None:
+            logger.debug(f"Failing over to another host in {delay:.2f}s after: {error}")
+        return delay
+
+    def _send_with_retry(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Optional[requests.Response]:
+        """
+        Send a request to the best available host, failing over to others.
+
+        Raises:
+            ConnectionError: If no host is available
+            OllamaAPIError: The last host's error once every attempt has failed
+        """
+        model = (data or {}).get("model")
+        tried: List[_Host] = []
+        rejections: List[CircuitOpenError] = []
+        last_error: Optional[BaseException] = None
+        retry = self.retry_policy.start()
+        while True:
+            host, ticket = self._select_admitted(model, tried, rejections)
+            if host is None:
+                self._probe_ejected(tried)
+                host, ticket = self._select_admitted(model, tried, rejections)
+                if host is None:
+                    break
+            tried.append(host)
+            started = time.perf_counter()
+            try:
+                response = host.client._send_with_retry(method, endpoint, data, stream, headers)
+            except (ConnectionError, TimeoutError, ServerError, ModelNotFoundError) as e:
+                _record(ticket, e)
+                self._finished(host, e, model)
+                last_error = e
+                delay = self._failover_delay(retry, tried, e)
+                if delay is None:
+                    break
+                with trace_span(self.tracer, "ollama.backoff", {"ollama.backoff.delay": delay}):
+                    time.sleep(delay)
+                continue
+            except BaseException as e:
+                _record(ticket, e)
+                self._finished(host, e, model)
+                raise
+            _record(ticket)
+            self._succeeded(host, time.perf_counter() - started, endpoint, model)
+            if stream and response is not None:
+                _call_on_close(response, lambda: self._finished(host))
+            else:
+                self._finished(host)
+            return response
+
+        if last_error is not None:
+            raise last_error
+        if rejections:
+            raise rejections[-1]
+        raise ConnectionError("No healthy Ollama host available")
+
+    async def _send_with_async_retry(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Optional["httpx.Response"]:
+        """
+        Send an asynchronous request to the best available host, failing over to others.
+
+        Raises:
+            ConnectionError: If no host is available
+            OllamaAPIError: The last host's error once every attempt has failed
+        """
+        model = (data or {}).get("model")
+        tried: List[_Host] = []
+        rejections: List[CircuitOpenError] = []
+        last_error: Optional[BaseException] = None
+        retry = self.retry_policy.start()
+        while True:
+            host, ticket = self._select_admitted(model, tried, rejections)
+            if host is None:
+                # Probing blocks, so keep it off the event loop
+                await asyncio.get_running_loop().run_in_executor(None, self._probe_ejected, tried)
+                host, ticket = self._select_admitted(model, tried, rejections)
+                if host is None:
+                    break
+            tried.append(host)
+            started = time.perf_counter()
+            try:
+                response = await host.client._send_with_async_retry(method, endpoint, data, stream, headers)
+            except (ConnectionError, TimeoutError, ServerError, ModelNotFoundError) as e:
+                _record(ticket, e)
+                self._finished(host, e, model)
+                last_error = e
+                delay = self._failover_delay(retry, tried, e)
+                if delay is None:
+                    break
+                with trace_span(self.tracer, "ollama.backoff", {"ollama.backoff.delay": delay}):
+                    await asyncio.sleep(delay)
+                continue
+            except BaseException as e:
+                _record(ticket, e)
+                self._finished(host, e, model)
+                raise
+            _record(ticket)
+            self._succeeded(host, time.perf_counter() - started, endpoint, model)
+            if stream and response is not None:
+                _call_on_aclose(response, lambda: self._finished(host))
+            else:
+                self._finished(host)
+            return response
+
+        if last_error is not None:
+            raise last_error
+        if rejections:
+            raise rejections[-1]
+        raise ConnectionError("No healthy Ollama host available")
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Client-side rate limiting and admission control for Ollama Forge.
+
+A RequestLimiter holds requests back before they reach the server, so a
+burst of work queues in the client instead of inside Ollama where it would
+slow down every caller. Limits combine a token bucket (requests per second
+with a burst allowance) and a cap on requests in flight, and can be set
+globally, per endpoint and per model. A request is admitted only when every
+limit that applies to it has room.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .config import API_ENDPOINTS, LIMITER_WAIT_SAMPLES
+from .exceptions import RateLimitError
+
+
+class RateLimit(NamedTuple):
+    """
+    Limits applied to one class of requests.
+
+    Attributes:
+        rate: Requests admitted per second, or None for no rate limit
+        burst: Requests that may be admitted at once after an idle period
+            (defaults to ``ceil(rate)``)
+        max_in_flight: Maximum requests outstanding at once, or None for no cap
+    """
+    rate: Optional[float] = None
+    burst: Optional[int] = None
+    max_in_flight: Optional[int] = None
+
+
+class _Gate:
+    """Token bucket and in-flight counter for one limit."""
+
+    __slots__ = ("limit", "capacity", "tokens", "updated", "in_flight")
+
+    def __init__(self, limit: RateLimit):
+        self.limit = limit
+        self.capacity = float(limit.burst or max(1, math.ceil(limit.rate or 1)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.in_flight = 0
+
+    def wait_time(self, now: float) -> Optional[float]:
+        """Seconds until a request fits, 0.0 if it fits now, or None if that depends on a release."""
+        if self.limit.max_in_flight is not None and self.in_flight >= self.limit.max_in_flight:
+            return None
+        if self.limit.rate:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.limit.rate)
+            self.updated = now
+            if self.tokens < 1.0:
+                return (1.0 - self.tokens) / self.limit.rate
+        return 0.0
+
+    def take(self) -> None:
+        if self.limit.rate:
+            self.tokens -= 1.0
+        self.in_flight += 1
+
+
+class Permit:
+    """
+    Admission of one request; release it when the request is finished.
+
+    Releasing is idempotent, and a permit can be used as a context manager.
+    """
+
+    __slots__ = ("_limiter", "_gates", "_released")
+
+    def __init__(self, limiter: "RequestLimiter", gates: List[_Gate]):
+        self._limiter = limiter
+        self._gates = gates
+        self._released = False
+
+    def release(self) -> None:
+        """Return the permit's in-flight slots and wake waiting requests."""
+        if not self._released:
+            self._released = True
+            self._limiter._release(self._gates)
+
+    def __enter__(self) -> "Permit":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+
+class RequestLimiter:
+    """
+    Token-bucket and max-in-flight admission control, shared by threads and tasks.
+
+    Example:
+        ```
+        limiter = RequestLimiter(
+            default=RateLimit(max_in_flight=8),
+            endpoints={"embedding": RateLimit(rate=20, burst=40)},
+            models={"llama3.2:70b": RateLimit(max_in_flight=1)},
+            queue_timeout=30.0,
+        )
+        client = OllamaClient(limiter=limiter)
+        ```
+
+    Attributes:
+        queue_timeout: Default seconds a request may wait for admission, or
+            None to wait indefinitely
+    """
+
+    def __init__(
+        self,
+        default: Optional[RateLimit] = None,
+        endpoints: Optional[Dict[str, RateLimit]] = None,
+        models: Optional[Dict[str, RateLimit]] = None,
+        queue_timeout: Optional[float] = None
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            default: Limit shared by every request
+            endpoints: Limits per endpoint, keyed by operation name
+                ("chat", "embedding", ...) or path ("/api/chat")
+            models: Limits per model name, shared across endpoints
+            queue_timeout: Default seconds a request may wait for admission
+        """
+        self.queue_timeout = queue_timeout
+        self._default = _Gate(default) if default else None
+        self._endpoints = {
+            API_ENDPOINTS.get(name, name): _Gate(limit) for name, limit in (endpoints or {}).items()
+        }
+        self._models = {
+            self._model_key(name): _Gate(limit) for name, limit in (models or {}).items()
+        }
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = []
+        self._queued = 0
+        self._in_flight = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._waits: deque = deque(maxlen=LIMITER_WAIT_SAMPLES)
+
+    @staticmethod
+    def _model_key(name: str) -> str:
+        return name if ":" in name else f"{name}:latest"
+
+    def _gates(self, endpoint: str, model: Optional[str]) -> List[_Gate]:
+        gates = [self._default, self._endpoints.get(endpoint)]
+        if model:
+            gates.append(self._models.get(self._model_key(model)))
+        return [gate for gate in gates if gate is not None]
+
+    def _try_admit(self, gates: List[_Gate]) -> Optional[float]:
+        """Admit if every gate has room; otherwise return how long to wait (None: until a release)."""
+        now = time.monotonic()
+        longest: Optional[float] = 0.0
+        for gate in gates:
+            wait = gate.wait_time(now)
+            if wait is None:
+                longest = None
+            elif longest is not None:
+                longest = max(longest, wait)
+        if longest == 0.0:
+            for gate in gates:
+                gate.take()
+        return longest
+
+    def _finish_wait(self, started: float, admitted: bool) -> None:
+        """Record the outcome of a queued request. Call with the lock held."""
+        waited = time.monotonic() - started
+        self._queued -= 1
+        if admitted:
+            self._in_flight += 1
+            self._admitted += 1
+            self._wait_total += waited
+            self._waits.append(waited)
+        else:
+            self._rejected += 1
+
+    def _release(self, gates: List[_Gate]) -> None:
+        with self._lock:
+            for gate in gates:
+                gate.in_flight -= 1
+            self._in_flight -= 1
+            self._changed.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                pass  # The waiter's event loop has closed
+
+    def acquire(
+        self,
+        endpoint: str,
+        model: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> Permit:
+        """
+        Wait until a request may be sent.
+
+        Args:
+            endpoint: API endpoint path of the request
+            model: Model the request is for
+            timeout: Seconds to wait for admission (defaults to ``queue_timeout``)
+
+        Returns:
+            Permit to release when the request is finished
+
+        Raises:
+            RateLimitError: If the request isn't admitted in time
+        """
+        gates = self._gates(endpoint, model)
+        timeout = self.queue_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        with self._lock:
+            self._queued += 1
+            while True:
+                wait = self._try_admit(gates)
+                if wait == 0.0:
+                    self._finish_wait(started, admitted=True)
+                    return Permit(self, gates)
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._finish_wait(started, admitted=False)
+                        raise RateLimitError(f"Request to {endpoint} not admitted within {timeout}s")
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._changed.wait(wait)
+
+    async def aacquire(
+        self,
+        endpoint: str,
+        model: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> Permit:
+        """
+        Asynchronously wait until a request may be sent.
+
+        Waiting doesn't block the event loop. Arguments and exceptions are
+        those of ``acquire``.
+
+        Returns:
+            Permit to release when the request is finished
+        """
+        gates = self._gates(endpoint, model)
+        timeout = self.queue_timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        with self._lock:
+            self._queued += 1
+        try:
+            while True:
+                with self._lock:
+                    wait = self._try_admit(gates)
+                    if wait == 0.0:
+                        self._finish_wait(started, admitted=True)
+                        return Permit(self, gates)
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._finish_wait(started, admitted=False)
+                            raise RateLimitError(f"Request to {endpoint} not admitted within {timeout}s")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    woken = loop.create_future()
+                    self._async_waiters.append((loop, woken))
+                try:
+                    await asyncio.wait_for(woken, wait)
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            with self._lock:
+                self._queued -= 1
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report queueing metrics.
+
+        Returns:
+            Dictionary with queue_depth (requests waiting now), in_flight,
+            admitted, rejected, mean_wait, and p50_wait/p99_wait over recent
+            admissions (seconds)
+        """
+        with self._lock:
+            waits = sorted(self._waits)
+            return {
+                "queue_depth": self._queued,
+                "in_flight": self._in_flight,
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+                "mean_wait": self._wait_total / self._admitted if self._admitted else 0.0,
+                "p50_wait": _percentile(waits, 0.50),
+                "p99_wait": _percentile(waits, 0.99),
+            }
+
+
+def _wake(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
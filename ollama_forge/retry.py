@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Retry policy for Ollama Forge.
+
+A RetryPolicy decides whether a failed request is tried again and how long
+to wait first. It is used by both the sync and async transports, which only
+differ in how they sleep. Waits use decorrelated jitter, honour the server's
+Retry-After header, stop at a total deadline across attempts, and draw on a
+retry budget shared by every request of the client so that a failing server
+isn't hit with a storm of retries.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Collection, Optional
+
+from .config import (
+    DEFAULT_MAX_RETRIES, DEFAULT_RETRY_BASE_DELAY, DEFAULT_RETRY_MAX_DELAY,
+    DEFAULT_RETRY_BUDGET_RATIO, DEFAULT_RETRY_BUDGET_MIN, RETRYABLE_STATUS_CODES
+)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of the requests made.
+
+    Every request deposits ``ratio`` of a retry and every retry withdraws a
+    whole one, so while the server is failing retries add at most ``ratio``
+    extra load. ``min_retries`` is the starting balance, so a client that
+    has made only a few requests can still retry.
+
+    Attributes:
+        ratio: Retries earned per request
+        min_retries: Retries available without any prior deposits
+    """
+
+    def __init__(self, ratio: float = DEFAULT_RETRY_BUDGET_RATIO,
+                 min_retries: int = DEFAULT_RETRY_BUDGET_MIN):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self._balance = float(min_retries)
+        self._max_balance = float(min_retries) + 100 * ratio
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        """Record a request."""
+        with self._lock:
+            self._balance = min(self._max_balance, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take one retry from the budget; return False if it is exhausted."""
+        with self._lock:
+            if self._balance < 1.0:
+                return False
+            self._balance -= 1.0
+            return True
+
+    @property
+    def balance(self) -> float:
+        """Retries currently available."""
+        return self._balance
+
+
+class RetryState:
+    """Progress of one request through its attempts."""
+
+    __slots__ = ("policy", "attempt", "deadline", "_previous_delay")
+
+    def __init__(self, policy: "RetryPolicy"):
+        self.policy = policy
+        self.attempt = 0
+        self.deadline = None if policy.deadline is None else time.monotonic() + policy.deadline
+        self._previous_delay = policy.base_delay
+
+    def timeout(self, timeout: float) -> float:
+        """Clamp a per-attempt timeout to the time left before the deadline."""
+        if self.deadline is None:
+            return timeout
+        return max(0.001, min(timeout, self.deadline - time.monotonic()))
+
+    def next_delay(self, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Decide whether to retry after a failed attempt.
+
+        Args:
+            retry_after: Delay requested by the server, in seconds
+
+        Returns:
+            Seconds to wait before the next attempt, or None to give up
+        """
+        policy = self.policy
+        if self.attempt >= policy.max_retries:
+            return None
+        # Decorrelated jitter: random between the base delay and three times the last delay
+        delay = min(policy.max_delay, random.uniform(policy.base_delay, self._previous_delay * 3))
+        self._previous_delay = delay
+        if retry_after is not None and policy.respect_retry_after:
+            delay = max(delay, retry_after)
+        if self.deadline is not None and time.monotonic() + delay >= self.deadline:
+            return None
+        if policy.budget is not None and not policy.budget.withdraw():
+            return None
+        self.attempt += 1
+        return delay
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed request.
+
+    Timeouts, connection failures and the statuses in ``retry_statuses`` are
+    retried; other errors, such as 400 or 404, are raised at once.
+
+    Example:
+        ```
+        policy = RetryPolicy(max_retries=5, deadline=60.0)
+        client = OllamaClient(retry_policy=policy)
+        ```
+
+    Attributes:
+        max_retries: Retries after the first attempt
+        base_delay: Shortest wait before a retry, in seconds
+        max_delay: Longest jittered wait before a retry, in seconds
+        deadline: Seconds allowed for all attempts together, or None
+        retry_statuses: HTTP statuses that are retried
+        respect_retry_after: Wait at least as long as a Retry-After header asks
+        budget: Retry budget shared by every request using this policy
+    """
+
+    def __init__(
+        self,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = DEFAULT_RETRY_BASE_DELAY,
+        max_delay: float = DEFAULT_RETRY_MAX_DELAY,
+        deadline: Optional[float] = None,
+        retry_statuses: Collection[int] = RETRYABLE_STATUS_CODES,
+        respect_retry_after: bool = True,
+        budget: Optional[RetryBudget] = None
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            max_retries: Retries after the first attempt
+            base_delay: Shortest wait before a retry, in seconds
+            max_delay: Longest jittered wait before a retry, in seconds
+            deadline: Seconds allowed for all attempts together
+            retry_statuses: HTTP statuses that are retried
+            respect_retry_after: Honour Retry-After headers
+            budget: Retry budget (defaults to a new RetryBudget)
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses)
+        self.respect_retry_after = respect_retry_after
+        self.budget = budget if budget is not None else RetryBudget()
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        """Return whether a response with this status may be retried."""
+        return status_code in self.retry_statuses
+
+    def start(self) -> RetryState:
+        """Begin a request, crediting the retry budget with its share of a retry."""
+        if self.budget is not None:
+            self.budget.deposit()
+        return RetryState(self)
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Priority scheduling of requests for Ollama Forge.
+
+A PriorityScheduler bounds how many requests a client sends at once and,
+when requests are waiting, decides which goes next. Waiting requests are
+grouped into priority classes and served by weighted fair queueing: each
+backlogged class gets a share of dispatches proportional to its weight, so
+interactive traffic stays responsive under bulk load without starving the
+bulk work entirely.
+
+The priority of a request is taken from the ``priority=`` argument of the
+client method, or from an enclosing ``with request_priority(...)`` block.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .config import DEFAULT_PRIORITY, DEFAULT_PRIORITY_WEIGHTS, DEFAULT_SCHEDULER_SLOTS
+from .exceptions import RateLimitError
+
+PRIORITIES = tuple(DEFAULT_PRIORITY_WEIGHTS)
+
+_current_priority: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "ollama_forge_priority", default=None
+)
+
+
+@contextmanager
+def request_priority(priority: Optional[str]) -> Iterator[None]:
+    """
+    Set the priority of requests made in this thread or task.
+
+    Args:
+        priority: One of ``PRIORITIES``, or None to leave it unchanged
+
+    Raises:
+        ValueError: If the priority is unknown
+    """
+    if priority is None:
+        yield
+        return
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority {priority!r}; use one of {PRIORITIES}")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> str:
+    """Return the priority of requests made in this thread or task."""
+    return _current_priority.get() or DEFAULT_PRIORITY
+
+
+class _Waiter:
+    """A request queued for a slot."""
+
+    __slots__ = ("priority", "enqueued", "granted", "cancelled", "event", "loop", "future")
+
+    def __init__(self, priority: str):
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        self.granted = False
+        self.cancelled = False
+        self.event: Optional[threading.Event] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.future: Optional["asyncio.Future[None]"] = None
+
+
+class Slot:
+    """
+    A dispatch slot held by one request; release it when the request is finished.
+
+    Releasing is idempotent, and a slot can be used as a context manager.
+    """
+
+    __slots__ = ("_scheduler", "_released")
+
+    def __init__(self, scheduler: "PriorityScheduler"):
+        self._scheduler = scheduler
+        self._released = False
+
+    def release(self) -> None:
+        """Hand the slot to the next waiting request."""
+        if not self._released:
+            self._released = True
+            self._scheduler._release()
+
+    def __enter__(self) -> "Slot":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+
+class PriorityScheduler:
+    """
+    Weighted fair queueing of requests across priority classes.
+
+    Example:
+        ```
+        client = OllamaClient(scheduler=PriorityScheduler(max_in_flight=4))
+        client.chat(model, messages, priority="interactive")
+        with request_priority("batch"):
+            client.batch_embeddings(model, corpus)
+        ```
+
+    Attributes:
+        max_in_flight: Requests dispatched at once; match the server's
+            parallelism (``OLLAMA_NUM_PARALLEL``) so queueing happens here
+        weights: Relative dispatch share of each priority class
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_SCHEDULER_SLOTS,
+        weights: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_in_flight: Requests dispatched at once
+            weights: Weight per priority class (defaults to
+                ``DEFAULT_PRIORITY_WEIGHTS``)
+
+        Raises:
+            ValueError: If max_in_flight is below 1 or a weight isn't positive
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.max_in_flight = max_in_flight
+        self.weights = dict(DEFAULT_PRIORITY_WEIGHTS, **(weights or {}))
+        if any(weight <= 0 for weight in self.weights.values()):
+            raise ValueError("Priority weights must be positive")
+        self._lock = threading.Lock()
+        self._queue: List[Tuple[float, int, _Waiter]] = []
+        self._sequence = itertools.count()
+        self._virtual_time = 0.0
+        self._last_finish: Dict[str, float] = {}
+        self._in_flight = 0
+        self._stats: Dict[str, Dict[str, float]] = {
+            name: {"queued": 0, "dispatched": 0, "wait_total": 0.0} for name in self.weights
+        }
+
+    def _check(self, priority: Optional[str]) -> str:
+        priority = priority or current_priority()
+        if priority not in self.weights:
+            raise ValueError(f"Unknown priority {priority!r}; use one of {tuple(self.weights)}")
+        return priority
+
+    def _enqueue(self, waiter: _Waiter) -> bool:
+        """Grant a free slot at once, or queue the waiter. Call with the lock held."""
+        if self._in_flight < self.max_in_flight and not self._queue:
+            self._grant(waiter)
+            return True
+        # Weighted fair queueing: each request's virtual finish time advances
+        # its class by 1/weight, and the earliest finish time goes next
+        start = max(self._virtual_time, self._last_finish.get(waiter.priority, 0.0))
+        finish = start + 1.0 / self.weights[waiter.priority]
+        self._last_finish[waiter.priority] = finish
+        heapq.heappush(self._queue, (finish, next(self._sequence), waiter))
+        self._stats[waiter.priority]["queued"] += 1
+        return False
+
+    def _grant(self, waiter: _Waiter) -> None:
+        waiter.granted = True
+        self._in_flight += 1
+        stats = self._stats[waiter.priority]
+        stats["dispatched"] += 1
+        stats["wait_total"] += time.monotonic() - waiter.enqueued
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            while self._queue and self._in_flight < self.max_in_flight:
+                finish, _, waiter = heapq.heappop(self._queue)
+                self._stats[waiter.priority]["queued"] -= 1
+                if waiter.cancelled:
+                    continue
+                self._virtual_time = finish
+                self._grant(waiter)
+                if waiter.event is not None:
+                    waiter.event.set()
+                elif waiter.loop is not None:
+                    try:
+                        waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+                    except RuntimeError:
+                        # The waiter's event loop has closed; pass the slot on
+                        self._in_flight -= 1
+                        continue
+
+    def _abandon(self, waiter: _Waiter) -> bool:
+        """Withdraw a waiter that gave up, unless a slot was granted meanwhile; report which."""
+        with self._lock:
+            waiter.cancelled = not waiter.granted
+            return waiter.granted
+
+    def acquire(self, priority: Optional[str] = None, timeout: Optional[float] = None) -> Slot:
+        """
+        Wait for a dispatch slot.
+
+        Args:
+            priority: Priority class (defaults to ``current_priority()``)
+            timeout: Seconds to wait, or None to wait indefinitely
+
+        Returns:
+            Slot to release when the request is finished
+
+        Raises:
+            ValueError: If the priority is unknown
+            RateLimitError: If no slot is granted in time
+        """
+        waiter = _Waiter(self._check(priority))
+        with self._lock:
+            if self._enqueue(waiter):
+                return Slot(self)
+            waiter.event = threading.Event()
+        if not waiter.event.wait(timeout) and not self._abandon(waiter):
+            raise RateLimitError(f"No {waiter.priority} request slot within {timeout}s")
+        return Slot(self)
+
+    async def aacquire(self, priority: Optional[str] = None, timeout: Optional[float] = None) -> Slot:
+        """
+        Asynchronously wait for a dispatch slot.
+
+        Waiting doesn't block the event loop. Arguments and exceptions are
+        those of ``acquire``.
+
+        Returns:
+            Slot to release when the request is finished
+        """
+        waiter = _Waiter(self._check(priority))
+        with self._lock:
+            if self._enqueue(waiter):
+                return Slot(self)
+            waiter.loop = asyncio.get_running_loop()
+            waiter.future = waiter.loop.create_future()
+        try:
+            await asyncio.wait_for(waiter.future, timeout)
+        except asyncio.TimeoutError:
+            if not self._abandon(waiter):
+                raise RateLimitError(f"No {waiter.priority} request slot within {timeout}s")
+        except asyncio.CancelledError:
+            if self._abandon(waiter):
+                self._release()
+            raise
+        return Slot(self)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report scheduling metrics.
+
+        Returns:
+            Dictionary with in_flight and, per priority class, queued
+            (waiting now), dispatched and mean_wait (seconds)
+        """
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                **{
+                    name: {
+                        "queued": int(stats["queued"]),
+                        "dispatched": int(stats["dispatched"]),
+                        "mean_wait": stats["wait_total"] / stats["dispatched"] if stats["dispatched"] else 0.0,
+                    }
+                    for name, stats in self._stats.items()
+                },
+            }
+
+
+def _wake(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
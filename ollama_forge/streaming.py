@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+NDJSON stream decoding for Ollama Forge.
+
+Ollama streams one JSON object per line. Every streaming method decodes
+responses through this module, which reads raw byte chunks, splits them on
+newlines and parses each line with orjson when it is installed, falling back
+to the standard library otherwise.
+"""
+
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Iterator, List, Union
+
+from .config import DEFAULT_STREAM_CHUNK_SIZE
+from .exceptions import StreamingError
+
+try:
+    import orjson
+    JSON_BACKEND = "orjson"
+except ImportError:
+    orjson = None  # type: ignore [assignment]
+    JSON_BACKEND = "json"
+
+logger = logging.getLogger(__name__)
+
+
+def loads(data: Union[bytes, bytearray, memoryview]) -> Any:
+    """Parse one JSON document from bytes with the fastest available backend."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+
+def chunk_text(chunk: Dict[str, Any]) -> str:
+    """
+    Return the generated text carried by a stream chunk.
+
+    Args:
+        chunk: A ``/api/generate`` or ``/api/chat`` stream chunk
+
+    Returns:
+        The ``response`` text, the ``message.content`` text, or an empty string
+    """
+    text = chunk.get("response")
+    if text is None:
+        text = (chunk.get("message") or {}).get("content")
+    return text or ""
+
+
+class NDJSONDecoder:
+    """
+    Incremental decoder for newline-delimited JSON.
+
+    Bytes are fed in arbitrary chunks; complete lines are parsed and returned,
+    and a trailing partial line is kept until the rest of it arrives.
+
+    Attributes:
+        skip_invalid: Log and drop lines that are not valid JSON instead of
+            raising StreamingError
+    """
+
+    def __init__(self, skip_invalid: bool = False):
+        self.skip_invalid = skip_invalid
+        self._pending = b""
+
+    def feed(self, data: bytes) -> List[Any]:
+        """
+        Decode every complete line in ``data``.
+
+        Args:
+            data: Next chunk of the byte stream
+
+        Returns:
+            Parsed objects, in stream order
+
+        Raises:
+            StreamingError: If a line is not valid JSON and skip_invalid is False
+        """
+        if self._pending:
+            data = self._pending + data
+        view = memoryview(data)
+        decoded = []
+        start = 0
+        while True:
+            end = data.find(b"\n", start)
+            if end < 0:
+                break
+            if end > start:
+                self._decode_into(decoded, view[start:end])
+            start = end + 1
+        self._pending = data[start:]
+        return decoded
+
+    def flush(self) -> List[Any]:
+        """
+        Decode a final line that was not newline-terminated.
+
+        Returns:
+            Parsed objects (zero or one)
+
+        Raises:
+            StreamingError: If the line is not valid JSON and skip_invalid is False
+        """
+        decoded: List[Any] = []
+        if self._pending:
+            pending, self._pending = self._pending, b""
+            self._decode_into(decoded, memoryview(pending))
+        return decoded
+
+    def _decode_into(self, decoded: List[Any], line: memoryview) -> None:
+        try:
+            decoded.append(loads(line))
+        except ValueError:
+            raw = bytes(line)
+            if not raw.strip():
+                return
+            if self.skip_invalid:
+                logger.warning(f"Failed to parse streamed line: {raw!r}")
+                return
+            raise StreamingError(f"Failed to parse streamed line: {raw!r}")
+
+
+def iter_ndjson(
+    response: Any,
+    chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+    skip_invalid: bool = False,
+    text_only: bool = False
+) -> Iterator[Any]:
+    """
+    Yield decoded chunks from a streamed ``requests`` response.
+
+    The response is closed when the stream ends, fails, or the generator is
+    closed early, so the connection goes back to the pool.
+
+    Args:
+        response: Response opened with ``stream=True``
+        chunk_size: Maximum bytes requested per read
+        skip_invalid: Log and drop invalid lines instead of raising
+        text_only: Yield only the generated text of each chunk
+
+    Returns:
+        Iterator of chunk dictionaries, or of strings when text_only is True
+
+    Raises:
+        StreamingError: If a line is not valid JSON and skip_invalid is False
+    """
+    decoder = NDJSONDecoder(skip_invalid=skip_invalid)
+    try:
+        for data in response.iter_content(chunk_size=chunk_size):
+            for chunk in decoder.feed(data):
+                yield chunk_text(chunk) if text_only else chunk
+        for chunk in decoder.flush():
+            yield chunk_text(chunk) if text_only else chunk
+    finally:
+        response.close()
+
+
+async def aiter_ndjson(
+    response: Any,
+    skip_invalid: bool = False,
+    text_only: bool = False
+) -> AsyncIterator[Any]:
+    """
+    Yield decoded chunks from a streamed ``httpx`` response.
+
+    Bytes are consumed as the server sends them. The response is closed when
+    the stream ends, fails, or the consumer closes the generator early
+    (``await chunks.aclose()``).
+
+    Args:
+        response: Response sent with ``stream=True``
+        skip_invalid: Log and drop invalid lines instead of raising
+        text_only: Yield only the generated text of each chunk
+
+    Returns:
+        Async iterator of chunk dictionaries, or of strings when text_only is True
+
+    Raises:
+        StreamingError: If a line is not valid JSON and skip_invalid is False
+    """
+    decoder = NDJSONDecoder(skip_invalid=skip_invalid)
+    try:
+        async for data in response.aiter_bytes():
+            for chunk in decoder.feed(data):
+                yield chunk_text(chunk) if text_only else chunk
+        for chunk in decoder.flush():
+            yield chunk_text(chunk) if text_only else chunk
+    finally:
+        await response.aclose()
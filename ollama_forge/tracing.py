@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Optional tracing hooks for Ollama Forge.
+
+With a tracer configured, every generate, chat and embedding call produces a
+span tree showing where its time went::
+
+    ollama.chat                 model, token counts, load time; "first_token" event
+    └── ollama.request          endpoint, method, final status
+        ├── ollama.queue        waiting for the circuit breaker, scheduler and limiter
+        ├── ollama.attempt      one per try: status or error; "first_byte" event
+        ├── ollama.backoff      sleep before the next try
+        └── ollama.attempt
+
+Tracing is off by default and then costs one ``is None`` check per hook.
+Spans go to any object implementing the small Tracer interface below:
+OpenTelemetryTracer adapts an OpenTelemetry tracer (``opentelemetry-api`` is
+imported only when it is used), and InMemoryTracer records spans for tests
+and debugging.
+"""
+
+import contextvars
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from typing import Any, AsyncIterator, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+from .streaming import chunk_text
+
+# Shared by every disabled hook; nullcontext holds no state
+_DISABLED: ContextManager[None] = nullcontext()
+
+
+class Span(ABC):
+    """
+    Interface of a span, matching the corresponding OpenTelemetry methods.
+
+    Attribute values are strings, booleans, integers or floats.
+    OpenTelemetry spans have the same methods and are used as they are.
+    """
+
+    @abstractmethod
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set one attribute."""
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    @abstractmethod
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        """Record a timestamped event."""
+
+    @abstractmethod
+    def record_exception(self, exception: BaseException) -> None:
+        """Record an exception raised while the span was current."""
+
+    @abstractmethod
+    def end(self) -> None:
+        """End the span."""
+
+
+class Tracer(ABC):
+    """
+    Interface the client traces through.
+
+    ``start_span`` starts a span as a child of the current one;
+    ``use_span`` makes a span current for the duration of a ``with`` block
+    without ending it.
+    """
+
+    @abstractmethod
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Span:
+        """Start a span as a child of the current one."""
+
+    @abstractmethod
+    def use_span(self, span: Span) -> ContextManager[Any]:
+        """Make ``span`` current for a ``with`` block without ending it."""
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    Sends spans to OpenTelemetry.
+
+    Requires ``opentelemetry-api``; configure an SDK tracer provider and
+    exporter as usual.
+
+    Example:
+        ```
+        client = OllamaClient(tracer=OpenTelemetryTracer())
+        ```
+    """
+
+    def __init__(self, tracer: Any = None):
+        """
+        Initialize the adapter.
+
+        Args:
+            tracer: An OpenTelemetry tracer (defaults to
+                ``trace.get_tracer("ollama_forge")``)
+
+        Raises:
+            ImportError: If opentelemetry-api is not installed
+        """
+        from opentelemetry import trace
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer("ollama_forge")
+
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Span:
+        return self._tracer.start_span(name, attributes=attributes)
+
+    def use_span(self, span: Span) -> ContextManager[Any]:
+        return self._trace.use_span(
+            span, end_on_exit=False, record_exception=False, set_status_on_exception=False
+        )
+
+
+def as_tracer(tracer: Any) -> Optional[Tracer]:
+    """
+    Return the Tracer to use for the client's ``tracer`` option.
+
+    Args:
+        tracer: None or False to disable tracing, True for an
+            OpenTelemetryTracer with the global tracer provider, a Tracer,
+            or an OpenTelemetry tracer
+
+    Returns:
+        The Tracer, or None when tracing is disabled
+    """
+    if tracer is None or tracer is False:
+        return None
+    if tracer is True:
+        return OpenTelemetryTracer()
+    if isinstance(tracer, Tracer):
+        return tracer
+    return OpenTelemetryTracer(tracer)
+
+
+def _clean(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop None values, which OpenTelemetry rejects."""
+    return {key: value for key, value in attributes.items() if value is not None}
+
+
+class _Scope:
+    """Makes a span current; records an escaping exception and ends the span on it."""
+
+    __slots__ = ("_tracer", "_span", "_end", "_context")
+
+    def __init__(self, tracer: Tracer, span: Span, end: bool):
+        self._tracer = tracer
+        self._span = span
+        self._end = end
+        self._context: Optional[ContextManager[Any]] = None
+
+    def __enter__(self) -> Span:
+        self._context = self._tracer.use_span(self._span)
+        self._context.__enter__()
+        return self._span
+
+    def __exit__(self, exc_type: Any, exc: Optional[BaseException], tb: Any) -> None:
+        assert self._context is not None
+        self._context.__exit__(exc_type, exc, tb)
+        if exc is not None:
+            fail_span(self._span, exc)
+        elif self._end:
+            self._span.end()
+
+
+def trace_span(tracer: Optional[Tracer], name: str,
+               attributes: Optional[Dict[str, Any]] = None) -> ContextManager[Optional[Span]]:
+    """
+    Run a ``with`` block in a new current span, ended when the block exits.
+
+    Args:
+        tracer: The client's tracer, or None when tracing is disabled
+        name: Span name
+        attributes: Initial attributes; None values are dropped
+
+    Returns:
+        Context manager yielding the span, or None when tracing is disabled
+    """
+    if tracer is None:
+        return _DISABLED
+    return _Scope(tracer, tracer.start_span(name, _clean(attributes or {})), end=True)
+
+
+def start_span(tracer: Optional[Tracer], name: str,
+               attributes: Optional[Dict[str, Any]] = None) -> Optional[Span]:
+    """Start a span to be ended explicitly with ``end_span``, or return None when disabled."""
+    if tracer is None:
+        return None
+    return tracer.start_span(name, _clean(attributes or {}))
+
+
+def activate(tracer: Optional[Tracer], span: Optional[Span]) -> ContextManager[Any]:
+    """
+    Make ``span`` current for a ``with`` block without ending it.
+
+    An exception escaping the block is recorded and ends the span.
+    """
+    if tracer is None or span is None:
+        return _DISABLED
+    return _Scope(tracer, span, end=False)
+
+
+def end_span(span: Optional[Span], attributes: Optional[Dict[str, Any]] = None) -> None:
+    """Set final attributes on a span and end it; does nothing for None."""
+    if span is not None:
+        if attributes:
+            span.set_attributes(_clean(attributes))
+        span.end()
+
+
+def _record_failure(span: Span, error: BaseException) -> None:
+    span.record_exception(error)
+    span.set_attribute("error.type", type(error).__name__)
+
+
+def fail_span(span: Optional[Span], error: BaseException) -> None:
+    """Record an exception on a span and end it; does nothing for None."""
+    if span is not None:
+        _record_failure(span, error)
+        span.end()
+
+
+class RecordedSpan(Span):
+    """
+    A span recorded by InMemoryTracer.
+
+    Attributes:
+        name: Span name
+        parent: Enclosing span, or None for a root span
+        attributes: Attributes set on the span
+        events: ``(name, attributes, time)`` tuples, in order
+        exceptions: Exceptions recorded on the span
+        start_time: ``time.perf_counter()`` at start
+        end_time: ``time.perf_counter()`` at end, or None while open
+    """
+
+    def __init__(self, tracer: "InMemoryTracer", name: str, parent: Optional["RecordedSpan"],
+                 attributes: Dict[str, Any]):
+        self._tracer = tracer
+        self.name = name
+        self.parent = parent
+        self.attributes = dict(attributes)
+        self.events: List[Tuple[str, Dict[str, Any], float]] = []
+        self.exceptions: List[BaseException] = []
+        self.start_time = time.perf_counter()
+        self.end_time: Optional[float] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        self.events.append((name, dict(attributes or {}), time.perf_counter()))
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.exceptions.append(exception)
+
+    def end(self) -> None:
+        if self.end_time is None:
+            self.end_time = time.perf_counter()
+            self._tracer._finished(self)
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Seconds from start to end, or None while open."""
+        return None if self.end_time is None else self.end_time - self.start_time
+
+    def __repr__(self) -> str:
+        return f"RecordedSpan({self.name!r}, {self.attributes!r})"
+
+
+class InMemoryTracer(Tracer):
+    """
+    Records finished spans in memory, for tests and debugging.
+
+    The current span is tracked in a context variable, so nesting follows
+    threads and asyncio tasks.
+
+    Example:
+        ```
+        tracer = InMemoryTracer()
+        client = OllamaClient(tracer=tracer)
+        client.chat(model, messages)
+        for span in tracer.spans:
+            print(span.name, span.duration, span.attributes)
+        ```
+
+    Attributes:
+        spans: Finished spans, in the order they ended
+    """
+
+    def __init__(self) -> None:
+        self.spans: List[RecordedSpan] = []
+        self._lock = threading.Lock()
+        self._current: contextvars.ContextVar[Optional[RecordedSpan]] = contextvars.ContextVar(
+            f"ollama_forge_span_{id(self)}", default=None
+        )
+
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> RecordedSpan:
+        return RecordedSpan(self, name, self._current.get(), attributes or {})
+
+    def use_span(self, span: Span) -> ContextManager[Any]:
+        return _UseSpan(self._current, span)
+
+    def _finished(self, span: RecordedSpan) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def named(self, name: str) -> List[RecordedSpan]:
+        """Return the finished spans called ``name``."""
+        with self._lock:
+            return [span for span in self.spans if span.name == name]
+
+    def children(self, parent: RecordedSpan) -> List[RecordedSpan]:
+        """Return the finished spans directly inside ``parent``, in start order."""
+        with self._lock:
+            return sorted((span for span in self.spans if span.parent is parent),
+                          key=lambda span: span.start_time)
+
+    def clear(self) -> None:
+        """Forget every recorded span."""
+        with self._lock:
+            self.spans.clear()
+
+
+class _UseSpan:
+    """Sets a context variable to a span for a ``with`` block."""
+
+    __slots__ = ("_var", "_span", "_token")
+
+    def __init__(self, var: "contextvars.ContextVar[Any]", span: Span):
+        self._var = var
+        self._span = span
+        self._token: Optional[contextvars.Token] = None
+
+    def __enter__(self) -> Span:
+        self._token = self._var.set(self._span)
+        return self._span
+
+    def __exit__(self, *exc_info: Any) -> None:
+        assert self._token is not None
+        self._var.reset(self._token)
+
+
+def metrics_attributes(metrics: Any) -> Dict[str, Any]:
+    """Return span attributes for a RequestMetrics: ``ollama.<field>`` for each reported field."""
+    if metrics is None:
+        return {}
+    return {
+        f"ollama.{field}": value for field, value in metrics._asdict().items()
+        if value is not None and field not in ("operation", "model")
+    }
+
+
+def trace_stream(chunks: Iterator[Dict[str, Any]], span: Span) -> Iterator[Dict[str, Any]]:
+    """
+    Pass a stream through, ending its operation span when the stream ends.
+
+    Adds a "first_token" event when the first generated text arrives and
+    the final chunk's metrics as attributes.
+
+    Args:
+        chunks: Stream chunks, the final one carrying ``metrics``
+        span: The operation span, already started
+
+    Returns:
+        Iterator yielding the same chunks
+    """
+    waiting = True
+    try:
+        for chunk in chunks:
+            if waiting and chunk_text(chunk):
+                span.add_event("first_token")
+                waiting = False
+            if chunk.get("done"):
+                span.set_attributes(metrics_attributes(getattr(chunk, "metrics", None)))
+            yield chunk
+    except GeneratorExit:
+        span.set_attribute("ollama.stream.closed_early", True)
+        raise
+    except BaseException as e:
+        _record_failure(span, e)
+        raise
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+        span.end()
+
+
+async def atrace_stream(chunks: AsyncIterator[Dict[str, Any]], span: Span) -> AsyncIterator[Dict[str, Any]]:
+    """The async counterpart of ``trace_stream``."""
+    waiting = True
+    try:
+        async for chunk in chunks:
+            if waiting and chunk_text(chunk):
+                span.add_event("first_token")
+                waiting = False
+            if chunk.get("done"):
+                span.set_attributes(metrics_attributes(getattr(chunk, "metrics", None)))
+            yield chunk
+    except GeneratorExit:
+        span.set_attribute("ollama.stream.closed_early", True)
+        raise
+    except BaseException as e:
+        _record_failure(span, e)
+        raise
+    finally:
+        aclose = getattr(chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
+        span.end()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the asynchronous code path of OllamaClient.
+"""
+
+import os
+import sys
+import time
+import unittest
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ollama_forge.client import OllamaClient
+from benchmarks.stub_server import StubOllamaServer
+
+
+class TestAsyncConnectionPool(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the pooled async HTTP client."""
+
+    def setUp(self) -> None:
+        self.server = StubOllamaServer().start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    async def test_requests_reuse_one_connection(self) -> None:
+        """Sequential async calls share a single keep-alive connection."""
+        async with OllamaClient(base_url=self.server.url) as client:
+            for text in ("a", "b", "c", "d"):
+                result = await client.acreate_embedding("nomic-embed-text", text)
+                self.assertEqual(len(result["embeddings"]), 1)
+            pooled = client._async_client
+
+        self.assertEqual(self.server.request_counts["/api/embed"], 4)
+        self.assertEqual(self.server.connection_count, 1)
+        self.assertTrue(pooled.is_closed)
+
+    async def test_aclose_is_idempotent(self) -> None:
+        """Closing twice, or before first use, is harmless."""
+        client = OllamaClient(base_url=self.server.url)
+        await client.aclose()
+        await client.acreate_embedding("nomic-embed-text", "text")
+        await client.aclose()
+        await client.aclose()
+        self.assertIsNone(client._async_client)
+
+    async def test_pool_limits_are_configurable(self) -> None:
+        """Pool limits passed to the constructor reach the async client."""
+        client = OllamaClient(
+            base_url=self.server.url, max_connections=7, max_keepalive_connections=3
+        )
+        self.assertEqual(client.limits.max_connections, 7)
+        self.assertEqual(client.limits.max_keepalive_connections, 3)
+        await client.aclose()
+
+
+class TestAsyncStreaming(unittest.IsolatedAsyncioTestCase):
+    """Test cases for incremental async streaming."""
+
+    def setUp(self) -> None:
+        # Slow-drip server: 10 tokens, 50ms apart
+        self.server = StubOllamaServer(response_tokens=10, token_delay=0.05).start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    async def test_first_chunk_arrives_before_stream_ends(self) -> None:
+        """agenerate yields the first chunk before the server sends the last byte."""
+        async with OllamaClient(base_url=self.server.url) as client:
+            chunks = await client.agenerate("test-model", "hi", stream=True)
+            first_chunk_at = None
+            received = []
+            async for chunk in chunks:
+                if first_chunk_at is None:
+                    first_chunk_at = time.perf_counter()
+                received.append(chunk)
+
+        self.assertEqual(len(received), 11)
+        self.assertTrue(received[-1]["done"])
+        self.assertIsNotNone(self.server.last_stream_finished_at)
+        self.assertLess(first_chunk_at, self.server.last_stream_finished_at - 0.2)
+
+    async def test_early_stop_releases_connection(self) -> None:
+        """Closing the iterator early closes the response and frees the pool."""
+        async with OllamaClient(base_url=self.server.url) as client:
+            chunks = await client.achat(
+                "test-model", [{"role": "user", "content": "hi"}], stream=True
+            )
+            first = await chunks.__anext__()
+            await chunks.aclose()
+            self.assertEqual(first["message"]["content"], "tok0 ")
+
+            # The pool still serves new requests
+            result = await client.agenerate("test-model", "hi", stream=False)
+            self.assertIn("response", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for the AsyncOllamaClient class.
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ollama_forge import AsyncOllamaClient
+from ollama_forge.async_client import gather_with_concurrency
+from ollama_forge.exceptions import ModelNotFoundError
+from benchmarks.stub_server import StubOllamaServer
+
+
+class TestAsyncOllamaClient(unittest.IsolatedAsyncioTestCase):
+    """Test cases for endpoint coverage of the async client."""
+
+    def setUp(self) -> None:
+        self.server = StubOllamaServer(response_tokens=3).start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    async def asyncSetUp(self) -> None:
+        self.client = AsyncOllamaClient(base_url=self.server.url)
+
+    async def asyncTearDown(self) -> None:
+        await self.client.aclose()
+
+    async def test_get_version(self) -> None:
+        self.assertEqual((await self.client.get_version())["version"], "0.0.0-stub")
+
+    async def test_model_lifecycle(self) -> None:
+        """pull, copy, create, list, push and delete all reach the server."""
+        self.assertEqual((await self.client.pull_model("new-model", stream=False))["status"], "success")
+        await self.client.copy_model("new-model", "copied-model")
+        updates = [u async for u in await self.client.create_model("made", "FROM new-model")]
+        self.assertEqual(updates[-1]["status"], "success")
+
+        names = {m["name"] for m in (await self.client.list_models())["models"]}
+        self.assertTrue({"new-model", "copied-model", "made"} <= names)
+
+        pushed = [u async for u in await self.client.push_model("made")]
+        self.assertEqual(pushed[-1]["status"], "success")
+        self.assertTrue(await self.client.delete_model("made"))
+        with self.assertRaises(ModelNotFoundError):
+            await self.client.delete_model("made")
+
+    async def test_generate_and_chat(self) -> None:
+        result = await self.client.generate("test-model", "hi")
+        self.assertEqual(result["response"], "tok0 tok1 tok2 ")
+        chunks = [c async for c in await self.client.chat(
+            "test-model", [{"role": "user", "content": "hi"}], stream=True
+        )]
+        self.assertEqual(len(chunks), 4)
+
+    async def test_batch_embeddings_order(self) -> None:
+        prompts = [f"text {i}" for i in range(10)]
+        results = await self.client.batch_embeddings("nomic-embed-text", prompts, batch_size=3)
+        single = await self.client.create_embedding("nomic-embed-text", "text 7")
+        self.assertEqual(self.server.request_counts["/api/embed"], 5)
+        self.assertEqual(results[7]["embedding"], single["embeddings"][0])
+
+    async def test_gather_shares_pool(self) -> None:
+        """Many concurrent requests run over a bounded number of connections."""
+        results = await self.client.gather(
+            *(self.client.generate("test-model", str(i)) for i in range(50)), limit=5
+        )
+        self.assertEqual(len(results), 50)
+        self.assertLessEqual(self.server.connection_count, 5)
+
+
+class TestGatherWithConcurrency(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the bounded gather helper."""
+
+    async def test_limit_and_order(self) -> None:
+        running = 0
+        peak = 0
+
+        async def job(i: int) -> int:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return i
+
+        results = await gather_with_concurrency(3, *(job(i) for i in range(10)))
+        self.assertEqual(results, list(range(10)))
+        self.assertEqual(peak, 3)
+
+    async def test_return_exceptions(self) -> None:
+        async def fail() -> None:
+            raise ValueError("boom")
+
+        results = await gather_with_concurrency(2, fail(), asyncio.sleep(0, 1), return_exceptions=True)
+        self.assertIsInstance(results[0], ValueError)
+        self.assertEqual(results[1], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
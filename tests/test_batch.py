@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for JSONL batch processing and the ``batch`` CLI command.
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ollama_forge.batch import _windowed, completed_indices, parse_record, read_records
+from ollama_forge.cli import main
+from benchmarks.stub_server import StubOllamaServer
+
+MODEL = "test-model"
+
+
+class TestRecords(unittest.TestCase):
+    """Test cases for parsing input lines."""
+
+    def test_objects_and_plain_text(self) -> None:
+        record = parse_record(0, b'{"id": 7, "prompt": "hi", "model": "m", "system": "s"}', "generate")
+        self.assertEqual((record.id, record.model, record.payload), (7, "m", "hi"))
+        self.assertEqual(record.options, {"system": "s"})
+        self.assertEqual(parse_record(1, b"just text", "embed").payload, "just text")
+        chat = parse_record(2, b'{"message": "hi", "system": "be brief"}', "chat")
+        self.assertEqual([m["role"] for m in chat.payload], ["system", "user"])
+        self.assertEqual(chat.options, {})
+
+    def test_malformed_lines_become_errors(self) -> None:
+        records = list(read_records([b'{"prompt": "a"}\n', b"\n", b'{"other": 1}\n', b"b\n"], "generate"))
+        self.assertEqual([index for index, _ in records], [0, 1, 2])
+        self.assertIsInstance(records[1][1], ValueError)
+        skipped = list(read_records([b"a\n", b"b\n", b"c\n"], "generate", skip={0, 2}))
+        self.assertEqual([index for index, _ in skipped], [1])
+
+    def test_window_bounds_input_read_ahead(self) -> None:
+        consumed = []
+
+        def items():
+            for i in range(100):
+                consumed.append(i)
+                yield i
+
+        results = _windowed(lambda x: x * 2, items(), concurrency=2, ordered=True)
+        self.assertEqual([next(results) for _ in range(3)], [0, 2, 4])
+        self.assertLessEqual(len(consumed), 8)
+        self.assertEqual(list(results), [i * 2 for i in range(3, 100)])
+        unordered = _windowed(lambda x: x, iter(range(50)), concurrency=4, ordered=False)
+        self.assertEqual(sorted(unordered), list(range(50)))
+
+
+class TestBatchCommand(unittest.TestCase):
+    """Test cases for ``ollama-forge batch``."""
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.input = os.path.join(self.dir.name, "prompts.jsonl")
+        self.output = os.path.join(self.dir.name, "results.jsonl")
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def _run(self, url: str, *args: str) -> int:
+        with redirect_stderr(io.StringIO()) as summary:
+            code = main(["--api-url", url, "batch", *args, "-m", MODEL,
+                         "--input", self.input, "--output", self.output])
+        self.summary = summary.getvalue()
+        return code
+
+    def _results(self):
+        with open(self.output) as f:
+            return [json.loads(line) for line in f]
+
+    def test_generate_in_input_order(self) -> None:
+        with open(self.input, "w") as f:
+            f.writelines(json.dumps({"id": f"p{i}", "prompt": f"prompt {i}"}) + "\n" for i in range(12))
+        with StubOllamaServer(latency=0.005, response_tokens=3) as server:
+            self.assertEqual(self._run(server.url, "generate", "--concurrency", "4"), 0)
+            self.assertEqual(server.request_counts["/api/generate"], 12)
+        results = self._results()
+        self.assertEqual([r["id"] for r in results], [f"p{i}" for i in range(12)])
+        self.assertTrue(all(r["response"] and r["metrics"]["completion_tokens"] == 3 for r in results))
+        self.assertIn("12 succeeded, 0 failed", self.summary)
+        self.assertIn("latency p50", self.summary)
+
+    def test_resume_skips_completed_and_retries_failures(self) -> None:
+        with open(self.input, "w") as f:
+            f.write("one\ntwo\nthree\nfour\n")
+        with open(self.output, "w") as f:
+            f.write(json.dumps({"index": 0, "model": MODEL, "message": {}}) + "\n")
+            f.write(json.dumps({"index": 1, "error": "boom", "error_type": "ServerError"}) + "\n")
+            f.write('{"index": 2, "model": "te')  # Interrupted mid-write
+        with StubOllamaServer() as server:
+            self.assertEqual(self._run(server.url, "chat", "--resume", "--order", "completion"), 0)
+            self.assertEqual(server.request_counts["/api/chat"], 3)
+        results = self._results()
+        self.assertEqual(sorted(r["index"] for r in results), [0, 1, 2, 3])
+        self.assertFalse(any("error" in r for r in results))
+        self.assertIn("1 skipped", self.summary)
+        self.assertEqual(completed_indices(self.output), {0, 1, 2, 3})
+
+    def test_embed_sends_input(self) -> None:
+        with open(self.input, "w") as f:
+            f.write('{"id": "a", "text": "first"}\nsecond\n')
+        with StubOllamaServer() as server:
+            self.assertEqual(self._run(server.url, "embed"), 0)
+            payloads = [data for path, data in server.recent_requests if path == "/api/embed"]
+        self.assertEqual(sorted(data["input"] for data in payloads), ["first", "second"])
+        self.assertFalse(any("prompt" in data for data in payloads))
+        results = self._results()
+        self.assertTrue(all(len(r["embedding"]) == server.embedding_dim for r in results))
+
+    def test_failures_are_recorded(self) -> None:
+        with open(self.input, "w") as f:
+            f.write("a\nb\n")
+        with StubOllamaServer() as server:
+            server.fail_next(10, status=400)
+            self.assertEqual(self._run(server.url, "embed"), 2)
+        results = self._results()
+        self.assertEqual([r["error_type"] for r in results], ["InvalidRequestError"] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
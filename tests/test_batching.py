@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Tests for batched request helpers on OllamaClient.
+"""
+
+import os
+import sys
+import unittest
+from typing import Any, Dict, List
+from unittest.mock import Mock, patch
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ollama_forge.async_client import AsyncOllamaClient
+from ollama_forge.client import OllamaClient, _pack_batches
+from ollama_forge.exceptions import ModelNotFoundError, OllamaAPIError
+from benchmarks.stub_server import StubOllamaServer
+
+
+def _embed_response(data: Dict[str, Any]) -> Mock:
+    """Build a mock /api/embed response echoing the input lengths."""
+    response = Mock()
+    response.json.return_value = {
+        "embeddings": [[float(len(text)), 1.0] for text in data["input"]]
+    }
+    return response
+
+
+class TestBatchEmbeddings(unittest.TestCase):
+    """Test cases for packing and scattering batched embeddings."""
+
+    def setUp(self) -> None:
+        self.client = OllamaClient()
+
+    def test_pack_batches_respects_item_limit(self) -> None:
+        """Batches never exceed the configured number of items."""
+        batches = _pack_batches(["a"] * 10, max_items=4, max_tokens=1000)
+        self.assertEqual([len(b) for b in batches], [4, 4, 2])
+        self.assertEqual(sum(batches, []), list(range(10)))
+
+    def test_pack_batches_respects_token_limit(self) -> None:
+        """Long texts start a new batch, oversized texts get their own."""
+        texts = ["x" * 40, "x" * 40, "x" * 400, "x"]
+        batches = _pack_batches(texts, max_items=100, max_tokens=30)
+        self.assertEqual(batches, [[0, 1], [2], [3]])
+
+    def test_batch_embeddings_single_request_per_batch(self) -> None:
+        """Each batch is one request and results keep the input order."""
+        prompts = ["one", "three", "fifteen", "a", "bb"]
+        calls: List[Dict[str, Any]] = []
+
+        def side_effect(method: str, endpoint: str, data: Any = None, **kwargs: Any) -> Mock:
+            calls.append(data)
+            return _embed_response(data)
+
+        with patch.object(self.client, "_with_retry", side_effect=side_effect):
+            results = self.client.batch_embeddings("nomic-embed-text", prompts, batch_size=2)
+
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(calls[0]["input"], ["one", "three"])
+        self.assertEqual(
+            [r["embedding"][0] for r in results], [float(len(p)) for p in prompts]
+        )
+
+    def test_batch_embeddings_count_mismatch(self) -> None:
+        """A short embeddings list from the server is reported as an error."""
+        response = Mock()
+        response.json.return_value = {"embeddings": [[0.1]]}
+        with patch.object(self.client, "_with_retry", return_value=response):
+            with self.assertRaises(OllamaAPIError):
+                self.client.batch_embeddings("nomic-embed-text", ["a", "b"])
+
+    def test_batch_embeddings_empty(self) -> None:
+        """No prompts means no requests."""
+        with patch.object(self.client, "_with_retry") as mock_retry:
+            self.assertEqual(self.client.batch_embeddings("nomic-embed-text", []), [])
+        mock_retry.assert_not_called()
+
+
+class TestBatchGenerate(unittest.TestCase):
+    """Test cases for thread-pooled batch_generate / batch_chat."""
+
+    def setUp(self) -> None:
+        self.client = OllamaClient()
+
+    def _fake_generate(self, model: str, prompt: str, options: Any = None, stream: bool = False) -> Dict[str, Any]:
+        if prompt == "bad":
+            raise ModelNotFoundError("missing")
+        return {"response": prompt.upper()}
+
+    def test_batch_generate_ordered_with_errors(self) -> None:
+        """Results keep input order and failures don't abort the batch."""
+        prompts = ["a", "bad", "c", "d"]
+        with patch.object(self.client, "generate", side_effect=self._fake_generate):
+            results = self.client.batch_generate("test-model", prompts, max_workers=3)
+
+        self.assertEqual([r.index for r in results], [0, 1, 2, 3])
+        self.assertEqual(results[0].result, {"response": "A"})
+        self.assertFalse(results[1].ok)
+        self.assertIsInstance(results[1].error, ModelNotFoundError)
+        self.assertTrue(results[3].ok)
+
+    def test_batch_generate_as_completed(self) -> None:
+        """as_completed yields every item exactly once."""
+        with patch.object(self.client, "generate", side_effect=self._fake_generate):
+            results = list(self.client.batch_generate(
+                "test-model", ["x", "y", "z"], as_completed=True
+            ))
+        self.assertEqual(sorted(r.index for r in results), [0, 1, 2])
+
+    def test_batch_chat_against_stub(self) -> None:
+        """batch_chat runs real requests through the shared session."""
+        conversations = [[{"role": "user", "content": str(i)}] for i in range(6)]
+        with StubOllamaServer(response_tokens=2) as server:
+            client = OllamaClient(base_url=server.url)
+            results = client.batch_chat("test-model", conversations, max_workers=3)
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual(results[5].result["message"]["content"], "tok0 tok1 ")
+        self.assertEqual(server.request_counts["/api/chat"], 6)
+
+
+class TestAsyncBatchGenerate(unittest.IsolatedAsyncioTestCase):
+    """Test cases for semaphore-bounded async batches."""
+
+    def setUp(self) -> None:
+        self.server = StubOllamaServer(response_tokens=2).start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    async def test_async_batch_generate(self) -> None:
+        async with AsyncOllamaClient(base_url=self.server.url) as client:
+            results = await client.batch_generate("test-model", ["a", "b", "c"], concurrency=2)
+            streamed = [r async for r in await client.batch_chat(
+                "test-model", [[{"role": "user", "content": "hi"}]] * 4, as_completed=True
+            )]
+        self.assertEqual([r.index for r in results], [0, 1, 2])
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual(sorted(r.index for r in streamed), [0, 1, 2, 3])
+
+    async def test_async_batch_reports_errors(self) -> None:
+        async with AsyncOllamaClient(base_url=self.server.url, max_retries=0) as client:
+            with patch.object(client._transport, "base_url", self.server.url + "/missing"):
+                results = await client.batch_generate("test-model", ["a", "b"])
+        self.assertTrue(all(isinstance(r.error, OllamaAPIError) for r in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
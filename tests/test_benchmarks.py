@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the benchmark stub server options and the benchmark suite runner.
+"""
+
+import os
+import sys
+import unittest
+
+import requests
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ollama_forge.client import OllamaClient
+from ollama_forge.exceptions import ServerError
+from ollama_forge.retry import RetryPolicy
+from benchmarks.stub_server import StubOllamaServer
+from benchmarks.suite import BENCHMARKS, compare, higher_is_better
+
+MODEL = "test-model"
+
+
+class TestStubOptions(unittest.TestCase):
+    """Test cases for stream shaping and failure injection in the stub."""
+
+    def test_chunking_and_token_rate(self) -> None:
+        with StubOllamaServer(response_tokens=10, chunk_tokens=4, token_rate=1000.0) as server:
+            client = OllamaClient(base_url=server.url)
+            chunks = list(client.generate(MODEL, "hi", stream=True))
+        self.assertEqual([c["response"].count("tok") for c in chunks[:-1]], [4, 4, 2])
+        self.assertAlmostEqual(server.chunk_delay, 0.004)
+        self.assertAlmostEqual(chunks[-1].metrics.tokens_per_sec, 1000.0, places=0)
+
+    def test_failure_injection(self) -> None:
+        with StubOllamaServer(failure_rate=0.5, seed=7) as server:
+            client = OllamaClient(base_url=server.url, retry_policy=RetryPolicy(max_retries=0))
+            outcomes = []
+            for _ in range(20):
+                try:
+                    client.generate(MODEL, "hi")
+                    outcomes.append(True)
+                except ServerError:
+                    outcomes.append(False)
+            client.list_models()  # Only inference endpoints fail
+        self.assertIn(True, outcomes)
+        self.assertIn(False, outcomes)
+
+        with StubOllamaServer(failure_rate=0.5, seed=7) as server:
+            client = OllamaClient(base_url=server.url, retry_policy=RetryPolicy(max_retries=0))
+            repeated = []
+            for _ in range(20):
+                try:
+                    client.generate(MODEL, "hi")
+                    repeated.append(True)
+                except ServerError:
+                    repeated.append(False)
+        self.assertEqual(outcomes, repeated)  # Seeded, so reproducible
+
+    def test_fail_next(self) -> None:
+        with StubOllamaServer() as server:
+            server.fail_next(2, status=500)
+            client = OllamaClient(base_url=server.url,
+                                  retry_policy=RetryPolicy(max_retries=2, base_delay=0.001, max_delay=0.002))
+            self.assertTrue(client.generate(MODEL, "hi")["done"])
+            self.assertEqual(server.request_counts["/api/generate"], 3)
+
+    def test_embed_reads_only_input(self) -> None:
+        with StubOllamaServer() as server:
+            session = requests.Session()
+            self.addCleanup(session.close)
+            embed = f"{server.url}/api/embed"
+            response = session.post(embed, json={"model": MODEL, "input": ["a", "b"]})
+            self.assertEqual(len(response.json()["embeddings"]), 2)
+            self.assertEqual(session.post(embed, json={"model": MODEL, "prompt": "a"}).json()["embeddings"], [])
+            self.assertEqual(session.post(embed, json={"model": MODEL, "input": 1}).status_code, 400)
+
+
+class TestSuite(unittest.TestCase):
+    """Test cases for the suite runner."""
+
+    def test_benchmarks_report_metrics(self) -> None:
+        results = BENCHMARKS["stream_decode"]({"stream_tokens": 50})
+        self.assertGreater(results["tokens_per_sec"], 0)
+        results = BENCHMARKS["concurrency"]({"concurrency_requests": 2, "concurrency_levels": (1, 2)})
+        self.assertIn("async_scaling_c2", results)
+
+    def test_compare_flags_regressions_by_direction(self) -> None:
+        baseline = {"results": {"b": {"tokens_per_sec": 100.0, "client_us_per_request": 100.0}}}
+        current = {"results": {"b": {"tokens_per_sec": 80.0, "client_us_per_request": 80.0}}}
+        rows = {row["metric"]: row for row in compare(current, baseline, threshold=0.1)}
+        self.assertTrue(rows["tokens_per_sec"]["regression"])
+        self.assertFalse(rows["client_us_per_request"]["regression"])
+        self.assertAlmostEqual(rows["client_us_per_request"]["change"], 0.2)
+        self.assertFalse(higher_is_better("overhead_us_per_request"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-server and per-model circuit breaker.
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import time
+import unittest
+from unittest.mock import MagicMock
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ollama_forge.breaker import CircuitBreaker
+from ollama_forge.client import OllamaClient
+from ollama_forge.exceptions import (
+    CircuitOpenError, ConnectionError, InvalidRequestError, ServerError
+)
+from ollama_forge.retry import RetryPolicy
+
+HOST = "http://ollama.test"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _fail(breaker: CircuitBreaker, error: BaseException, model: str = None) -> None:
+    breaker.before(HOST, model).record(error)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for circuit state transitions."""
+
+    def test_opens_after_consecutive_failures(self) -> None:
+        breaker = CircuitBreaker(failure_threshold=3)
+        _fail(breaker, ConnectionError("down"))
+        _fail(breaker, ConnectionError("down"))
+        breaker.before(HOST).record()  # A success resets the count
+        for _ in range(3):
+            _fail(breaker, ConnectionError("down"))
+        self.assertEqual(breaker.state(HOST), "open")
+        with self.assertRaises(CircuitOpenError):
+            breaker.before(HOST, "llama3")
+
+        stats = breaker.stats()[f"host:{HOST}"]
+        self.assertEqual(stats["failures"], 5)
+        self.assertEqual(stats["rejected"], 1)
+        self.assertEqual(stats["times_opened"], 1)
+
+    def test_half_open_trials(self) -> None:
+        breaker = CircuitBreaker(failure_threshold=1, recovery_time=0.05, half_open_calls=1)
+        _fail(breaker, ConnectionError("down"))
+        time.sleep(0.06)
+        self.assertEqual(breaker.state(HOST), "half_open")
+        trial = breaker.before(HOST)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before(HOST)  # Only one trial at a time
+        trial.record(ConnectionError("still down"))
+        self.assertEqual(breaker.state(HOST), "open")
+
+        time.sleep(0.06)
+        breaker.before(HOST).record()
+        self.assertEqual(breaker.state(HOST), "closed")
+
+    def test_model_failures_leave_other_models_alone(self) -> None:
+        breaker = CircuitBreaker(failure_threshold=2)
+        _fail(breaker, ServerError("failed to load model"), "big")
+        _fail(breaker, ServerError("failed to load model"), "big:latest")
+        self.assertEqual(breaker.state(HOST, "big"), "open")
+        self.assertEqual(breaker.state(HOST), "closed")
+        breaker.before(HOST, "small").record()
+        with self.assertRaises(CircuitOpenError) as raised:
+            breaker.before(HOST, "big")
+        self.assertEqual(raised.exception.response["model"], "big")
+
+    def test_client_errors_do_not_count(self) -> None:
+        breaker = CircuitBreaker(failure_threshold=1)
+        _fail(breaker, InvalidRequestError("bad"), "m")
+        _fail(breaker, ValueError("client bug"), "m")
+        self.assertEqual(breaker.state(HOST, "m"), "closed")
+
+
+class TestClientBreaker(unittest.TestCase):
+    """Test cases for the breaker inside OllamaClient."""
+
+    def test_unreachable_server_fails_fast(self) -> None:
+        client = OllamaClient(
+            base_url=f"http://127.0.0.1:{_free_port()}",
+            retry_policy=RetryPolicy(max_retries=0),
+            circuit_breaker=CircuitBreaker(failure_threshold=2),
+        )
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                client.list_models()
+        with self.assertRaises(CircuitOpenError):
+            client.generate("test-model", "hi")
+
+    def test_open_model_circuit_goes_straight_to_fallback(self) -> None:
+        client = OllamaClient(
+            base_url=HOST,
+            retry_policy=RetryPolicy(max_retries=0),
+            circuit_breaker=CircuitBreaker(failure_threshold=1),
+        )
+        failure = MagicMock(status_code=500, text='{"error": "failed to load model"}', headers={})
+        client.session = MagicMock()
+        client.session.request.return_value = failure
+        with self.assertRaises(ServerError):
+            client.chat("broken-model", [{"role": "user", "content": "hi"}])
+
+        with client.fallback_context("chat"):
+            client.chat("broken-model", [{"role": "user", "content": "hi"}])
+        self.assertIsNotNone(client.get_fallback_info()["model"])
+        self.assertIsInstance(client.get_fallback_info()["original_error"], CircuitOpenError)
+        self.assertEqual(client.session.request.call_count, 1)
+
+    def test_async_path(self) -> None:
+        client = OllamaClient(
+            base_url=f"http://127.0.0.1:{_free_port()}",
+            retry_policy=RetryPolicy(max_retries=0),
+            circuit_breaker=True,
+        )
+        client.circuit_breaker.failure_threshold = 1
+
+        async def run() -> list:
+            async with client:
+                return [await _capture(client.agenerate("test-model", "hi")) for _ in range(2)]
+
+        errors = asyncio.run(run())
+        self.assertIsInstance(errors[0], ConnectionError)
+        self.assertIsInstance(errors[1], CircuitOpenError)
+
+
+async def _capture(awaitable) -> BaseException:
+    try:
+        await awaitable
+    except Exception as e:
+        return e
+    raise AssertionError("expected an exception")
+
+
+if __name__ == "__main__":
+    unittest.main()
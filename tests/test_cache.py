@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Tests for the embedding and response caches.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ollama_forge.cache import EmbeddingCache, ResponseCache, is_deterministic
+from ollama_forge.client import OllamaClient
+from benchmarks.stub_server import StubOllamaServer
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    """Test cases for EmbeddingCache storage and eviction."""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, "embeddings")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_key_depends_on_every_component(self) -> None:
+        base = EmbeddingCache.make_key("m", "d1", "text", {"a": 1})
+        self.assertEqual(base, EmbeddingCache.make_key("m", "d1", "text", {"a": 1}))
+        for other in (
+            EmbeddingCache.make_key("m2", "d1", "text", {"a": 1}),
+            EmbeddingCache.make_key("m", "d2", "text", {"a": 1}),
+            EmbeddingCache.make_key("m", "d1", "text!", {"a": 1}),
+            EmbeddingCache.make_key("m", "d1", "text", {"a": 2}),
+        ):
+            self.assertNotEqual(base, other)
+
+    def test_roundtrip_is_float32_binary(self) -> None:
+        cache = EmbeddingCache(self.directory)
+        cache.put("ab" * 32, [0.5, -1.25, 3.0])
+        self.assertEqual(cache.get("ab" * 32), [0.5, -1.25, 3.0])
+        self.assertIsNone(cache.get("cd" * 32))
+        self.assertEqual(os.path.getsize(cache._path("ab" * 32)), 12)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+
+    def test_lru_eviction_by_size(self) -> None:
+        """The least recently used entry is evicted once max_bytes is exceeded."""
+        cache = EmbeddingCache(self.directory, max_bytes=20)
+        cache.put("k1", [1.0, 1.0])
+        cache.put("k2", [2.0, 2.0])
+        cache.get("k1")
+        cache.put("k3", [3.0, 3.0])
+        self.assertIsNone(cache.get("k2"))
+        self.assertEqual(cache.get("k1"), [1.0, 1.0])
+        self.assertEqual(cache.stats()["bytes"], 16)
+
+    def test_index_survives_restart(self) -> None:
+        EmbeddingCache(self.directory).put("k1", [1.0])
+        reopened = EmbeddingCache(self.directory)
+        self.assertEqual(reopened.get("k1"), [1.0])
+        reopened.clear()
+        self.assertEqual(reopened.stats()["entries"], 0)
+
+
+class TestClientEmbeddingCache(unittest.TestCase):
+    """Test cases for transparent cache use by OllamaClient."""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = StubOllamaServer().start()
+        self.cache = EmbeddingCache(os.path.join(self.tmp.name, "embeddings"))
+        self.client = OllamaClient(base_url=self.server.url, embedding_cache=self.cache)
+
+    def tearDown(self) -> None:
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def test_batch_sends_only_misses(self) -> None:
+        first = self.client.batch_embeddings("nomic-embed-text", ["a", "b"])
+        second = self.client.batch_embeddings("nomic-embed-text", ["a", "c", "b"])
+
+        embed_requests = [d for p, d in self.server.recent_requests if p == "/api/embed"]
+        self.assertEqual(embed_requests[-1]["input"], ["c"])
+        self.assertEqual([r["embedding"] for r in second[::2]], [r["embedding"] for r in first])
+        self.assertEqual(self.cache.stats()["hits"], 2)
+
+    def test_create_embedding_uses_cache(self) -> None:
+        self.client.create_embedding("nomic-embed-text", "hello")
+        cached = self.client.create_embedding("nomic-embed-text", "hello")
+        self.assertEqual(self.server.request_counts["/api/embed"], 1)
+        self.assertEqual(len(cached["embeddings"][0]), self.server.embedding_dim)
+
+    def test_unknown_model_is_not_cached(self) -> None:
+        """Without a digest from /api/tags the result can't be keyed safely."""
+        self.client.create_embedding("not-installed", "hello")
+        self.client.create_embedding("not-installed", "hello")
+        self.assertEqual(self.server.request_counts["/api/embed"], 2)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for ResponseCache tiers and stream handling."""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache", "responses.sqlite3")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_deterministic_requests(self) -> None:
+        self.assertTrue(is_deterministic({"temperature": 0}))
+        self.assertTrue(is_deterministic({"options": {"seed": 7, "temperature": 0.8}}))
+        self.assertFalse(is_deterministic({"temperature": 0.7}))
+        self.assertFalse(is_deterministic({"options": {}}))
+
+    def test_key_ignores_stream_flag(self) -> None:
+        data = {"model": "m", "prompt": "p", "temperature": 0}
+        key = ResponseCache.make_key("/api/generate", dict(data, stream=True), "d")
+        self.assertEqual(key, ResponseCache.make_key("/api/generate", dict(data, stream=False), "d"))
+        self.assertNotEqual(key, ResponseCache.make_key("/api/generate", data, "d2"))
+        self.assertNotEqual(key, ResponseCache.make_key("/api/chat", data, "d"))
+
+    def test_memory_lru_and_disk_tier(self) -> None:
+        cache = ResponseCache(max_entries=1, path=self.path)
+        cache.put("a", {"response": "A"})
+        cache.put("b", {"response": "B"})
+        self.assertEqual(cache.stats()["entries"], 1)
+        self.assertEqual(cache.get("a"), {"response": "A"})  # promoted from SQLite
+        cache.close()
+
+        reopened = ResponseCache(path=self.path)
+        self.assertEqual(reopened.get("b"), {"response": "B"})
+        self.assertIsNone(reopened.get("c"))
+        self.assertEqual(reopened.stats()["hit_rate"], 0.5)
+        self.assertEqual(reopened.stats()["disk_entries"], 2)
+        reopened.close()
+
+    def test_hits_are_independent_copies(self) -> None:
+        cache = ResponseCache()
+        response = {"message": {"role": "assistant", "content": "hello"}, "done": True}
+        cache.put("a", response)
+        response["message"]["content"] = "changed by the caller"
+        hit = cache.get("a")
+        hit["message"]["content"] += " and by the first hit"
+        self.assertEqual(cache.get("a")["message"]["content"], "hello")
+
+    def test_memory_only_creates_no_files(self) -> None:
+        cache = ResponseCache()
+        cache.put("a", {"response": "A"})
+        self.assertEqual(cache.stats()["disk_entries"], 0)
+        self.assertFalse(os.path.exists(os.path.dirname(self.path)))
+
+    def test_record_and_replay_chat_stream(self) -> None:
+        cache = ResponseCache()
+        chunks = [
+            {"model": "m", "message": {"role": "assistant", "content": "Hi"}, "done": False},
+            {"model": "m", "message": {"role": "assistant", "content": " you"}, "done": False},
+            {"model": "m", "message": {"role": "assistant", "content": ""}, "done": True,
+             "eval_count": 2},
+        ]
+        self.assertEqual(list(cache.record("k", iter(chunks))), chunks)
+        stored = cache.get("k")
+        self.assertEqual(stored["message"]["content"], "Hi you")
+        replayed = list(ResponseCache.replay(stored))
+        self.assertEqual("".join(c["message"]["content"] for c in replayed), "Hi you")
+        self.assertTrue(replayed[-1]["done"])
+        self.assertEqual(replayed[-1]["eval_count"], 2)
+
+
+class TestClientResponseCache(unittest.TestCase):
+    """Test cases for response caching in OllamaClient."""
+
+    def setUp(self) -> None:
+        self.server = StubOllamaServer(response_tokens=4).start()
+        self.client = OllamaClient(base_url=self.server.url, response_cache=True)
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_deterministic_generate_is_served_from_cache(self) -> None:
+        options = {"temperature": 0}
+        first = self.client.generate("test-model", "hello", options=options)
+        second = self.client.generate("test-model", "hello", options=options)
+        streamed = list(self.client.generate("test-model", "hello", options=options, stream=True))
+        self.assertEqual(first, second)
+        self.assertEqual("".join(c["response"] for c in streamed), first["response"])
+        self.assertEqual(self.server.request_counts["/api/generate"], 1)
+        self.assertEqual(self.client.response_cache.stats()["hits"], 2)
+
+    def test_streamed_chat_fills_cache(self) -> None:
+        messages = [{"role": "user", "content": "hi"}]
+        options = {"options": {"seed": 42}}
+        streamed = list(self.client.chat("test-model", messages, options=options, stream=True))
+        cached = self.client.chat("test-model", messages, options=options)
+        self.assertEqual(cached["message"]["content"],
+                         "".join(c["message"]["content"] for c in streamed))
+        self.assertEqual(self.server.request_counts["/api/chat"], 1)
+
+    def test_sampled_requests_are_not_cached(self) -> None:
+        self.client.generate("test-model", "hello", options={"temperature": 0.8})
+        self.client.generate("test-model", "hello", options={"temperature": 0.8})
+        self.assertEqual(self.server.request_counts["/api/generate"], 2)
+        self.assertEqual(self.client.response_cache.stats()["hits"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the command-line interface.
+"""
+
+import argparse
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ollama_forge.cli import ChatContext, accumulate_reply, handle_chat_session, main
+from ollama_forge.client import OllamaClient
+from benchmarks.stub_server import StubOllamaServer
+
+
+class TestChatContext(unittest.TestCase):
+    """Test cases for history accumulation and the token budget."""
+
+    def test_accumulate_reply(self) -> None:
+        chunks = [
+            {"message": {"role": "assistant", "content": "Hel"}, "done": False},
+            {"message": {"role": "assistant", "content": "lo"}, "done": False},
+            {"message": {"role": "assistant", "content": ""}, "done": True, "eval_count": 2},
+        ]
+        shown = []
+        message, final_chunk = accumulate_reply(chunks, on_text=shown.append)
+        self.assertEqual(message, {"role": "assistant", "content": "Hello"})
+        self.assertEqual(shown, ["Hel", "lo"])
+        self.assertEqual(final_chunk["eval_count"], 2)
+
+    def test_server_counts_calibrate_budget(self) -> None:
+        context = ChatContext("sys", context_window=1000)
+        context.add_user("hi")
+        context.add_reply({"role": "assistant", "content": "hello"},
+                          {"prompt_eval_count": 30, "eval_count": 12})
+        self.assertEqual(context.used_tokens, 42)
+
+    def test_oldest_exchanges_trimmed(self) -> None:
+        context = ChatContext("sys", context_window=200, reserve_tokens=50)
+        for turn in range(5):
+            dropped = context.add_user(f"question {turn}")
+            context.add_reply({"role": "assistant", "content": "answer"},
+                              {"prompt_eval_count": context.used_tokens + 5, "eval_count": 40})
+        self.assertGreater(dropped, 0)
+        self.assertLessEqual(context.used_tokens, 200)
+        self.assertEqual(context.messages[0]["role"], "system")
+        self.assertEqual(context.messages[1]["role"], "user")
+        self.assertEqual(context.messages[-1]["content"], "answer")
+
+    def test_discard_user(self) -> None:
+        context = ChatContext("sys")
+        context.add_user("unanswered")
+        context.discard_user()
+        self.assertEqual(len(context.messages), 1)
+
+
+class TestChatSession(unittest.TestCase):
+    """Test cases for the interactive chat session."""
+
+    def test_one_inference_per_turn(self) -> None:
+        with StubOllamaServer(response_tokens=3) as server:
+            client = OllamaClient(base_url=server.url)
+            args = argparse.Namespace(model="test-model", system="Be brief.",
+                                      context_window=4096)
+            with patch("builtins.input", side_effect=["first", "second", "exit"]), \
+                    redirect_stdout(io.StringIO()):
+                self.assertEqual(handle_chat_session(args, client), 0)
+
+            self.assertEqual(server.request_counts["/api/chat"], 2)
+            path, data = server.recent_requests[-1]
+            roles = [message["role"] for message in data["messages"]]
+            self.assertEqual(roles, ["system", "user", "assistant", "user"])
+            self.assertTrue(data["messages"][2]["content"])
+            self.assertEqual(data["options"]["num_ctx"], 4096)
+
+    def test_main_uses_api_url(self) -> None:
+        with StubOllamaServer() as server:
+            output = io.StringIO()
+            with redirect_stdout(output):
+                self.assertEqual(main(["--api-url", server.url, "list"]), 0)
+        self.assertIn("test-model", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -153,10 +153,10 @@ class TestOllamaClient(unittest.TestCase):
         """Test generating text (streaming)."""
         # Setup mock response with properly configured attributes
         mock_response = Mock()
-        mock_response.iter_lines.return_value = [
-            json.dumps({"response": "Test"}).encode(),
-            json.dumps({"response": " streaming"}).encode(),
-            json.dumps({"response": " response"}).encode(),
+        mock_response.iter_content.return_value = [
+            json.dumps({"response": "Test"}).encode() + b"\n",
+            json.dumps({"response": " streaming"}).encode() + b"\n",
+            json.dumps({"response": " response"}).encode() + b"\n",
         ]
         mock_response.status_code = 200
         mock_response.text = "Test streaming response"
@@ -187,10 +187,10 @@ class TestOllamaClient(unittest.TestCase):
         """Test generating text (streaming) with alternative mocking approach."""
         # Setup mock response with properly configured attributes
         mock_response = Mock()
-        mock_response.iter_lines.return_value = [
-            json.dumps({"response": "Test"}).encode(),
-            json.dumps({"response": " streaming"}).encode(),
-            json.dumps({"response": " response"}).encode(),
+        mock_response.iter_content.return_value = [
+            json.dumps({"response": "Test"}).encode() + b"\n",
+            json.dumps({"response": " streaming"}).encode() + b"\n",
+            json.dumps({"response": " response"}).encode() + b"\n",
         ]
         mock_response.status_code = 200
         mock_response.text = "Test streaming response"
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for single-flight request coalescing.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ollama_forge.async_client import AsyncOllamaClient
+from ollama_forge.client import OllamaClient
+from ollama_forge.coalesce import AsyncSingleFlight, SingleFlight
+from benchmarks.stub_server import StubOllamaServer
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for thread coalescing."""
+
+    def test_concurrent_callers_share_one_call(self) -> None:
+        flight = SingleFlight()
+        started = threading.Event()
+        calls = []
+
+        def slow() -> str:
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            leader = pool.submit(flight.do, "k", slow)
+            started.wait()
+            followers = [pool.submit(flight.do, "k", slow) for _ in range(7)]
+            results = [leader.result()] + [f.result() for f in followers]
+
+        self.assertEqual(results, ["result"] * 8)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((flight.calls, flight.shared), (1, 7))
+        # Finished calls are not reused
+        flight.do("k", slow)
+        self.assertEqual(len(calls), 2)
+
+    def test_exception_reaches_every_caller(self) -> None:
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def failing() -> None:
+            started.set()
+            time.sleep(0.1)
+            raise ValueError("upstream failed")
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            leader = pool.submit(flight.do, "k", failing)
+            started.wait()
+            futures = [leader] + [pool.submit(flight.do, "k", failing) for _ in range(2)]
+            for future in futures:
+                with self.assertRaises(ValueError):
+                    future.result()
+        self.assertEqual(flight.calls, 1)
+
+
+class TestAsyncSingleFlight(unittest.IsolatedAsyncioTestCase):
+    """Test cases for task coalescing."""
+
+    async def test_tasks_share_one_call(self) -> None:
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def slow() -> int:
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 42
+
+        results = await asyncio.gather(*(flight.do("k", slow) for _ in range(10)))
+        self.assertEqual(results, [42] * 10)
+        self.assertEqual(len(calls), 1)
+
+    async def test_cancelled_waiter_does_not_cancel_others(self) -> None:
+        flight = AsyncSingleFlight()
+        upstream_cancelled = asyncio.Event()
+
+        async def slow() -> str:
+            try:
+                await asyncio.sleep(0.1)
+            except asyncio.CancelledError:
+                upstream_cancelled.set()
+                raise
+            return "done"
+
+        first = asyncio.create_task(flight.do("k", slow))
+        second = asyncio.create_task(flight.do("k", slow))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        self.assertEqual(await second, "done")
+        self.assertFalse(upstream_cancelled.is_set())
+
+        # With every waiter gone, the upstream call is cancelled too
+        only = asyncio.create_task(flight.do("k2", slow))
+        await asyncio.sleep(0.01)
+        only.cancel()
+        await asyncio.wait_for(upstream_cancelled.wait(), 1.0)
+
+
+class TestClientCoalescing(unittest.TestCase):
+    """Test cases for coalescing in the clients."""
+
+    def setUp(self) -> None:
+        self.server = StubOllamaServer(latency=0.2).start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_identical_embeddings_share_a_request(self) -> None:
+        client = OllamaClient(base_url=self.server.url)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(
+                lambda _: client.create_embedding("nomic-embed-text", "hot key"), range(8)
+            ))
+        self.assertEqual(self.server.request_counts["/api/embed"], 1)
+        self.assertTrue(all(result == results[0] for result in results))
+
+    def test_sampled_generate_is_not_coalesced(self) -> None:
+        client = OllamaClient(base_url=self.server.url)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda _: client.generate("test-model", "hi"), range(4)))
+        self.assertEqual(self.server.request_counts["/api/generate"], 4)
+
+    def test_coalescing_can_be_disabled(self) -> None:
+        client = OllamaClient(base_url=self.server.url, coalesce_requests=False)
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            list(pool.map(lambda _: client.create_embedding("nomic-embed-text", "x"), range(3)))
+        self.assertEqual(self.server.request_counts["/api/embed"], 3)
+
+    def test_async_deterministic_chat(self) -> None:
+        messages = [{"role": "user", "content": "hi"}]
+
+        async def run() -> list:
+            async with AsyncOllamaClient(base_url=self.server.url) as client:
+                return await asyncio.gather(*(
+                    client.chat("test-model", messages, options={"temperature": 0})
+                    for _ in range(6)
+                ))
+
+        results = asyncio.run(run())
+        self.assertEqual(len({r["message"]["content"] for r in results}), 1)
+        self.assertEqual(self.server.request_counts["/api/chat"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
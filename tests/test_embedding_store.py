@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for the memory-mapped EmbeddingStore.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from helpers.embedding import top_k_similarities
+from helpers.embedding_store import EmbeddingStore
+from ollama_forge.client import OllamaClient
+from benchmarks.stub_server import StubOllamaServer
+
+
+class TestEmbeddingStore(unittest.TestCase):
+    """Test cases for the on-disk format and blocked search."""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "corpus.emb")
+        rng = np.random.default_rng(0)
+        self.vectors = rng.normal(size=(300, 16)).astype(np.float32)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_append_and_reopen(self) -> None:
+        store = EmbeddingStore.create(self.path, dim=16)
+        store.append([f"a{i}" for i in range(100)], self.vectors[:100])
+        store.append([f"b{i}" for i in range(200)], self.vectors[100:])
+
+        reopened = EmbeddingStore(self.path)
+        self.assertEqual(len(reopened), 300)
+        self.assertIsInstance(reopened.vectors, np.memmap)
+        self.assertEqual(reopened.vectors.shape, (300, 16))
+        self.assertEqual(reopened.ids[150], "b50")
+        self.assertAlmostEqual(float(np.linalg.norm(reopened.vectors[7])), 1.0, places=5)
+
+    def test_blocked_top_k_matches_full_scan(self) -> None:
+        store = EmbeddingStore.create(self.path, dim=16)
+        store.append(list(range(300)), self.vectors)
+        query = self.vectors[42].tolist()
+
+        in_memory = np.array(store.vectors)
+        expected = top_k_similarities(query, in_memory, k=7)
+        blocked = top_k_similarities(query, store.vectors, k=7, block_size=32)
+        self.assertEqual([i for i, _ in expected], [i for i, _ in blocked])
+        self.assertEqual(store.top_k(query, k=1, block_size=50)[0][0], 42)
+
+    def test_float16_storage(self) -> None:
+        store = EmbeddingStore.create(self.path, dim=16, dtype="float16")
+        store.append(list(range(300)), self.vectors)
+        self.assertEqual(os.path.getsize(self.path), 64 + 300 * 16 * 2)
+        self.assertEqual(store.top_k(self.vectors[9].tolist(), k=1)[0][0], 9)
+
+    def test_interrupted_append_is_ignored(self) -> None:
+        """Bytes past the committed header counts are not read back."""
+        store = EmbeddingStore.create(self.path, dim=16)
+        store.append(["kept"], self.vectors[:1])
+        with open(self.path + ".ids", "a") as f:
+            f.write('"partial"\n')
+        reopened = EmbeddingStore(self.path)
+        self.assertEqual(reopened.ids, ["kept"])
+        reopened.append(["next"], self.vectors[1:2])
+        self.assertEqual(EmbeddingStore(self.path).ids, ["kept", "next"])
+
+    def test_batch_embeddings_appends_to_store(self) -> None:
+        with StubOllamaServer() as server:
+            client = OllamaClient(base_url=server.url)
+            store = EmbeddingStore.create(self.path, dim=server.embedding_dim)
+            client.batch_embeddings("nomic-embed-text", ["x", "y"], store=store)
+            client.batch_embeddings("nomic-embed-text", ["z"], store=store, store_ids=["zed"])
+        self.assertEqual(EmbeddingStore(self.path).ids, [0, 1, "zed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
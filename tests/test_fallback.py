@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for transparent model fallback.
+"""
+
+import asyncio
+import os
+import sys
+import time
+import unittest
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ollama_forge.async_client import AsyncOllamaClient
+from ollama_forge.client import OllamaClient
+from ollama_forge.exceptions import ModelNotFoundError
+from ollama_forge.fallback import UNAVAILABLE_MODELS, UnavailableModels, fallback_chain
+from ollama_forge.retry import RetryPolicy
+from benchmarks.stub_server import StubOllamaServer
+
+MISSING = "llama3.2"
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+class TestFallbackChain(unittest.TestCase):
+    """Test cases for chains and the unavailable-model memory."""
+
+    def test_chain_starts_with_requested_model_and_has_no_repeats(self) -> None:
+        chain = fallback_chain(MISSING, "chat")
+        self.assertEqual(chain[0], MISSING)
+        self.assertGreater(len(chain), 1)
+        self.assertEqual(len({m.lower() for m in chain}), len(chain))
+        self.assertEqual(fallback_chain(MISSING, "chat", depth=0), [MISSING])
+
+    def test_unavailable_models_expire(self) -> None:
+        models = UnavailableModels(ttl=0.05)
+        models.mark("http://a", "big")
+        self.assertTrue(models.is_unavailable("http://a", "big:latest"))
+        self.assertFalse(models.is_unavailable("http://b", "big"))
+        time.sleep(0.06)
+        self.assertFalse(models.is_unavailable("http://a", "big"))
+
+
+class TestClientFallback(unittest.TestCase):
+    """Test cases for fallback=True against a stub server."""
+
+    def setUp(self) -> None:
+        self.fallback = fallback_chain(MISSING, "chat")[1]
+        self.server = StubOllamaServer(strict_models=True, models=[self.fallback, "nomic-embed-text"]).start()
+        self.client = OllamaClient(base_url=self.server.url, retry_policy=RetryPolicy(max_retries=0))
+        UNAVAILABLE_MODELS.forget()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+        UNAVAILABLE_MODELS.forget()
+
+    def test_falls_back_and_remembers_missing_model(self) -> None:
+        result = self.client.chat(MISSING, MESSAGES, fallback=True)
+        self.assertEqual(result["model"], self.fallback)
+        self.assertEqual(self.server.request_counts["/api/chat"], 2)
+
+        # The missing model is skipped without a failed request
+        self.client.chat(MISSING, MESSAGES, fallback=True)
+        self.assertEqual(self.server.request_counts["/api/chat"], 3)
+
+    def test_streaming_falls_back(self) -> None:
+        chunks = list(self.client.generate(MISSING, "hi", stream=True, fallback=True))
+        self.assertTrue(chunks[-1]["done"])
+        self.assertNotEqual(chunks[-1]["model"], MISSING)
+
+    def test_without_fallback_the_error_names_the_model(self) -> None:
+        with self.assertRaises(ModelNotFoundError) as raised:
+            self.client.chat(MISSING, MESSAGES)
+        self.assertEqual(raised.exception.response["model"], MISSING)
+
+        with self.client.fallback_context("chat"):
+            self.client.chat(MISSING, MESSAGES)
+        self.assertEqual(self.client.get_fallback_info()["model"], self.fallback)
+
+    def test_async_fallback(self) -> None:
+        async def run() -> tuple:
+            async with AsyncOllamaClient(base_url=self.server.url, max_retries=0) as client:
+                first, second = await asyncio.gather(
+                    client.chat(MISSING, MESSAGES, fallback=True),
+                    self.client.achat(MISSING, MESSAGES, fallback=True),
+                )
+                await self.client.aclose()
+                return first, second
+
+        first, second = asyncio.run(run())
+        self.assertEqual(first["model"], self.fallback)
+        self.assertEqual(second["model"], self.fallback)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests that importing the package and its CLI stays cheap.
+
+Each check runs in a fresh interpreter with ``python -X importtime``, so
+modules already imported by the test run don't hide the cost.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Cumulative import time budgets in microseconds, generous enough for slow CI
+# machines while still catching an eagerly imported heavy dependency
+IMPORT_BUDGET_US = {
+    "ollama_forge": 250_000,
+    "ollama_forge.cli": 250_000,
+}
+
+# Dependencies that must only be imported when their feature is used
+LAZY_MODULES = ("httpx", "tqdm", "numpy", "aiohttp")
+
+
+def _import_profile(module: str, **env_overrides: str):
+    """Import ``module`` in a fresh interpreter; return its cumulative time and the modules loaded."""
+    code = f"import sys, {module}; print(','.join(sorted(sys.modules)))"
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    env.update(env_overrides)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=ROOT, env=env, check=True,
+    )
+    cumulative = None
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split("|")
+        if line.startswith("import time:") and len(fields) == 3 and fields[2].strip() == module:
+            cumulative = int(fields[1])
+    return cumulative, set(result.stdout.strip().split(","))
+
+
+class TestImportTime(unittest.TestCase):
+    """Test cases for import cost."""
+
+    def test_import_within_budget(self) -> None:
+        for module, budget in IMPORT_BUDGET_US.items():
+            with self.subTest(module=module):
+                cumulative, _ = _import_profile(module)
+                self.assertIsNotNone(cumulative)
+                self.assertLess(cumulative, budget, f"import {module} took {cumulative / 1000:.0f}ms")
+
+    def test_heavy_dependencies_are_lazy(self) -> None:
+        for module in IMPORT_BUDGET_US:
+            with self.subTest(module=module):
+                _, loaded = _import_profile(module)
+                self.assertEqual(sorted(loaded.intersection(LAZY_MODULES)), [])
+
+    def test_import_creates_no_directories(self) -> None:
+        with tempfile.TemporaryDirectory() as home:
+            _import_profile("ollama_forge", HOME=home)
+            self.assertEqual(os.listdir(home), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
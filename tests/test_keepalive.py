@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for model warm-up and keep-alive management.
+"""
+
+import os
+import sys
+import time
+import unittest
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ollama_forge.client import OllamaClient
+from ollama_forge.exceptions import ModelNotFoundError
+from ollama_forge.keepalive import ModelKeeper, parse_keep_alive
+from benchmarks.stub_server import StubOllamaServer
+
+MODEL = "test-model"
+
+
+class TestParseKeepAlive(unittest.TestCase):
+    """Test cases for keep_alive parsing."""
+
+    def test_durations(self) -> None:
+        self.assertEqual(parse_keep_alive("5m"), 300.0)
+        self.assertEqual(parse_keep_alive("1h30m"), 5400.0)
+        self.assertEqual(parse_keep_alive("250ms"), 0.25)
+        self.assertEqual(parse_keep_alive(90), 90.0)
+        self.assertEqual(parse_keep_alive("0"), 0.0)
+
+    def test_negative_is_indefinite(self) -> None:
+        self.assertIsNone(parse_keep_alive(-1))
+        self.assertIsNone(parse_keep_alive("-1m"))
+
+    def test_invalid(self) -> None:
+        for value in ("soon", "5x", "m5", ""):
+            with self.assertRaises(ValueError):
+                parse_keep_alive(value)
+
+
+class TestPreload(unittest.TestCase):
+    """Test cases for preload, unload and the keeper against a stub server."""
+
+    def setUp(self) -> None:
+        self.server = StubOllamaServer(load_delay=0.1, models=[MODEL, "nomic-embed-text"]).start()
+        self.client = OllamaClient(base_url=self.server.url)
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_preload_reports_load_duration(self) -> None:
+        durations = self.client.preload([MODEL, "nomic-embed-text"], keep_alive="10m")
+        self.assertAlmostEqual(durations[MODEL], 0.1, places=3)
+        self.assertEqual(sorted(self.server.loaded_models), sorted([MODEL, "nomic-embed-text"]))
+
+        # Already loaded: no load time, and the next request is warm
+        self.assertLess(self.client.preload(MODEL)[MODEL], 0.01)
+        start = time.perf_counter()
+        self.client.generate(MODEL, "hi")
+        self.assertLess(time.perf_counter() - start, 0.1)
+
+    def test_preload_missing_model(self) -> None:
+        with StubOllamaServer(models=[MODEL], strict_models=True) as server:
+            client = OllamaClient(base_url=server.url)
+            with self.assertRaises(ModelNotFoundError):
+                client.preload("missing-model")
+
+    def test_preload_embedding_only_model(self) -> None:
+        # An embedding-only model rejects generate with 400; preload loads it through /api/embed
+        with StubOllamaServer(load_delay=0.1, embedding_models=["nomic-embed-text"]) as server:
+            client = OllamaClient(base_url=server.url)
+            durations = client.preload("nomic-embed-text")
+            self.assertAlmostEqual(durations["nomic-embed-text"], 0.1, places=3)
+            self.assertEqual(server.request_counts["/api/generate"], 1)
+            self.assertEqual(server.request_counts["/api/embed"], 1)
+            self.assertEqual(server.loaded_models, ["nomic-embed-text"])
+
+    def test_unload(self) -> None:
+        self.client.preload(MODEL)
+        self.assertTrue(self.client.unload(MODEL))
+        self.assertNotIn(MODEL, self.server.loaded_models)
+
+    def test_keeper_rewarms_evicted_model(self) -> None:
+        warmed = []
+        keeper = self.client.keep_warm([MODEL], keep_alive="1s", interval=0.05,
+                                       on_warm=lambda model, duration: warmed.append(duration))
+        try:
+            deadline = time.monotonic() + 5
+            while not warmed and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.server.loaded_models.clear()  # The server evicts the model
+            while len(warmed) < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            keeper.stop()
+
+        stats = keeper.stats()[MODEL]
+        self.assertGreaterEqual(stats["warmups"], 3)
+        self.assertEqual(stats["cold_loads"], 0)  # 0.1s loads are under the threshold
+        # The first warm-up and the one after the eviction paid the load time
+        self.assertEqual(sum(1 for d in warmed if d >= 0.05), 2)
+        self.assertAlmostEqual(stats["max_load_duration"], 0.1, places=3)
+        self.assertIn(MODEL, self.server.loaded_models)
+
+    def test_default_interval_precedes_expiry(self) -> None:
+        self.assertEqual(ModelKeeper(self.client, [MODEL], keep_alive="10m").interval, 480.0)
+        self.assertEqual(ModelKeeper(self.client, [MODEL], keep_alive=-1).interval, 240.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Tests for per-request metrics and metrics sinks.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ollama_forge.async_client import AsyncOllamaClient
+from ollama_forge.cache import EmbeddingCache
+from ollama_forge.client import OllamaClient
+from ollama_forge.metrics import Histogram, MetricsRegistry, MetricsSink, RequestMetrics, request_metrics
+from ollama_forge.tracing import InMemoryTracer
+from benchmarks.stub_server import StubOllamaServer
+
+MODEL = "test-model"
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+class TestRequestMetrics(unittest.TestCase):
+    """Test cases for building metrics from Ollama timing fields."""
+
+    def test_server_timings(self) -> None:
+        metrics = request_metrics("generate", "m", {
+            "model": "m:latest", "total_duration": 3_000_000_000, "load_duration": 500_000_000,
+            "prompt_eval_count": 20, "prompt_eval_duration": 100_000_000,
+            "eval_count": 50, "eval_duration": 2_000_000_000,
+        }, wall_time=3.2)
+        self.assertEqual(metrics.model, "m:latest")
+        self.assertEqual(metrics.load_time, 0.5)
+        self.assertEqual(metrics.server_time, 3.0)
+        self.assertAlmostEqual(metrics.prompt_tokens_per_sec, 200.0)
+        self.assertAlmostEqual(metrics.tokens_per_sec, 25.0)
+        self.assertIsNone(metrics.ttft)
+
+    def test_missing_fields(self) -> None:
+        metrics = request_metrics("embedding", "m", {"embeddings": [[0.1]]}, wall_time=0.1)
+        self.assertEqual(metrics.model, "m")
+        self.assertIsNone(metrics.load_time)
+        self.assertIsNone(metrics.tokens_per_sec)
+
+
+class TestHistogram(unittest.TestCase):
+    """Test cases for histograms and the Prometheus export."""
+
+    def test_quantiles(self) -> None:
+        histogram = Histogram([1.0, 2.0, 4.0])
+        for value in (0.5, 1.5, 1.5, 3.0, 10.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative(), [(1.0, 1), (2.0, 3), (4.0, 4), (float("inf"), 5)])
+        self.assertAlmostEqual(histogram.quantile(0.5), 1.75)
+        self.assertEqual(histogram.quantile(0.99), 4.0)
+        self.assertIsNone(Histogram().quantile(0.5))
+
+    def test_prometheus_text(self) -> None:
+        registry = MetricsRegistry(latency_buckets=[0.1, 1.0])
+        registry.record(RequestMetrics("chat", 'odd"name', wall_time=0.5, completion_tokens=7))
+        text = registry.to_prometheus()
+        self.assertIn("# TYPE ollama_forge_request_duration_seconds histogram", text)
+        self.assertIn(
+            'ollama_forge_request_duration_seconds_bucket{operation="chat",model="odd\\"name",le="1"} 1', text
+        )
+        self.assertIn('le="+Inf"} 1', text)
+        self.assertIn('ollama_forge_tokens_total{operation="chat",model="odd\\"name",kind="completion"} 7', text)
+        self.assertNotIn("time_to_first_token", text)
+        self.assertEqual(MetricsRegistry().to_prometheus(), "")
+
+
+class TestClientMetrics(unittest.TestCase):
+    """Test cases for metrics on client results."""
+
+    def setUp(self) -> None:
+        self.server = StubOllamaServer(token_delay=0.01, response_tokens=5, models=[MODEL]).start()
+        self.received = []
+        self.client = OllamaClient(base_url=self.server.url, metrics_sink=self.received.append)
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_complete_response(self) -> None:
+        result = self.client.chat(MODEL, MESSAGES)
+        metrics = result.metrics
+        self.assertEqual(metrics.operation, "chat")
+        self.assertGreater(metrics.wall_time, 0)
+        self.assertEqual(metrics.completion_tokens, 5)
+        self.assertIsNotNone(metrics.tokens_per_sec)
+        self.assertEqual(self.received, [metrics])
+        self.assertNotIn("metrics", result)  # Still the plain response body
+        self.assertEqual(json.loads(json.dumps(result)), result)
+
+        self.assertEqual(self.client.create_embedding(MODEL, "hi").metrics.operation, "embedding")
+
+    def test_stream_timings(self) -> None:
+        chunks = list(self.client.generate(MODEL, "hi", stream=True))
+        self.assertFalse(hasattr(chunks[0], "metrics"))
+        metrics = chunks[-1].metrics
+        self.assertGreater(metrics.ttft, 0)
+        self.assertLessEqual(metrics.ttft, metrics.wall_time)
+        self.assertGreaterEqual(metrics.inter_token_latency, 0.005)
+        self.assertEqual(self.received, [metrics])
+
+    def test_response_cache_hits_are_measured(self) -> None:
+        tracer = InMemoryTracer()
+        client = OllamaClient(base_url=self.server.url, response_cache=True,
+                              metrics_sink=self.received.append, tracer=tracer)
+        options = {"temperature": 0}
+        first = client.generate(MODEL, "hi", options)
+        hit = client.generate(MODEL, "hi", options)
+        streamed = list(client.generate(MODEL, "hi", options, stream=True))
+        self.assertEqual(self.server.request_counts["/api/generate"], 1)
+        self.assertEqual(len(self.received), 3)
+        self.assertFalse(first.metrics.cache_hit)
+        for metrics in (hit.metrics, streamed[-1].metrics):
+            self.assertTrue(metrics.cache_hit)
+            self.assertGreater(metrics.wall_time, 0)
+            self.assertIsNone(metrics.completion_tokens)
+            self.assertIsNone(metrics.server_time)
+        spans = tracer.named("ollama.generate")
+        self.assertEqual([span.attributes["ollama.cache_hit"] for span in spans], [False, True, True])
+
+    def test_embedding_cache_hits_are_measured(self) -> None:
+        tracer = InMemoryTracer()
+        with tempfile.TemporaryDirectory() as directory:
+            client = OllamaClient(base_url=self.server.url, embedding_cache=EmbeddingCache(directory),
+                                  metrics_sink=self.received.append, tracer=tracer)
+            first = client.create_embedding(MODEL, "hello")
+            hit = client.create_embedding(MODEL, "hello")
+        self.assertEqual(self.server.request_counts["/api/embed"], 1)
+        self.assertEqual(hit["embeddings"], first["embeddings"])
+        self.assertEqual(self.received, [first.metrics, hit.metrics])
+        self.assertFalse(first.metrics.cache_hit)
+        self.assertTrue(hit.metrics.cache_hit)
+        self.assertGreater(hit.metrics.wall_time, 0)
+        spans = tracer.named("ollama.embedding")
+        self.assertEqual([span.attributes["ollama.cache_hit"] for span in spans], [False, True])
+
+    def test_registry_and_async(self) -> None:
+        registry = MetricsRegistry()
+
+        async def run() -> None:
+            async with AsyncOllamaClient(base_url=self.server.url, metrics_sink=registry) as client:
+                await client.generate(MODEL, "hi")
+                chunks = await client.chat(MODEL, MESSAGES, stream=True)
+                async for _ in chunks:
+                    pass
+
+        asyncio.run(run())
+        summary = registry.summary()
+        self.assertEqual(summary["generate"][MODEL]["wall_time"]["count"], 1)
+        self.assertEqual(summary["chat"][MODEL]["ttft"]["count"], 1)
+        self.assertIn("ollama_forge_time_to_first_token_seconds_bucket", registry.to_prometheus())
+
+    def test_sinks_must_implement_record(self) -> None:
+        class Incomplete(MetricsSink):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+if __name__ == "__main__":
+    unittest.main()
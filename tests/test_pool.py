@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-host PooledOllamaClient.
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ollama_forge.config import HOST_EJECT_AFTER_SERVER_ERRORS
+from ollama_forge.pool import PooledOllamaClient
+from ollama_forge.retry import RetryPolicy
+from benchmarks.stub_server import StubOllamaServer
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestPooledOllamaClient(unittest.TestCase):
+    """Test cases for host selection, ejection and re-admission."""
+
+    def setUp(self) -> None:
+        self.servers = [StubOllamaServer(latency=0.1).start() for _ in range(2)]
+
+    def tearDown(self) -> None:
+        for server in self.servers:
+            server.stop()
+
+    def _client(self, urls, **kwargs) -> PooledOllamaClient:
+        client = PooledOllamaClient(urls, health_interval=0, **kwargs)
+        self.addCleanup(client.close)
+        return client
+
+    def test_least_outstanding_spreads_concurrent_requests(self) -> None:
+        client = self._client([server.url for server in self.servers])
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            list(pool.map(lambda i: client.generate("test-model", f"prompt {i}"), range(6)))
+        counts = [server.request_counts["/api/generate"] for server in self.servers]
+        self.assertEqual(sum(counts), 6)
+        self.assertTrue(all(count >= 2 for count in counts), counts)
+        self.assertTrue(all(host["outstanding"] == 0 for host in client.host_status()))
+
+    def test_failing_host_is_ejected_and_readmitted(self) -> None:
+        port = _free_port()
+        dead_url = f"http://127.0.0.1:{port}"
+        client = self._client([dead_url, self.servers[0].url])
+
+        for _ in range(3):
+            self.assertEqual(client.get_version()["version"], "0.0.0-stub")
+        status = {host["url"]: host for host in client.host_status()}
+        self.assertFalse(status[dead_url]["healthy"])
+        self.assertGreater(status[dead_url]["ejected_for"], 0)
+
+        revived = StubOllamaServer(port=port).start()
+        self.addCleanup(revived.stop)
+        status = {host["url"]: host for host in client.check_health()}
+        self.assertTrue(status[dead_url]["healthy"])
+
+    def test_server_errors_eject_only_when_they_persist(self) -> None:
+        a, b = (server.url for server in self.servers)
+        client = self._client([a, b], retry_policy=RetryPolicy(max_retries=1, base_delay=0.001, max_delay=0.002))
+        self.servers[0].fail_next(HOST_EJECT_AFTER_SERVER_ERRORS, status=500)
+        for i in range(HOST_EJECT_AFTER_SERVER_ERRORS):
+            status = {host["url"]: host for host in client.host_status()}
+            self.assertTrue(status[a]["healthy"], f"ejected after {i} server errors")
+            client.generate(f"model-{i}", "hi")  # A new model each time, so no host is preferred for it
+        status = {host["url"]: host for host in client.host_status()}
+        self.assertFalse(status[a]["healthy"])
+        self.assertEqual(self.servers[1].request_counts["/api/generate"], HOST_EJECT_AFTER_SERVER_ERRORS)
+
+    def test_failover_waits_as_the_retry_policy_does(self) -> None:
+        dead_url = f"http://127.0.0.1:{_free_port()}"
+        policy = RetryPolicy(max_retries=1, base_delay=0.2, max_delay=0.2)
+        client = self._client([dead_url, self.servers[0].url], retry_policy=policy)
+        start = time.perf_counter()
+        client.generate("test-model", "hi")
+        self.assertGreaterEqual(time.perf_counter() - start, 0.3)  # Backoff plus the stub's latency
+
+        async def run() -> float:
+            async with self._client([dead_url, self.servers[0].url], retry_policy=policy) as pool:
+                start = time.perf_counter()
+                await pool.agenerate("test-model", "hi")
+                return time.perf_counter() - start
+
+        self.assertGreaterEqual(asyncio.run(run()), 0.3)
+
+        from ollama_forge.exceptions import ConnectionError
+        client = self._client([dead_url, self.servers[0].url], retry_policy=RetryPolicy(max_retries=0))
+        with self.assertRaises(ConnectionError):
+            client.generate("test-model", "no failover")
+
+    def test_all_hosts_down_raises_connection_error(self) -> None:
+        from ollama_forge.exceptions import ConnectionError
+        client = self._client([f"http://127.0.0.1:{_free_port()}"], max_retries=1)
+        with self.assertRaises(ConnectionError):
+            client.get_version()
+
+    def test_circuit_breaker_is_per_host(self) -> None:
+        from ollama_forge.breaker import CircuitBreaker
+        from ollama_forge.exceptions import CircuitOpenError, ServerError
+        a, b = (server.url for server in self.servers)
+        dead_url = f"http://127.0.0.1:{_free_port()}"
+        breaker = CircuitBreaker(failure_threshold=2)
+
+        # A failing host is recorded against its own circuit, not the first host's
+        client = self._client([dead_url, a], circuit_breaker=breaker)
+        client.generate("test-model", "fails over")
+        stats = breaker.stats()
+        self.assertEqual(stats[f"host:{dead_url}"]["failures"], 1)
+        self.assertEqual(stats[f"model:{a}/test-model:latest"]["successes"], 1)
+
+        # A host whose model circuit is open is skipped in favour of the other
+        breaker.reset()
+        client = self._client([a, b], circuit_breaker=breaker)
+        for _ in range(2):
+            breaker.before(a, "test-model").record(ServerError("boom"))
+        before = self.servers[0].request_counts["/api/generate"]
+        for i in range(3):
+            client.generate("test-model", f"after {i}")
+        self.assertEqual(self.servers[0].request_counts["/api/generate"], before)
+        self.assertEqual(breaker.stats()[f"model:{b}/test-model:latest"]["successes"], 3)
+
+        # Only when every host's circuit is open is the request rejected
+        for _ in range(2):
+            breaker.before(b, "test-model").record(ServerError("boom"))
+        with self.assertRaises(CircuitOpenError):
+            client.generate("test-model", "rejected")
+
+    def test_prefers_hosts_with_the_model(self) -> None:
+        self.servers[1].models["special:latest"] = dict(self.servers[1].models["test-model"],
+                                                         name="special:latest")
+        self.servers[1].loaded_models.append("test-model")
+        client = self._client([server.url for server in self.servers])
+        client.check_health()
+
+        client.generate("special", "hi")
+        client.generate("test-model", "hi")
+        self.assertEqual(self.servers[0].request_counts["/api/generate"], 0)
+        self.assertEqual(self.servers[1].request_counts["/api/generate"], 2)
+
+    def test_ewma_prefers_faster_host(self) -> None:
+        for server, latency in zip(self.servers, (0.05, 0.0)):
+            server.latency = latency
+            server.loaded_models.append("nomic-embed-text")
+        client = self._client([server.url for server in self.servers], strategy="ewma")
+        client.check_health()
+        for _ in range(10):
+            client.create_embedding("nomic-embed-text", "x")
+        self.assertGreaterEqual(self.servers[1].request_counts["/api/embed"], 8)
+
+    def test_streams_release_host_when_closed(self) -> None:
+        client = self._client([server.url for server in self.servers])
+        chunks = client.generate("test-model", "hi", stream=True)
+        next(chunks)
+        self.assertEqual(sum(host["outstanding"] for host in client.host_status()), 1)
+        list(chunks)
+        self.assertEqual(sum(host["outstanding"] for host in client.host_status()), 0)
+
+    def test_async_requests(self) -> None:
+        client = self._client([server.url for server in self.servers])
+
+        async def run() -> None:
+            async with client:
+                await asyncio.gather(*(client.agenerate("test-model", f"p{i}") for i in range(4)))
+                stream = await client.achat("test-model", [{"role": "user", "content": "hi"}],
+                                            stream=True)
+                async for _ in stream:
+                    pass
+
+        asyncio.run(run())
+        self.assertEqual(sum(s.request_counts["/api/generate"] for s in self.servers), 4)
+        self.assertTrue(all(host["outstanding"] == 0 for host in client.host_status()))
+
+
+if __name__ == "__main__":
+    unittest.main()
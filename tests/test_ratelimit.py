@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for client-side rate limiting and admission control.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ollama_forge.client import OllamaClient
+from ollama_forge.exceptions import RateLimitError
+from ollama_forge.ratelimit import RateLimit, RequestLimiter
+from benchmarks.stub_server import StubOllamaServer
+
+
+class TestRequestLimiter(unittest.TestCase):
+    """Test cases for admission decisions."""
+
+    def test_token_bucket_paces_requests(self) -> None:
+        limiter = RequestLimiter(default=RateLimit(rate=20, burst=2))
+        started = time.monotonic()
+        for _ in range(6):
+            limiter.acquire("/api/embed").release()
+        # Two from the burst, then four more at 20/s
+        self.assertGreaterEqual(time.monotonic() - started, 0.18)
+
+    def test_max_in_flight_and_deadline(self) -> None:
+        limiter = RequestLimiter(endpoints={"chat": RateLimit(max_in_flight=1)})
+        permit = limiter.acquire("/api/chat")
+        limiter.acquire("/api/embed").release()  # Other endpoints are unaffected
+        with self.assertRaises(RateLimitError):
+            limiter.acquire("/api/chat", timeout=0.05)
+        threading.Timer(0.05, permit.release).start()
+        limiter.acquire("/api/chat", timeout=1.0).release()
+
+        stats = limiter.stats()
+        self.assertEqual(stats["rejected"], 1)
+        self.assertEqual(stats["admitted"], 3)
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertGreater(stats["p99_wait"], 0.0)
+
+    def test_per_model_limits_normalize_names(self) -> None:
+        limiter = RequestLimiter(models={"big": RateLimit(max_in_flight=1)})
+        permit = limiter.acquire("/api/generate", "big:latest")
+        with self.assertRaises(RateLimitError):
+            limiter.acquire("/api/chat", "big", timeout=0.01)
+        limiter.acquire("/api/chat", "small", timeout=0.01).release()
+        permit.release()
+
+    def test_queue_depth(self) -> None:
+        limiter = RequestLimiter(default=RateLimit(max_in_flight=1))
+        permit = limiter.acquire("/api/chat")
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            waiting = [pool.submit(lambda: limiter.acquire("/api/chat").release()) for _ in range(3)]
+            time.sleep(0.05)
+            self.assertEqual(limiter.stats()["queue_depth"], 3)
+            permit.release()
+            for future in waiting:
+                future.result(timeout=1.0)
+        self.assertEqual(limiter.stats()["queue_depth"], 0)
+
+    def test_async_waiters_are_woken_by_release(self) -> None:
+        limiter = RequestLimiter(default=RateLimit(max_in_flight=2))
+        peak = []
+
+        async def worker() -> None:
+            with await limiter.aacquire("/api/chat"):
+                peak.append(limiter.stats()["in_flight"])
+                await asyncio.sleep(0.01)
+
+        async def run() -> None:
+            await asyncio.gather(*(worker() for _ in range(8)))
+
+        asyncio.run(run())
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(limiter.stats()["admitted"], 8)
+
+
+class TestClientLimiter(unittest.TestCase):
+    """Test cases for the limiter inside OllamaClient."""
+
+    def setUp(self) -> None:
+        self.server = StubOllamaServer(latency=0.05, token_delay=0.01).start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_server_sees_bounded_concurrency(self) -> None:
+        limiter = RequestLimiter(models={"test-model": RateLimit(max_in_flight=2)})
+        client = OllamaClient(base_url=self.server.url, limiter=limiter)
+        peak = []
+        original = client._send_with_retry
+
+        def observed(*args, **kwargs):
+            peak.append(limiter.stats()["in_flight"])
+            return original(*args, **kwargs)
+
+        client._send_with_retry = observed
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda i: client.generate("test-model", f"p{i}"), range(8)))
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(limiter.stats()["admitted"], 8)
+
+    def test_stream_holds_permit_until_closed(self) -> None:
+        limiter = RequestLimiter(default=RateLimit(max_in_flight=1))
+        client = OllamaClient(base_url=self.server.url, limiter=limiter)
+        chunks = client.generate("test-model", "hi", stream=True)
+        next(chunks)
+        self.assertEqual(limiter.stats()["in_flight"], 1)
+        chunks.close()
+        self.assertEqual(limiter.stats()["in_flight"], 0)
+
+    def test_async_path(self) -> None:
+        limiter = RequestLimiter(default=RateLimit(max_in_flight=1), queue_timeout=0.01)
+        client = OllamaClient(base_url=self.server.url, limiter=limiter)
+
+        async def run() -> list:
+            async with client:
+                return await asyncio.gather(
+                    *(client.agenerate("test-model", f"p{i}") for i in range(3)),
+                    return_exceptions=True,
+                )
+
+        results = asyncio.run(run())
+        self.assertTrue(any(isinstance(r, RateLimitError) for r in results))
+        self.assertTrue(any(isinstance(r, dict) for r in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Tests for the retry policy and its use by the sync and async transports.
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from email.utils import formatdate
+from time import time
+from typing import List
+from unittest.mock import MagicMock, patch
+
+import httpx
+import requests
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ollama_forge.client import OllamaClient
+from ollama_forge.exceptions import (
+    ConnectionError, InvalidRequestError, ModelNotFoundError, ServerError, TimeoutError
+)
+from ollama_forge.retry import RetryBudget, RetryPolicy, parse_retry_after
+
+
+def _response(status: int, body: str = "{}", headers: dict = None) -> MagicMock:
+    response = MagicMock()
+    response.status_code = status
+    response.text = body
+    response.headers = headers or {}
+    return response
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Test cases for retry decisions."""
+
+    def test_decorrelated_jitter_bounds(self) -> None:
+        policy = RetryPolicy(max_retries=50, base_delay=0.1, max_delay=2.0, budget=RetryBudget(min_retries=100))
+        state = policy.start()
+        previous = 0.1
+        for _ in range(50):
+            delay = state.next_delay()
+            self.assertGreaterEqual(delay, 0.1)
+            self.assertLessEqual(delay, min(2.0, previous * 3))
+            previous = delay
+        self.assertIsNone(state.next_delay())
+
+    def test_retry_after_and_deadline(self) -> None:
+        policy = RetryPolicy(base_delay=0.01, max_delay=0.01, deadline=5.0)
+        state = policy.start()
+        self.assertEqual(state.next_delay(retry_after=2.0), 2.0)
+        self.assertIsNone(state.next_delay(retry_after=10.0))
+        self.assertLessEqual(state.timeout(60), 5.0)
+        ignoring = RetryPolicy(base_delay=0.01, max_delay=0.01, respect_retry_after=False)
+        self.assertEqual(ignoring.start().next_delay(retry_after=2.0), 0.01)
+
+    def test_budget_limits_retries_to_a_fraction_of_requests(self) -> None:
+        budget = RetryBudget(ratio=0.1, min_retries=2)
+        policy = RetryPolicy(max_retries=1, base_delay=0.0, budget=budget)
+        retried = sum(policy.start().next_delay() is not None for _ in range(100))
+        # Two from the starting balance plus one per ten requests
+        self.assertIn(retried, (11, 12))
+
+    def test_parse_retry_after(self) -> None:
+        self.assertEqual(parse_retry_after("7"), 7.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        later = parse_retry_after(formatdate(time() + 30, usegmt=True))
+        self.assertTrue(25 <= later <= 31)
+
+
+class TestSyncRetries(unittest.TestCase):
+    """Test cases for retries in _send_with_retry."""
+
+    def setUp(self) -> None:
+        self.client = OllamaClient(retry_policy=RetryPolicy(max_retries=2, base_delay=0.0))
+        self.client.session = MagicMock()
+        self.sleeps: List[float] = []
+        patcher = patch("ollama_forge.client.time.sleep", side_effect=self.sleeps.append)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_retryable_status_then_success(self) -> None:
+        ok = _response(200)
+        self.client.session.request.side_effect = [_response(503), ok]
+        self.assertIs(self.client._send_with_retry("GET", "/api/tags"), ok)
+        self.assertEqual(self.client.session.request.call_count, 2)
+
+    def test_client_errors_are_not_retried_or_wrapped(self) -> None:
+        self.client.session.request.side_effect = [_response(400, '{"error": "bad"}')]
+        with self.assertRaises(InvalidRequestError) as raised:
+            self.client._send_with_retry("POST", "/api/chat", {})
+        self.assertEqual(raised.exception.message, "bad")
+        self.client.session.request.side_effect = [_response(404, '{"error": "no model"}')]
+        with self.assertRaises(ModelNotFoundError):
+            self.client._send_with_retry("POST", "/api/chat", {})
+        self.assertEqual(self.client.session.request.call_count, 2)
+
+    def test_timeouts_back_off_then_raise(self) -> None:
+        self.client.session.request.side_effect = requests.exceptions.Timeout()
+        with self.assertRaises(TimeoutError):
+            self.client._send_with_retry("GET", "/api/tags")
+        self.assertEqual(self.client.session.request.call_count, 3)
+        self.assertEqual(len(self.sleeps), 2)
+
+    def test_connection_errors_are_retried(self) -> None:
+        self.client.session.request.side_effect = requests.exceptions.ConnectionError("refused")
+        with self.assertRaises(ConnectionError):
+            self.client._send_with_retry("GET", "/api/tags")
+        self.assertEqual(self.client.session.request.call_count, 3)
+
+    def test_retry_after_is_honoured(self) -> None:
+        self.client.session.request.side_effect = [
+            _response(429, headers={"Retry-After": "3"}), _response(200)
+        ]
+        self.client._send_with_retry("GET", "/api/tags")
+        self.assertEqual(self.sleeps, [3.0])
+
+
+class TestAsyncRetries(unittest.TestCase):
+    """Test cases for retries in _send_with_async_retry."""
+
+    def _run(self, statuses: List[int]) -> tuple:
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            status = statuses[min(len(calls), len(statuses)) - 1]
+            return httpx.Response(status, json={"error": f"status {status}"} if status >= 400 else {})
+
+        client = OllamaClient(retry_policy=RetryPolicy(max_retries=2, base_delay=0.0))
+        client._get_async_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        async def run() -> httpx.Response:
+            return await client._send_with_async_retry("GET", "/api/tags")
+
+        try:
+            return asyncio.run(run()), calls
+        except Exception as e:
+            return e, calls
+
+    def test_retryable_status_then_success(self) -> None:
+        result, calls = self._run([502, 503, 200])
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(len(calls), 3)
+
+    def test_gives_up_after_max_retries(self) -> None:
+        result, calls = self._run([500])
+        self.assertIsInstance(result, ServerError)
+        self.assertEqual(len(calls), 3)
+
+    def test_client_errors_are_raised_at_once(self) -> None:
+        result, calls = self._run([400])
+        self.assertIsInstance(result, InvalidRequestError)
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Tests for priority scheduling of requests.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+from typing import List
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ollama_forge.async_client import AsyncOllamaClient
+from ollama_forge.client import OllamaClient
+from ollama_forge.exceptions import RateLimitError
+from ollama_forge.scheduler import PriorityScheduler, current_priority, request_priority
+from benchmarks.stub_server import StubOllamaServer
+
+
+def _queued(scheduler: PriorityScheduler) -> int:
+    stats = scheduler.stats()
+    return sum(stats[name]["queued"] for name in scheduler.weights)
+
+
+def _wait_queued(scheduler: PriorityScheduler, count: int) -> None:
+    deadline = time.monotonic() + 2.0
+    while _queued(scheduler) < count and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+class TestPriorityScheduler(unittest.TestCase):
+    """Test cases for dispatch order."""
+
+    def _dispatch_order(self, scheduler: PriorityScheduler, priorities: List[str]) -> List[str]:
+        """Queue requests behind a held slot, release it, and record the order they run in."""
+        order: List[str] = []
+        held = scheduler.acquire()
+
+        def worker(priority: str) -> None:
+            with scheduler.acquire(priority):
+                order.append(priority)
+
+        threads = []
+        for queued, priority in enumerate(priorities, start=1):
+            thread = threading.Thread(target=worker, args=(priority,))
+            thread.start()
+            threads.append(thread)
+            _wait_queued(scheduler, queued)
+        held.release()
+        for thread in threads:
+            thread.join(timeout=2.0)
+        return order
+
+    def test_interactive_overtakes_queued_batch(self) -> None:
+        scheduler = PriorityScheduler(max_in_flight=1)
+        order = self._dispatch_order(scheduler, ["batch"] * 3 + ["interactive"] * 3)
+        self.assertEqual(order, ["interactive"] * 3 + ["batch"] * 3)
+
+    def test_weighted_share_does_not_starve_batch(self) -> None:
+        scheduler = PriorityScheduler(max_in_flight=1, weights={"interactive": 2.0, "batch": 1.0})
+        order = self._dispatch_order(scheduler, ["batch"] * 6 + ["interactive"] * 6)
+        self.assertEqual(order[:6].count("interactive"), 4)
+        self.assertEqual(order[:6].count("batch"), 2)
+
+    def test_timeout_and_stats(self) -> None:
+        scheduler = PriorityScheduler(max_in_flight=1)
+        held = scheduler.acquire("interactive")
+        with self.assertRaises(RateLimitError):
+            scheduler.acquire("batch", timeout=0.02)
+        held.release()
+        scheduler.acquire("batch", timeout=0.1).release()
+
+        stats = scheduler.stats()
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertEqual(stats["batch"]["queued"], 0)
+        self.assertEqual(stats["batch"]["dispatched"], 1)
+        self.assertEqual(stats["interactive"]["dispatched"], 1)
+
+    def test_priority_context(self) -> None:
+        self.assertEqual(current_priority(), "normal")
+        with request_priority("batch"):
+            self.assertEqual(current_priority(), "batch")
+            with request_priority(None):
+                self.assertEqual(current_priority(), "batch")
+        self.assertEqual(current_priority(), "normal")
+        with self.assertRaises(ValueError):
+            with request_priority("urgent"):
+                pass
+
+    def test_async_waiters_follow_priority(self) -> None:
+        scheduler = PriorityScheduler(max_in_flight=1)
+        order: List[str] = []
+
+        async def worker(priority: str) -> None:
+            with await scheduler.aacquire(priority):
+                order.append(priority)
+
+        async def run() -> None:
+            held = await scheduler.aacquire()
+            tasks = [asyncio.ensure_future(worker(p)) for p in ("batch", "normal", "interactive")]
+            await asyncio.sleep(0.01)
+            held.release()
+            await asyncio.gather(*tasks)
+
+        asyncio.run(run())
+        self.assertEqual(order, ["interactive", "normal", "batch"])
+
+    def test_cancelled_async_waiter_gives_up_its_place(self) -> None:
+        scheduler = PriorityScheduler(max_in_flight=1)
+
+        async def run() -> None:
+            held = await scheduler.aacquire()
+            waiter = asyncio.ensure_future(scheduler.aacquire("interactive"))
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await waiter
+            held.release()
+            (await scheduler.aacquire("batch", timeout=0.5)).release()
+
+        asyncio.run(run())
+        self.assertEqual(scheduler.stats()["in_flight"], 0)
+
+
+class TestClientScheduler(unittest.TestCase):
+    """Test cases for the scheduler inside the clients."""
+
+    def setUp(self) -> None:
+        self.server = StubOllamaServer(latency=0.02, token_delay=0.01, parallel=1).start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_priority_argument_reaches_scheduler(self) -> None:
+        scheduler = PriorityScheduler(max_in_flight=1)
+        client = OllamaClient(base_url=self.server.url, scheduler=scheduler)
+        client.generate("test-model", "hi", priority="interactive")
+        client.chat("test-model", [{"role": "user", "content": "hi"}], priority="batch")
+        client.create_embedding("nomic-embed-text", "hi")
+
+        stats = scheduler.stats()
+        self.assertEqual(stats["interactive"]["dispatched"], 1)
+        self.assertEqual(stats["batch"]["dispatched"], 1)
+        self.assertEqual(stats["normal"]["dispatched"], 1)
+        # The priority is not sent to the server
+        self.assertNotIn("priority", self.server.recent_requests[-1][1])
+        with self.assertRaises(ValueError):
+            client.generate("test-model", "hi", priority="urgent")
+
+    def test_stream_holds_slot_until_closed(self) -> None:
+        scheduler = PriorityScheduler(max_in_flight=1)
+        client = OllamaClient(base_url=self.server.url, scheduler=scheduler)
+        chunks = client.generate("test-model", "hi", stream=True, priority="interactive")
+        next(chunks)
+        self.assertEqual(scheduler.stats()["in_flight"], 1)
+        chunks.close()
+        self.assertEqual(scheduler.stats()["in_flight"], 0)
+
+    def test_async_client_priority(self) -> None:
+        scheduler = PriorityScheduler(max_in_flight=1)
+
+        async def run() -> None:
+            async with AsyncOllamaClient(base_url=self.server.url, scheduler=scheduler) as client:
+                await asyncio.gather(
+                    client.create_embedding("nomic-embed-text", "a", priority="batch"),
+                    client.chat("test-model", [{"role": "user", "content": "hi"}],
+                                priority="interactive"),
+                )
+
+        asyncio.run(run())
+        stats = scheduler.stats()
+        self.assertEqual(stats["batch"]["dispatched"], 1)
+        self.assertEqual(stats["interactive"]["dispatched"], 1)
+        self.assertEqual(stats["in_flight"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
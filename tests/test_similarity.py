@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests and benchmarks for batched similarity calculations.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from helpers import embedding
+from helpers.embedding import _batch_similarities_loop, batch_calculate_similarities
+
+try:
+    import pytest_benchmark  # noqa: F401
+    BENCHMARK_AVAILABLE = True
+except ImportError:
+    BENCHMARK_AVAILABLE = False
+
+
+def _vectors(count: int, dim: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [[rng.uniform(-1, 1) for _ in range(dim)] for _ in range(count)]
+
+
+def test_matches_python_fallback() -> None:
+    query = _vectors(1, 16, seed=1)[0]
+    vectors = _vectors(40, 16)
+    vectorized = batch_calculate_similarities(query, vectors)
+    reference = _batch_similarities_loop(query, vectors)
+    assert [i for i, _ in vectorized] == list(range(40))
+    assert [s for _, s in vectorized] == pytest.approx([s for _, s in reference])
+
+
+def test_zero_and_mismatched_rows() -> None:
+    query = [1.0, 0.0, 0.0]
+    vectors = [[1.0, 0.0, 0.0], [0.0, 0.0, 0.0], [1.0, 2.0], [], [-2.0, 0.0, 0.0]]
+    assert batch_calculate_similarities(query, vectors) == [
+        (0, 1.0), (1, 0.0), (2, 0.0), (3, 0.0), (4, -1.0)
+    ]
+    assert batch_calculate_similarities([0.0, 0.0, 0.0], vectors[:1]) == [(0, 0.0)]
+    assert batch_calculate_similarities(query, []) == []
+
+
+def test_accepts_ndarray_matrix() -> None:
+    np = pytest.importorskip("numpy")
+    matrix = np.array(_vectors(5, 4))
+    result = batch_calculate_similarities(matrix[2].tolist(), matrix)
+    assert result[2][1] == pytest.approx(1.0)
+
+
+def test_fallback_without_numpy(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(embedding, "NUMPY_AVAILABLE", False)
+    assert batch_calculate_similarities([1.0, 0.0], [[0.0, 1.0], [1.0]]) == [(0, 0.0), (1, 0.0)]
+
+
+@pytest.mark.skipif(not BENCHMARK_AVAILABLE, reason="pytest-benchmark not installed")
+@pytest.mark.benchmark(group="batch_calculate_similarities")
+@pytest.mark.parametrize("implementation", ["loop", "vectorized"])
+def test_benchmark_batch_similarities(benchmark, implementation: str) -> None:
+    """Compare the per-pair loop with the single-matmul implementation."""
+    query = _vectors(1, 384, seed=1)[0]
+    vectors = _vectors(2000, 384)
+    func = _batch_similarities_loop if implementation == "loop" else batch_calculate_similarities
+    result = benchmark(func, query, vectors)
+    assert len(result) == 2000
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared NDJSON stream decoder.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import unittest
+from unittest.mock import Mock, patch
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ollama_forge import streaming
+from ollama_forge.client import OllamaClient
+from ollama_forge.exceptions import StreamingError
+from ollama_forge.streaming import NDJSONDecoder, aiter_ndjson, chunk_text, iter_ndjson
+from benchmarks.stub_server import StubOllamaServer
+
+CHUNKS = [
+    {"model": "m", "response": "Hel", "done": False},
+    {"model": "m", "response": "lo é漢", "done": False},
+    {"model": "m", "response": "", "done": True, "eval_count": 2},
+]
+STREAM = b"".join(json.dumps(chunk).encode() + b"\n" for chunk in CHUNKS)
+
+
+class TestNDJSONDecoder(unittest.TestCase):
+    """Test cases for incremental decoding."""
+
+    def test_split_at_every_byte(self) -> None:
+        decoder = NDJSONDecoder()
+        decoded = []
+        for i in range(len(STREAM)):
+            decoded.extend(decoder.feed(STREAM[i:i + 1]))
+        decoded.extend(decoder.flush())
+        self.assertEqual(decoded, CHUNKS)
+
+    def test_unterminated_last_line_and_blank_lines(self) -> None:
+        decoder = NDJSONDecoder()
+        data = b'{"a": 1}\r\n\n  \n{"b": 2}'
+        self.assertEqual(decoder.feed(data), [{"a": 1}])
+        self.assertEqual(decoder.flush(), [{"b": 2}])
+        self.assertEqual(decoder.flush(), [])
+
+    def test_invalid_line(self) -> None:
+        with self.assertRaises(StreamingError):
+            NDJSONDecoder().feed(b'{"a": 1}\nnot json\n')
+        with self.assertLogs("ollama_forge.streaming", level="WARNING"):
+            decoded = NDJSONDecoder(skip_invalid=True).feed(b'not json\n{"a": 1}\n')
+        self.assertEqual(decoded, [{"a": 1}])
+
+    def test_stdlib_backend(self) -> None:
+        with patch.object(streaming, "orjson", None):
+            decoder = NDJSONDecoder()
+            self.assertEqual(decoder.feed(STREAM), CHUNKS)
+
+    def test_chunk_text(self) -> None:
+        self.assertEqual(chunk_text({"response": "a"}), "a")
+        self.assertEqual(chunk_text({"message": {"role": "assistant", "content": "b"}}), "b")
+        self.assertEqual(chunk_text({"done": True}), "")
+
+
+class TestStreamIterators(unittest.TestCase):
+    """Test cases for response iteration."""
+
+    def test_iter_ndjson_text_only_closes_response(self) -> None:
+        response = Mock()
+        response.iter_content.return_value = [STREAM[:7], STREAM[7:]]
+        self.assertEqual(list(iter_ndjson(response, text_only=True)), ["Hel", "lo é漢", ""])
+        response.close.assert_called_once()
+
+    def test_aiter_ndjson(self) -> None:
+        class FakeResponse:
+            closed = False
+
+            async def aiter_bytes(self):
+                yield STREAM[:30]
+                yield STREAM[30:]
+
+            async def aclose(self):
+                self.closed = True
+
+        async def collect(response):
+            return [chunk async for chunk in aiter_ndjson(response)]
+
+        response = FakeResponse()
+        self.assertEqual(asyncio.run(collect(response)), CHUNKS)
+        self.assertTrue(response.closed)
+
+    def test_client_streams_through_decoder(self) -> None:
+        with StubOllamaServer(response_tokens=5) as server:
+            client = OllamaClient(base_url=server.url)
+            chunks = list(client.generate("test-model", "hi", stream=True))
+            self.assertEqual(len(chunks), 6)
+            self.assertTrue(chunks[-1]["done"])
+            messages = [{"role": "user", "content": "hi"}]
+            text = "".join(chunk_text(c) for c in client.chat("test-model", messages, stream=True))
+            self.assertTrue(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for the tracing hooks, using the in-memory span collector.
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ollama_forge.client import OllamaClient
+from ollama_forge.exceptions import ModelNotFoundError
+from ollama_forge.retry import RetryPolicy
+from ollama_forge.scheduler import PriorityScheduler
+from ollama_forge.tracing import InMemoryTracer, Tracer, as_tracer, trace_span
+from benchmarks.stub_server import StubOllamaServer
+
+MODEL = "test-model"
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+class TestTracing(unittest.TestCase):
+    """Test cases for the span tree of client calls."""
+
+    def setUp(self) -> None:
+        self.server = StubOllamaServer(strict_models=True, models=[MODEL]).start()
+        self.tracer = InMemoryTracer()
+        self.client = OllamaClient(base_url=self.server.url, tracer=self.tracer)
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_span_tree(self) -> None:
+        self.client.chat(MODEL, MESSAGES)
+        [chat] = self.tracer.named("ollama.chat")
+        self.assertIsNone(chat.parent)
+        self.assertEqual(chat.attributes["ollama.model"], MODEL)
+        self.assertGreater(chat.attributes["ollama.completion_tokens"], 0)
+        self.assertIn("ollama.wall_time", chat.attributes)
+
+        [request] = self.tracer.children(chat)
+        self.assertEqual(request.name, "ollama.request")
+        self.assertEqual(request.attributes["ollama.endpoint"], "/api/chat")
+        self.assertEqual(request.attributes["http.response.status_code"], 200)
+        [attempt] = self.tracer.children(request)
+        self.assertEqual(attempt.attributes["ollama.attempt"], 1)
+        self.assertLessEqual(attempt.duration, chat.duration)
+
+    def test_stream_events(self) -> None:
+        chunks = list(self.client.generate(MODEL, "hi", stream=True))
+        [generate] = self.tracer.named("ollama.generate")
+        self.assertEqual([name for name, _, _ in generate.events], ["first_token"])
+        self.assertEqual(generate.attributes["ollama.completion_tokens"], chunks[-1]["eval_count"])
+        self.assertIn("ollama.ttft", generate.attributes)
+        [attempt] = self.tracer.named("ollama.attempt")
+        self.assertEqual([name for name, _, _ in attempt.events], ["first_byte"])
+
+        # A stream closed early still ends its span
+        stream = self.client.generate(MODEL, "hi", stream=True)
+        next(stream)
+        stream.close()
+        self.assertTrue(self.tracer.named("ollama.generate")[-1].attributes["ollama.stream.closed_early"])
+
+    def test_errors_are_recorded(self) -> None:
+        with self.assertRaises(ModelNotFoundError):
+            self.client.generate("missing-model", "hi")
+        [generate] = self.tracer.named("ollama.generate")
+        self.assertEqual(generate.attributes["error.type"], "ModelNotFoundError")
+        self.assertIsInstance(generate.exceptions[0], ModelNotFoundError)
+        self.assertEqual(self.tracer.named("ollama.attempt")[0].attributes["http.response.status_code"], 404)
+
+    def test_queue_span(self) -> None:
+        self.client.scheduler = PriorityScheduler(max_in_flight=1)
+        self.client.create_embedding(MODEL, "hi")
+        [queue] = self.tracer.named("ollama.queue")
+        self.assertEqual(queue.parent.name, "ollama.request")
+        self.assertEqual(queue.parent.parent.name, "ollama.embedding")
+
+    def test_async_calls_get_separate_trees(self) -> None:
+        async def run() -> None:
+            async with self.client:
+                await asyncio.gather(
+                    self.client.agenerate(MODEL, "one"), self.client.achat(MODEL, MESSAGES)
+                )
+
+        asyncio.run(run())
+        for request in self.tracer.named("ollama.request"):
+            operation = request.parent
+            self.assertEqual(request.attributes["ollama.endpoint"], f"/api/{operation.name.split('.')[1]}")
+
+    def test_disabled_tracing_is_a_shared_no_op(self) -> None:
+        client = OllamaClient(base_url=self.server.url)
+        self.assertIsNone(client.tracer)
+        self.assertIs(trace_span(None, "a"), trace_span(None, "b"))
+        client.generate(MODEL, "hi")
+        self.assertEqual(self.tracer.spans, [])
+
+    def test_incomplete_tracer_is_rejected(self) -> None:
+        class StartOnly(Tracer):
+            def start_span(self, name, attributes=None):
+                return InMemoryTracer().start_span(name, attributes)
+
+        with self.assertRaises(TypeError):
+            StartOnly()
+        self.assertIs(as_tracer(self.tracer), self.tracer)
+
+
+class TestRetrySpans(unittest.TestCase):
+    """Test cases for attempt and backoff spans."""
+
+    def test_retry_is_traced(self) -> None:
+        tracer = InMemoryTracer()
+        client = OllamaClient(
+            base_url="http://ollama.test", tracer=tracer,
+            retry_policy=RetryPolicy(max_retries=2, base_delay=0.001, max_delay=0.002),
+        )
+        unavailable = MagicMock(status_code=503, text='{"error": "busy"}', headers={})
+        ok = MagicMock(status_code=200, headers={})
+        ok.json.return_value = {"model": MODEL, "response": "hi", "done": True}
+        client.session = MagicMock()
+        client.session.request.side_effect = [unavailable, ok]
+
+        client.generate(MODEL, "hi")
+        [request] = tracer.named("ollama.request")
+        names = [span.name for span in tracer.children(request)]
+        self.assertEqual(names, ["ollama.attempt", "ollama.backoff", "ollama.attempt"])
+        first, backoff, second = tracer.children(request)
+        self.assertEqual(first.attributes["error.type"], "ServerError")
+        self.assertEqual(first.attributes["http.response.status_code"], 503)
+        self.assertGreater(backoff.attributes["ollama.backoff.delay"], 0)
+        self.assertEqual(second.attributes["ollama.attempt"], 2)
+        self.assertNotIn("error.type", request.attributes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-memory VectorIndex.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# Add the parent directory to the path before any import attempts
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from helpers.embedding import VectorIndex, top_k_similarities
+
+
+class TestVectorIndex(unittest.TestCase):
+    """Test cases for VectorIndex maintenance and search."""
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        self.vectors = rng.normal(size=(50, 8)).astype(np.float32)
+        self.ids = [f"doc-{i}" for i in range(50)]
+        self.index = VectorIndex(dim=8, initial_capacity=4)
+        self.index.add(self.ids, self.vectors)
+
+    def test_matches_full_sort(self) -> None:
+        """Top-k agrees with the argsort-based top_k_similarities."""
+        matrix = self.vectors / np.linalg.norm(self.vectors, axis=1, keepdims=True)
+        query = self.vectors[3].tolist()
+        expected = top_k_similarities(query, matrix, k=5)
+        found = self.index.search(query, k=5)
+        self.assertEqual([self.ids[i] for i, _ in expected], [i for i, _ in found])
+        for (_, want), (_, got) in zip(expected, found):
+            self.assertAlmostEqual(want, got, places=5)
+        self.assertEqual(found[0][0], "doc-3")
+
+    def test_grows_without_losing_rows(self) -> None:
+        self.assertEqual(len(self.index), 50)
+        self.assertGreaterEqual(self.index._matrix.shape[0], 50)
+        self.assertEqual(self.index.search(self.vectors[49].tolist(), k=1)[0][0], "doc-49")
+
+    def test_remove_and_update(self) -> None:
+        self.index.remove(["doc-0", "doc-10"])
+        self.assertNotIn("doc-0", self.index)
+        self.assertEqual(len(self.index), 48)
+        # The row moved into the hole is still found under its own id
+        self.assertEqual(self.index.search(self.vectors[49].tolist(), k=1)[0][0], "doc-49")
+
+        self.index.update(["doc-5"], [self.vectors[7]])
+        top = self.index.search(self.vectors[7].tolist(), k=2)
+        self.assertEqual({i for i, _ in top}, {"doc-5", "doc-7"})
+
+    def test_search_batch(self) -> None:
+        results = self.index.search_batch(self.vectors[:3], k=2)
+        self.assertEqual([r[0][0] for r in results], ["doc-0", "doc-1", "doc-2"])
+        self.assertEqual(len(self.index.search_batch(self.vectors[:1], k=100)[0]), 50)
+
+    def test_errors(self) -> None:
+        with self.assertRaises(ValueError):
+            self.index.add(["doc-1"], [self.vectors[0]])
+        with self.assertRaises(ValueError):
+            self.index.add(["new"], [[1.0, 2.0]])
+        with self.assertRaises(KeyError):
+            self.index.remove(["missing"])
+        self.assertEqual(VectorIndex(dim=8).search([1.0] * 8), [])
+
+
+if __name__ == "__main__":
+    unittest.main()